@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
+
+KlineRow = list[Union[str, int]]
+
+ONE_MINUTE_IN_MILLISECONDS = 60_000
+
+
+class KlinePriceCache:
+    """
+    Bounded, thread-safe LRU cache for 1m klines.
+
+    Entries are keyed by (symbol, minute bucket) where the minute bucket is the
+    millisecond timestamp floored to the start of its 1m candle, so every
+    transaction mined within the same minute resolves to the same entry.
+    Entries expire after ttl_seconds and the least recently used entry is
+    evicted once max_size is reached.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: int = 3600) -> None:
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__entries: "OrderedDict[Tuple[str, int], Tuple[float, KlineRow]]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_minute_bucket(timestamp_in_milliseconds: int) -> int:
+        return int(timestamp_in_milliseconds) // ONE_MINUTE_IN_MILLISECONDS * ONE_MINUTE_IN_MILLISECONDS
+
+    def get(self, symbol: str, timestamp_in_milliseconds: int) -> Optional[KlineRow]:
+        key = (symbol.upper(), self.get_minute_bucket(timestamp_in_milliseconds))
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, kline = entry
+            if expires_at < time.monotonic():
+                del self.__entries[key]
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return kline
+
+    def put(self, symbol: str, kline: KlineRow) -> None:
+        """
+        Store a kline row, keyed by its open time (index 0 of a Binance kline row).
+        """
+        if self.__max_size <= 0 or len(kline) == 0:
+            return
+
+        key = (symbol.upper(), self.get_minute_bucket(int(kline[0])))
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + self.__ttl_seconds, kline)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
@@ -1,9 +1,14 @@
+import time
 from typing import Dict, Optional, Union
 
+from app.core.binance_spot_api.cache import KlinePriceCache
 from app.core.binance_spot_api.model import BinanceSpotKlineRequestConfig
+from app.core.binance_spot_api.spot_pool import ThreadLocalSpot
 from app.core.log.logger import Logger
 from binance.spot import Spot
 
+BINANCE_KLINES_MAX_LIMIT = 1000
+
 class BinanceSpotApiClient:
     """
     Binance Spot API Client
@@ -11,10 +16,11 @@ class BinanceSpotApiClient:
 
     def __init__(
         self,
-        spot_client: Spot,
-
+        spot_client: Union[Spot, ThreadLocalSpot],
+        price_cache: Optional[KlinePriceCache] = None,
     ) -> None:
         self.__spot_client = spot_client
+        self.__price_cache = price_cache
         self.__logger = Logger(name=self.__class__.__name__)
 
 
@@ -55,6 +61,11 @@ class BinanceSpotApiClient:
             if not isinstance(endTime, str) or len(str(endTime)) != 13:
                 raise ValueError("endTime must be a 13-digit millisecond timestamp")
             
+            if self.__price_cache is not None:
+                cached_kline = self.__price_cache.get(symbol, int(endTime))
+                if cached_kline is not None:
+                    return [cached_kline]
+
             defaultKlinesTimeStampParams = self.get_default_klines_by_time_stamp_params()
 
             result: list[list[Union[str, int]]] = self.__spot_client.klines(
@@ -63,6 +74,7 @@ class BinanceSpotApiClient:
                 limit=defaultKlinesTimeStampParams.limit,
                 endTime=endTime,
             )
+            self.cache_closed_klines(symbol, result)
             return result
         except Exception as e:
             description = "Get klines by symbol failed"
@@ -70,6 +82,18 @@ class BinanceSpotApiClient:
             self.__logger.exception(log_message)
             return []
         
+    def cache_closed_klines(self, symbol: str, klines: list[list[Union[str, int]]]) -> None:
+        """
+        Store klines in the price cache, skipping the still-open candle since its close price keeps moving.
+        """
+        if self.__price_cache is None:
+            return
+
+        now_in_milliseconds = int(time.time() * 1000)
+        for kline in klines:
+            if len(kline) > 6 and int(kline[6]) < now_in_milliseconds:
+                self.__price_cache.put(symbol, kline)
+
     def get_klines_by_symbol(
         self,
         symbol: str,
@@ -114,3 +138,37 @@ class BinanceSpotApiClient:
             self.__logger.exception(log_message)
             error_message = "Get klines by symbol failed"
             raise Exception(error_message) from e
+
+    def get_klines_by_time_range(
+        self,
+        symbol: str,
+        interval: str,
+        startTime: int,
+        endTime: int,
+    ) -> list[list[Union[str, int]]]:
+        """
+        Get every kline between startTime and endTime (milliseconds, inclusive),
+        paginating with the maximum page size Binance allows per call.
+        """
+        klines: list[list[Union[str, int]]] = []
+        next_start_time = startTime
+        while next_start_time <= endTime:
+            page = self.get_klines_by_symbol(
+                symbol=symbol,
+                interval=interval,
+                limit=BINANCE_KLINES_MAX_LIMIT,
+                startTime=next_start_time,
+                endTime=endTime,
+            )
+            if len(page) == 0:
+                break
+
+            klines.extend(page)
+            self.cache_closed_klines(symbol, page)
+
+            if len(page) < BINANCE_KLINES_MAX_LIMIT:
+                break
+            # Next page starts right after the close time of the last candle
+            next_start_time = int(page[-1][6]) + 1
+
+        return klines
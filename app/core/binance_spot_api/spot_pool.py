@@ -0,0 +1,50 @@
+import threading
+from typing import Any
+
+from requests.adapters import HTTPAdapter
+
+from binance.spot import Spot
+
+
+class ThreadLocalSpot:
+    """
+    Spot client shared across threads.
+    Each thread gets its own Spot (its requests.Session is not thread-safe), all of their sessions
+    mounted on one shared HTTPAdapter whose urllib3 connection pool is thread-safe, so keep-alive
+    connections are still reused across threads.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+    ) -> None:
+        self.__base_url = base_url
+        self.__timeout = timeout
+        self.__adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.__thread_local = threading.local()
+        self.__spot_clients: list[Spot] = []
+        self.__spot_clients_lock = threading.Lock()
+
+    def get_thread_spot_client(self) -> Spot:
+        spot_client = getattr(self.__thread_local, "spot_client", None)
+        if spot_client is None:
+            spot_client = Spot(base_url=self.__base_url, timeout=self.__timeout)
+            spot_client.session.mount("https://", self.__adapter)
+            spot_client.session.mount("http://", self.__adapter)
+            self.__thread_local.spot_client = spot_client
+            with self.__spot_clients_lock:
+                self.__spot_clients.append(spot_client)
+        return spot_client
+
+    def klines(self, *args: Any, **kwargs: Any) -> Any:
+        return self.get_thread_spot_client().klines(*args, **kwargs)
+
+    def close(self) -> None:
+        with self.__spot_clients_lock:
+            for spot_client in self.__spot_clients:
+                spot_client.session.close()
+            self.__spot_clients = []
+        self.__adapter.close()
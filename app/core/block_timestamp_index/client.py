@@ -0,0 +1,154 @@
+from typing import Iterable, Optional, Tuple
+
+from web3 import Web3
+
+from app.core.etherscan_http_client.model import EtherscanTransaction
+from app.core.log.logger import Logger
+from app.storage.block_timestamp_anchors_repositories.client import BlockTimestampAnchorsRepository
+from app.storage.models import BlockTimestampAnchor
+
+# (block_number, timestamp in seconds)
+BlockAnchor = Tuple[int, int]
+
+# Post merge every block is proposed in a 12 seconds slot, a missed slot only widens the gap
+FIRST_PROOF_OF_STAKE_BLOCK_NUMBER = 15_537_394
+SLOT_SECONDS = 12
+
+
+class BlockTimestampIndex:
+    """
+    Local timestamp -> block number lookup, same semantic as etherscan getblocknobytime.
+
+    Anchors are known (block, timestamp) pairs. A lookup is answered from the two anchors
+    bracketing the timestamp only when the answer is exact: the bracket is two consecutive
+    blocks, or a post merge bracket whose timestamp gap is exactly one slot per block
+    (no missed slot, so every block in between sits on a known timestamp).
+    Otherwise up to max_verification_probes interpolated blocks are read from the node to
+    narrow the bracket, and None is returned when it still can not be answered exactly.
+    """
+
+    def __init__(
+        self,
+        anchor_repo: BlockTimestampAnchorsRepository,
+        web3py: Optional[Web3] = None,
+        max_verification_probes: int = 2,
+    ) -> None:
+        self.__anchor_repo = anchor_repo
+        self.__web3py = web3py
+        self.__max_verification_probes = max_verification_probes
+        self.__logger = Logger(name=self.__class__.__name__)
+        self.hits = 0
+        self.misses = 0
+
+    def get_closest_block_number(self, timestamp: int, closest: str) -> Optional[int]:
+        """
+        closest is "before" (last block at or before timestamp) or "after" (first block at or after timestamp).
+        """
+        probed_anchors: list[BlockAnchor] = []
+        block_number: Optional[int] = None
+        try:
+            (lower_anchor, upper_anchor) = self.__anchor_repo.read_bracketing_anchors(timestamp)
+            lower = self.convert_anchor_repo_to_block_anchor(lower_anchor)
+            upper = self.convert_anchor_repo_to_block_anchor(upper_anchor)
+
+            block_number = self.resolve_from_anchors(timestamp, closest, lower, upper)
+            while (
+                block_number is None
+                and self.__web3py is not None
+                and len(probed_anchors) < self.__max_verification_probes
+            ):
+                probe_block_number = self.get_interpolated_block_number(timestamp, lower, upper)
+                if probe_block_number is None:
+                    break
+
+                probe = (probe_block_number, int(self.__web3py.eth.get_block(probe_block_number)["timestamp"]))
+                probed_anchors.append(probe)
+                if probe[1] <= timestamp:
+                    lower = probe
+                if probe[1] >= timestamp:
+                    upper = probe
+
+                block_number = self.resolve_from_anchors(timestamp, closest, lower, upper)
+
+        except Exception as e:
+            self.__logger.warn(f"Local block number lookup failed, falling back to etherscan |Error: {e!s}")
+            block_number = None
+
+        self.record_anchors(probed_anchors)
+
+        if block_number is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return block_number
+
+    def resolve_from_anchors(
+        self,
+        timestamp: int,
+        closest: str,
+        lower: Optional[BlockAnchor],
+        upper: Optional[BlockAnchor],
+    ) -> Optional[int]:
+        # Block timestamps are strictly increasing, an anchor on the timestamp answers both directions
+        if lower is not None and lower[1] == timestamp:
+            return lower[0]
+        if upper is not None and upper[1] == timestamp:
+            return upper[0]
+        if lower is None or upper is None:
+            return None
+
+        if upper[0] - lower[0] == 1:
+            return lower[0] if closest == "before" else upper[0]
+
+        if (
+            lower[0] >= FIRST_PROOF_OF_STAKE_BLOCK_NUMBER
+            and upper[1] - lower[1] == SLOT_SECONDS * (upper[0] - lower[0])
+        ):
+            (elapsed_slots, seconds_into_slot) = divmod(timestamp - lower[1], SLOT_SECONDS)
+            block_before = lower[0] + elapsed_slots
+            if closest == "before" or seconds_into_slot == 0:
+                return block_before
+            return block_before + 1
+
+        return None
+
+    def get_interpolated_block_number(
+        self,
+        timestamp: int,
+        lower: Optional[BlockAnchor],
+        upper: Optional[BlockAnchor],
+    ) -> Optional[int]:
+        """Linear estimate of the block at timestamp, strictly inside the bracket."""
+        if lower is None or upper is None or upper[0] - lower[0] < 2 or upper[1] <= lower[1]:
+            return None
+
+        estimate = lower[0] + (timestamp - lower[1]) * (upper[0] - lower[0]) // (upper[1] - lower[1])
+        return min(max(estimate, lower[0] + 1), upper[0] - 1)
+
+    def record_transactions(self, transactions: Iterable[EtherscanTransaction]) -> None:
+        """Every fetched transaction carries its block timestamp, keep them as anchors."""
+        anchors: dict[int, int] = {}
+        for tx in transactions:
+            if tx.blockNumber == "" or tx.timeStamp == "":
+                continue
+            anchors[int(tx.blockNumber)] = int(tx.timeStamp)
+
+        self.record_anchors(list(anchors.items()))
+
+    def record_anchors(self, anchors: list[BlockAnchor]) -> None:
+        if len(anchors) == 0:
+            return
+
+        try:
+            self.__anchor_repo.insert_anchors([
+                BlockTimestampAnchor(block_number=block_number, ts_timestamp=ts_timestamp)
+                for (block_number, ts_timestamp) in anchors
+            ])
+        except Exception as e:
+            # The index is an optimisation, never fail the caller over it
+            self.__logger.warn(f"Record block timestamp anchors failed |Error: {e!s}")
+
+    def convert_anchor_repo_to_block_anchor(self, anchor: Optional[BlockTimestampAnchor]) -> Optional[BlockAnchor]:
+        if anchor is None:
+            return None
+        return int(anchor.block_number), int(anchor.ts_timestamp)
@@ -31,9 +31,45 @@ class AppConfig(BaseSettings):
     #Binance Spot Base Url
     binance_spot_base_url: str = "https://testnet.binance.vision"
 
+    #Binance Kline Price Cache Config
+    binance_kline_cache_max_size: int = 10000
+    binance_kline_cache_ttl_seconds: int = 3600
+
     #EtherScan Base Url
     etherscan_base_url: str = "https://api.etherscan.io/api"
     etherscan_api_key: str = os.environ.get("ETHERSCAN_API_KEY", "")
+    etherscan_tokentx_page_size: int = 1000
+
+    #EtherScan Rate Limit Config (per worker process)
+    etherscan_rate_limit_calls_per_second: float = 5
+    etherscan_rate_limit_burst: int = 5
+    etherscan_rate_limit_max_retries: int = 2
+
+    #EtherScan Concurrent Fan-out Config
+    etherscan_fanout_max_workers: int = 4
+    etherscan_fanout_block_range_size: int = 1000
+
+    #Block Timestamp Index Config
+    block_timestamp_index_max_verification_probes: int = 2
+
+    #Pool Scrape Coverage Config
+    pool_coverage_max_remote_sub_ranges: int = 10
+
+    #Time Range Pagination Config
+    time_range_max_page_size: int = 1000
+
+    #Transaction Fee Batch Config
+    transaction_fee_batch_max_size: int = 1000
+
+    #Route Blocking Executor Config
+    route_blocking_executor_max_workers: int = 16
+
+    #Http Client Connection Pool Config
+    http_client_pool_connections: int = 10
+    http_client_pool_maxsize: int = 20
+    http_client_max_retries: int = 3
+    http_client_backoff_factor: float = 0.5
+    http_client_timeout_seconds: float = 30
     
     #Validator Node Url Provider
     validator_node_url_provider: str = os.environ.get("VALIDATOR_NODE_URL", "")
@@ -41,6 +77,14 @@ class AppConfig(BaseSettings):
     #Scrapping Job Config
     scrapping_job_interval_seconds: int = 10
     scrapping_job_max_count_per_interval: int = 20
+    scrapping_job_catch_up_max_count: int = 1000
+
+    #Scrapping Engine Config
+    scrapping_engine_max_workers: int = 4
+
+    #Scrapping Task Lease Config
+    scrapping_task_heartbeat_seconds: int = 10
+    scrapping_task_lease_ttl_seconds: int = 30
 
 @lru_cache
 def get_config(
@@ -1,17 +1,44 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+
 from sqlalchemy.orm import Session
 from web3 import Web3
+from app.core.binance_spot_api.cache import KlinePriceCache
 from app.core.binance_spot_api.client import BinanceSpotApiClient
+from app.core.binance_spot_api.spot_pool import ThreadLocalSpot
+from app.core.block_timestamp_index.client import BlockTimestampIndex
+from app.core.etherscan_http_client.async_client import AsyncEtherscanHttpclient
 from app.core.etherscan_http_client.client import EtherscanHttpclient
 
 from app.core.scrapper_service.client import ScrapperService
+from app.core.scrapping_engine.client import ScrappingEngine
+from app.core.scrapping_engine.coordinator import ScrappingTaskCoordinator, get_worker_owner_id
 from app.storage.connection import get_session
 from binance.spot import Spot
 from app.core.config import app_config
+from app.storage.block_timestamp_anchors_repositories.client import BlockTimestampAnchorsRepository
+from app.storage.eth_usdt_klines_repositories.client import EthUsdtKlinesRepository
+from app.storage.pool_scrape_coverage_repositories.client import PoolScrapeCoverageRepository
+from app.storage.pool_scrape_state_repositories.client import PoolScrapeStateRepository
+from app.storage.pool_scrape_tasks_repositories.client import PoolScrapeTasksRepository
 from app.storage.token_pair_pools_repositories.client import TokenPairPoolsRepository
 from app.storage.transactions_to_from_pools_repositories.client import TransactionToFromPoolRepository
-from app.utils.http_client.client import ether_scan_client
+from app.utils.http_client.client import async_ether_scan_client, ether_scan_client
+from app.utils.rate_limiter.client import etherscan_rate_limiter
+
 
+# Singleton, shared by every BinanceSpotApiClient so cached prices outlive a single request
+binance_kline_price_cache = KlinePriceCache(
+    max_size=app_config.binance_kline_cache_max_size,
+    ttl_seconds=app_config.binance_kline_cache_ttl_seconds,
+)
 
+# Singleton, bounded pool for concurrent etherscan lookups and tokentx sub-range fetches
+etherscan_fanout_executor = ThreadPoolExecutor(
+    max_workers=app_config.etherscan_fanout_max_workers,
+    thread_name_prefix="etherscan_fanout",
+)
 
 
 # Scoped
@@ -24,24 +51,139 @@ def get_token_pair_pools_repo() -> TokenPairPoolsRepository:
 def get_transaction_pool_repo() -> TransactionToFromPoolRepository:
     return TransactionToFromPoolRepository(db_session=get_db_session)
 
-def get_binance_spot_client() -> BinanceSpotApiClient:
+def get_eth_usdt_klines_repo() -> EthUsdtKlinesRepository:
+    return EthUsdtKlinesRepository(db_session=get_db_session)
+
+def get_block_timestamp_anchors_repo() -> BlockTimestampAnchorsRepository:
+    return BlockTimestampAnchorsRepository(db_session=get_db_session)
+
+def get_pool_scrape_coverage_repo() -> PoolScrapeCoverageRepository:
+    return PoolScrapeCoverageRepository(db_session=get_db_session)
+
+def get_pool_scrape_state_repo() -> PoolScrapeStateRepository:
+    return PoolScrapeStateRepository(db_session=get_db_session)
+
+def get_pool_scrape_tasks_repo() -> PoolScrapeTasksRepository:
+    return PoolScrapeTasksRepository(db_session=get_db_session)
+
+def get_block_timestamp_index(web3py: Web3) -> BlockTimestampIndex:
+    return BlockTimestampIndex(
+        anchor_repo=get_block_timestamp_anchors_repo(),
+        web3py=web3py,
+        max_verification_probes=app_config.block_timestamp_index_max_verification_probes,
+    )
+
+def get_spot_client() -> Spot:
     # Initialize with api key and secret if required
+    # return Spot(timeout=1)
+    return Spot(base_url=app_config.binance_spot_base_url, timeout=5)
+
+def get_thread_local_spot_client() -> ThreadLocalSpot:
+    return ThreadLocalSpot(base_url=app_config.binance_spot_base_url, timeout=5)
+
+def get_binance_spot_client(spot_client: Optional[Union[Spot, ThreadLocalSpot]] = None) -> BinanceSpotApiClient:
     return BinanceSpotApiClient(
-        # spot_client=Spot(timeout=1),
-        spot_client=Spot(base_url=app_config.binance_spot_base_url, timeout=5),
+        spot_client=spot_client or get_spot_client(),
+        price_cache=binance_kline_price_cache,
     )
 
 def get_etherscan_httpclient() -> EtherscanHttpclient:
     return EtherscanHttpclient(
         http_client=ether_scan_client,
         api_key=app_config.etherscan_api_key,
+        rate_limiter=etherscan_rate_limiter,
     )
 
-def get_scrapper_service() -> ScrapperService:
+def get_async_etherscan_httpclient() -> AsyncEtherscanHttpclient:
+    return AsyncEtherscanHttpclient(
+        http_client=async_ether_scan_client,
+        api_key=app_config.etherscan_api_key,
+        rate_limiter=etherscan_rate_limiter,
+    )
+
+def get_web3py() -> Web3:
+    return Web3(Web3.HTTPProvider(app_config.validator_node_url_provider))
+
+def build_scrapper_service(
+        spot_client: Optional[Union[Spot, ThreadLocalSpot]] = None,
+        web3py: Optional[Web3] = None,
+) -> ScrapperService:
+    """Build a whole ScrapperService graph, only the ServiceContainer (or a benchmark) should need it."""
+    web3py = web3py or get_web3py()
     return ScrapperService(
-        binance_spot_client=get_binance_spot_client(),
+        binance_spot_client=get_binance_spot_client(spot_client),
         etherscan_client=get_etherscan_httpclient(),
         token_pair_pool_repo=get_token_pair_pools_repo(),
         transaction_pool_repo=get_transaction_pool_repo(),
-        web3py= Web3(Web3.HTTPProvider(app_config.validator_node_url_provider)),
+        web3py=web3py,
+        kline_repo=get_eth_usdt_klines_repo(),
+        async_etherscan_client=get_async_etherscan_httpclient(),
+        executor=etherscan_fanout_executor,
+        block_timestamp_index=get_block_timestamp_index(web3py),
+        coverage_repo=get_pool_scrape_coverage_repo(),
+        scrape_state_repo=get_pool_scrape_state_repo(),
     )
+
+
+class ServiceContainer:
+    """
+    Application-lifetime service graph: one ScrapperService with its binance/web3 clients (and their
+    connection pools), repositories and loggers, built on startup and shared by every request and
+    scrapping cycle of the process. Every part is stateless or thread-safe, the binance client gives
+    each thread its own session and database sessions are still opened per call by the repositories.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__spot_client: Optional[ThreadLocalSpot] = None
+        self.__web3py: Optional[Web3] = None
+        self.__scrapper_service: Optional[ScrapperService] = None
+
+    def start(self) -> None:
+        with self.__lock:
+            if self.__scrapper_service is not None:
+                return
+
+            self.__spot_client = get_thread_local_spot_client()
+            self.__web3py = get_web3py()
+            self.__scrapper_service = build_scrapper_service(spot_client=self.__spot_client, web3py=self.__web3py)
+
+    def get_scrapper_service(self) -> ScrapperService:
+        # Built on first use as well, for callers outside of the FastAPI lifespan (scripts, tests)
+        if self.__scrapper_service is None:
+            self.start()
+        return self.__scrapper_service
+
+    def shutdown(self) -> None:
+        with self.__lock:
+            if self.__spot_client is not None:
+                self.__spot_client.close()
+            self.__spot_client = None
+            self.__web3py = None
+            self.__scrapper_service = None
+
+
+# Singleton, started and shut down by the FastAPI lifespan
+service_container = ServiceContainer()
+
+def get_scrapper_service() -> ScrapperService:
+    return service_container.get_scrapper_service()
+
+
+# Singleton, runs the scrapping jobs of every started pool on its own bounded worker pool
+scrapping_engine = ScrappingEngine(
+    service_factory=get_scrapper_service,
+    max_workers=app_config.scrapping_engine_max_workers,
+    interval_seconds=app_config.scrapping_job_interval_seconds,
+    batch_size=app_config.scrapping_job_max_count_per_interval,
+    max_batch_size=app_config.scrapping_job_catch_up_max_count,
+)
+
+# Singleton, holds this worker's leases on the pool scrape tasks and feeds them to the scrapping engine
+scrapping_task_coordinator = ScrappingTaskCoordinator(
+    engine=scrapping_engine,
+    task_repo=get_pool_scrape_tasks_repo(),
+    owner_id=get_worker_owner_id(),
+    heartbeat_seconds=app_config.scrapping_task_heartbeat_seconds,
+    lease_ttl_seconds=app_config.scrapping_task_lease_ttl_seconds,
+)
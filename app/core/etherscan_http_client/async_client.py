@@ -0,0 +1,208 @@
+from typing import AsyncIterator, Optional
+
+from app.core.config import app_config
+from app.core.etherscan_http_client.client import BaseEtherscanHttpclient
+from app.core.etherscan_http_client.model import EtherscanBlockNumberResponse, EtherscanParamsProxyModule, EtherscanProxyModuleResponse, EtherscanTransaction, EtherscanTxResponse
+from app.core.log.logger import Logger
+from app.utils.http_client.async_base_class import AsyncHttpClient
+from app.utils.rate_limiter.base_class import TokenBucketRateLimiter
+
+
+class AsyncEtherscanHttpclient(BaseEtherscanHttpclient):
+    """
+    Async etherscan http client, same methods as EtherscanHttpclient without blocking the event loop
+    """
+
+    def __init__(
+        self,
+        http_client: AsyncHttpClient,
+        api_key: str,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ) -> None:
+        self.__http_client = http_client
+        self.__logger = Logger(name=self.__class__.__name__)
+        self.__api_key = api_key
+        self.__rate_limiter = rate_limiter
+
+    async def __get(self, params: dict) -> dict:
+        """
+        Rate limited GET, a rate limited reply (or HTTP 429) is retried once the next token is available.
+        """
+        response_json: dict = {}
+        for attempt in range(app_config.etherscan_rate_limit_max_retries + 1):
+            if self.__rate_limiter is not None:
+                await self.__rate_limiter.acquire_async()
+
+            try:
+                response_json = await self.__http_client.get(params=params)
+            except Exception as e:
+                if not self.is_rate_limited_http_error(e) or attempt == app_config.etherscan_rate_limit_max_retries:
+                    raise
+                self.__logger.warn(f"Etherscan rate limit reached (HTTP 429), attempt {attempt + 1}")
+                continue
+
+            if not self.is_rate_limited_response(response_json):
+                return response_json
+            self.__logger.warn(f"Etherscan rate limit reached, attempt {attempt + 1}")
+
+        return response_json
+
+    async def get_latest_token_txs(
+        self,
+        address: str,
+    ) -> EtherscanTxResponse:
+        """
+        Get latest token transactions
+        """
+        try:
+            queryParams = self.get_default_latest_tokentx_etherscan_params()
+            queryParams.address = address
+            queryParams.apikey = self.__api_key
+
+            response_json = await self.__get(queryParams.model_dump())
+            return EtherscanTxResponse(**response_json)
+
+        except Exception as e:
+            description = "Get latest token transactions failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Get latest token transactions failed"
+            raise Exception(error_message) from e
+
+    async def get_token_txs_by_start_and_end_block(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            page: int = 1,
+            offset: Optional[int] = None,
+    ) -> EtherscanTxResponse:
+        """
+        Get one page of token transactions by start and end block
+        """
+        try:
+            queryParams = self.get_default_start_block_tokentx_etherscan_params()
+            queryParams.address = address
+            queryParams.startblock = start_block
+            queryParams.endblock = end_block
+            queryParams.page = page
+            if offset is not None:
+                queryParams.offset = offset
+            queryParams.apikey = self.__api_key
+
+            response_json = await self.__get(queryParams.model_dump())
+            return EtherscanTxResponse(**response_json)
+
+        except Exception as e:
+            description = "Get token transactions by start and end block failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Get token transactions by start and end block failed"
+            raise Exception(error_message) from e
+
+    async def iter_token_txs_by_start_and_end_block(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            page_size: Optional[int] = None,
+    ) -> AsyncIterator[EtherscanTransaction]:
+        """
+        Stream every token transaction between start and end block, walking pages in ascending order.
+        The paging past etherscan's result window is done by advance_token_txs_page_cursor.
+        """
+        cursor = self.get_token_txs_page_cursor(start_block, page_size or app_config.etherscan_tokentx_page_size)
+        while not cursor.is_done:
+            result = await self.get_token_txs_by_start_and_end_block(
+                address=address,
+                start_block=cursor.window_start_block,
+                end_block=end_block,
+                page=cursor.page,
+                offset=cursor.page_size,
+            )
+            try:
+                page_txs = self.advance_token_txs_page_cursor(cursor, result.result)
+            except Exception as e:
+                self.__logger.error(str(e))
+                raise
+
+            for tx in page_txs:
+                yield tx
+
+    async def get_token_txs_by_start_block(
+        self,
+        address: str,
+        start_block: int,
+        offset: Optional[int] = None,
+    ) -> EtherscanTxResponse:
+        """
+        Get token transactions by start block, offset defaults to ETHERSCAN_START_BLOCK_TOKENTX_OFFSET
+        """
+        try:
+            queryParams = self.get_default_start_block_tokentx_etherscan_params()
+            queryParams.address = address
+            queryParams.startblock = start_block
+            if offset is not None:
+                queryParams.offset = offset
+            queryParams.apikey = self.__api_key
+
+            response_json = await self.__get(queryParams.model_dump())
+            return EtherscanTxResponse(**response_json)
+
+        except Exception as e:
+            description = "Get token transactions by start block failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Get token transactions by start block failed"
+            raise Exception(error_message) from e
+
+    async def get_closest_block_number_by_start_timestamp(
+            self,
+            timestamp: int
+    ) -> EtherscanBlockNumberResponse:
+        try:
+            queryParams = self.get_default_ts_after_etherscan_params()
+            queryParams.timestamp = timestamp
+            queryParams.apikey = self.__api_key
+            response_json = await self.__get(queryParams.model_dump())
+            return EtherscanBlockNumberResponse(**response_json)
+        except Exception as e:
+            description = "Get closest block number by start timestamp failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Get closest block number by start timestamp failed"
+            raise Exception(error_message) from e
+
+    async def get_closest_block_number_by_end_timestamp(
+            self,
+            timestamp: int
+    ) -> EtherscanBlockNumberResponse:
+        try:
+            queryParams = self.get_default_ts_before_etherscan_params()
+            queryParams.timestamp = timestamp
+            queryParams.apikey = self.__api_key
+            response_json = await self.__get(queryParams.model_dump())
+            return EtherscanBlockNumberResponse(**response_json)
+        except Exception as e:
+            description = "Get closest block number by end timestamp failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Get closest block number by end timestamp failed"
+            raise Exception(error_message) from e
+
+    async def get_transactipn_reciept_with_tx_hash(
+            self,
+            tx_hash: str
+    ) -> EtherscanProxyModuleResponse:
+        try:
+            queryParams = EtherscanParamsProxyModule()
+            queryParams.txhash = tx_hash
+            queryParams.apikey = self.__api_key
+            response_json = await self.__get(queryParams.model_dump())
+            return EtherscanProxyModuleResponse(**response_json)
+        except Exception as e:
+            description = "Get transaction receipt with tx hash failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Get transaction receipt with tx hash failed"
+            raise Exception(error_message) from e
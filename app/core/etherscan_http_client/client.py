@@ -1,28 +1,24 @@
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Tuple
 from urllib import response
 
-from app.core.etherscan_http_client.model import EtherscanBlockNumberResponse, EtherscanParams, EtherscanParamsBlockModule, EtherscanParamsProxyModule, EtherscanProxyModuleResponse, EtherscanTxResponse
+from app.core.etherscan_http_client.model import EtherscanBlockNumberResponse, EtherscanParams, EtherscanTokenTxsPageCursor, EtherscanParamsBlockModule, EtherscanParamsProxyModule, EtherscanProxyModuleResponse, EtherscanTransaction, EtherscanTxResponse
 from app.core.log.logger import Logger
 from binance.spot import Spot
 
 from app.utils.http_client.base_class import HttpClient
+from app.utils.rate_limiter.base_class import TokenBucketRateLimiter
 from app.core.config import app_config
 
-class EtherscanHttpclient:
-    """
-    Etherscan http client
-    """
-
-    def __init__(
-        self,
-        http_client: HttpClient,
-        api_key: str,
+# Etherscan only returns the first 10,000 records (page x offset) of any query
+ETHERSCAN_RESULT_WINDOW = 10000
 
-    ) -> None:
-        self.__http_client = http_client
-        self.__logger = Logger(name=self.__class__.__name__)
-        self.__api_key = api_key
+# Page size of the scrapping job tokentx query, a full page may end in the middle of a block
+ETHERSCAN_START_BLOCK_TOKENTX_OFFSET = 100
 
+class BaseEtherscanHttpclient:
+    """
+    Request params shared by the sync and async etherscan http clients
+    """
 
     def get_default_latest_tokentx_etherscan_params(self) -> EtherscanParams:
         """
@@ -43,7 +39,7 @@ class EtherscanHttpclient:
             module="account",
             action="tokentx",
             page=1,
-            offset=100,
+            offset=ETHERSCAN_START_BLOCK_TOKENTX_OFFSET,
             sort="asc"
             )
     
@@ -65,6 +61,112 @@ class EtherscanHttpclient:
             closest="after"
         )
     
+    def is_rate_limited_response(self, response_json: dict) -> bool:
+        """Etherscan answers 200 with status 0 and a 'Max rate limit reached' result once the key's cap is hit."""
+        result = response_json.get("result")
+        return response_json.get("status") == "0" and isinstance(result, str) and "rate limit" in result.lower()
+
+    def is_rate_limited_http_error(self, error: Exception) -> bool:
+        """An HTTP 429 raised by the http client, possibly re-raised with the original error as its cause."""
+        response = getattr(error, "response", None)
+        if response is None:
+            # requests responses are falsy for 4xx/5xx, compare against None
+            response = getattr(error.__cause__, "response", None)
+        return response is not None and response.status_code == 429
+
+    def get_token_transfer_key(self, tx: EtherscanTransaction) -> Tuple[str, ...]:
+        """A transaction hash can carry several transfers, identify a single transfer within it."""
+        return (tx.hash, tx.contractAddress, tx.from_, tx.to, tx.value)
+
+    def get_token_txs_page_cursor(self, start_block: int, page_size: int) -> EtherscanTokenTxsPageCursor:
+        return EtherscanTokenTxsPageCursor(
+            page_size=page_size,
+            window_start_block=start_block,
+            last_block=str(start_block),
+        )
+
+    def advance_token_txs_page_cursor(
+        self,
+        cursor: EtherscanTokenTxsPageCursor,
+        page_txs: list[EtherscanTransaction],
+    ) -> list[EtherscanTransaction]:
+        """
+        Take the page fetched at (cursor.window_start_block, cursor.page) and return its transfers not yielded yet.
+        Etherscan only serves the first 10,000 results (page x offset) of a query, once that window
+        is used up the cursor restarts from the last block seen, skipping the transfers already yielded.
+        cursor.is_done is set after the last page.
+        """
+        new_txs = []
+        for tx in page_txs:
+            transfer_key = self.get_token_transfer_key(tx)
+            if tx.blockNumber == str(cursor.window_start_block) and transfer_key in cursor.boundary_transfer_keys:
+                continue
+
+            if tx.blockNumber != cursor.last_block:
+                cursor.last_block = tx.blockNumber
+                cursor.last_block_transfer_keys = set()
+            cursor.last_block_transfer_keys.add(transfer_key)
+            new_txs.append(tx)
+
+        if len(page_txs) < cursor.page_size:
+            cursor.is_done = True
+            return new_txs
+
+        if (cursor.page + 1) * cursor.page_size <= ETHERSCAN_RESULT_WINDOW:
+            cursor.page += 1
+            return new_txs
+
+        if cursor.last_block == str(cursor.window_start_block):
+            error_message = f"Block {cursor.last_block} has more token transactions than etherscan result window allows"
+            raise Exception(error_message)
+
+        cursor.window_start_block = int(cursor.last_block)
+        cursor.boundary_transfer_keys = cursor.last_block_transfer_keys
+        cursor.last_block_transfer_keys = set(cursor.boundary_transfer_keys)
+        cursor.page = 1
+        return new_txs
+
+
+class EtherscanHttpclient(BaseEtherscanHttpclient):
+    """
+    Etherscan http client
+    """
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        api_key: str,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ) -> None:
+        self.__http_client = http_client
+        self.__logger = Logger(name=self.__class__.__name__)
+        self.__api_key = api_key
+        self.__rate_limiter = rate_limiter
+
+    def __get(self, params: dict) -> dict:
+        """
+        Rate limited GET, a rate limited reply (or HTTP 429) is retried once the next token is available.
+        """
+        response_json: dict = {}
+        for attempt in range(app_config.etherscan_rate_limit_max_retries + 1):
+            if self.__rate_limiter is not None:
+                self.__rate_limiter.acquire()
+
+            try:
+                with self.__http_client.get_session() as session:
+                    response_json = self.__http_client.get(session, params=params)
+            except Exception as e:
+                if not self.is_rate_limited_http_error(e) or attempt == app_config.etherscan_rate_limit_max_retries:
+                    raise
+                self.__logger.warn(f"Etherscan rate limit reached (HTTP 429), attempt {attempt + 1}")
+                continue
+
+            if not self.is_rate_limited_response(response_json):
+                return response_json
+            self.__logger.warn(f"Etherscan rate limit reached, attempt {attempt + 1}")
+
+        return response_json
+
     def get_latest_token_txs(
         self,
         address: str,
@@ -77,9 +179,8 @@ class EtherscanHttpclient:
             queryParams.address = address
             queryParams.apikey = self.__api_key
 
-            with self.__http_client.get_session() as session:
-                response_json = self.__http_client.get(session, params=queryParams.model_dump())
-                return EtherscanTxResponse(**response_json)
+            response_json = self.__get(queryParams.model_dump())
+            return EtherscanTxResponse(**response_json)
 
         except Exception as e:
             description = "Get latest token transactions failed"
@@ -92,21 +193,25 @@ class EtherscanHttpclient:
             self,
             address: str,
             start_block: int,
-            end_block: int
+            end_block: int,
+            page: int = 1,
+            offset: Optional[int] = None,
     ) -> EtherscanTxResponse:
         """
-        Get token transactions by start and end block
+        Get one page of token transactions by start and end block
         """
         try:
             queryParams = self.get_default_start_block_tokentx_etherscan_params()
             queryParams.address = address
             queryParams.startblock = start_block
             queryParams.endblock = end_block
+            queryParams.page = page
+            if offset is not None:
+                queryParams.offset = offset
             queryParams.apikey = self.__api_key
 
-            with self.__http_client.get_session() as session:
-                response_json = self.__http_client.get(session, params=queryParams.model_dump())
-                return EtherscanTxResponse(**response_json)
+            response_json = self.__get(queryParams.model_dump())
+            return EtherscanTxResponse(**response_json)
 
         except Exception as e:
             description = "Get token transactions by start and end block failed"
@@ -115,23 +220,53 @@ class EtherscanHttpclient:
             error_message = "Get token transactions by start and end block failed"
             raise Exception(error_message) from e
 
+    def iter_token_txs_by_start_and_end_block(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            page_size: Optional[int] = None,
+    ) -> Iterator[EtherscanTransaction]:
+        """
+        Stream every token transaction between start and end block, walking pages in ascending order.
+        The paging past etherscan's result window is done by advance_token_txs_page_cursor.
+        """
+        cursor = self.get_token_txs_page_cursor(start_block, page_size or app_config.etherscan_tokentx_page_size)
+        while not cursor.is_done:
+            result = self.get_token_txs_by_start_and_end_block(
+                address=address,
+                start_block=cursor.window_start_block,
+                end_block=end_block,
+                page=cursor.page,
+                offset=cursor.page_size,
+            )
+            try:
+                page_txs = self.advance_token_txs_page_cursor(cursor, result.result)
+            except Exception as e:
+                self.__logger.error(str(e))
+                raise
+
+            yield from page_txs
+
     def get_token_txs_by_start_block(
         self,
         address: str,
         start_block: int,
+        offset: Optional[int] = None,
     ) -> EtherscanTxResponse:
         """
-        Get token transactions by start block
+        Get token transactions by start block, offset defaults to ETHERSCAN_START_BLOCK_TOKENTX_OFFSET
         """
         try:
             queryParams = self.get_default_start_block_tokentx_etherscan_params()
             queryParams.address = address
             queryParams.startblock = start_block
+            if offset is not None:
+                queryParams.offset = offset
             queryParams.apikey = self.__api_key
 
-            with self.__http_client.get_session() as session:
-                response_json = self.__http_client.get(session, params=queryParams.model_dump())
-                return EtherscanTxResponse(**response_json)
+            response_json = self.__get(queryParams.model_dump())
+            return EtherscanTxResponse(**response_json)
 
         except Exception as e:
             description = "Get token transactions by start block failed"
@@ -148,9 +283,8 @@ class EtherscanHttpclient:
             queryParams = self.get_default_ts_after_etherscan_params()
             queryParams.timestamp = timestamp
             queryParams.apikey = self.__api_key
-            with self.__http_client.get_session() as session:
-                response_json = self.__http_client.get(session, params=queryParams.model_dump())
-                return EtherscanBlockNumberResponse(**response_json)
+            response_json = self.__get(queryParams.model_dump())
+            return EtherscanBlockNumberResponse(**response_json)
         except Exception as e:
             description = "Get closest block number by start timestamp failed"
             log_message = f"Description: {description} |Error: {e!s}"
@@ -166,9 +300,8 @@ class EtherscanHttpclient:
             queryParams = self.get_default_ts_before_etherscan_params()
             queryParams.timestamp = timestamp
             queryParams.apikey = self.__api_key
-            with self.__http_client.get_session() as session:
-                response_json = self.__http_client.get(session, params=queryParams.model_dump())
-                return EtherscanBlockNumberResponse(**response_json)
+            response_json = self.__get(queryParams.model_dump())
+            return EtherscanBlockNumberResponse(**response_json)
         except Exception as e:
             description = "Get closest block number by start timestamp failed"
             log_message = f"Description: {description} |Error: {e!s}"
@@ -184,9 +317,8 @@ class EtherscanHttpclient:
             queryParams = EtherscanParamsProxyModule()
             queryParams.txhash = tx_hash
             queryParams.apikey = self.__api_key
-            with self.__http_client.get_session() as session:
-                response_json = self.__http_client.get(session, params=queryParams.model_dump())
-                return EtherscanProxyModuleResponse(**response_json)
+            response_json = self.__get(queryParams.model_dump())
+            return EtherscanProxyModuleResponse(**response_json)
         except Exception as e:
             description = "Get transaction receipt with tx hash failed"
             log_message = f"Description: {description} |Error: {e!s}"
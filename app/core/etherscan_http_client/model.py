@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Tuple
 
 class EtherscanParams(BaseModel):
     module: Optional[str] = None
@@ -90,3 +90,15 @@ class EtherscanProxyModuleResponse(BaseModel):
     jsonrpc: str = ""
     id: int = ""
     result: EtherscanProxyModuleResult = None
+
+class EtherscanTokenTxsPageCursor(BaseModel):
+    """Paging state of a tokentx block range walk, advanced by BaseEtherscanHttpclient.advance_token_txs_page_cursor"""
+    page_size: int
+    # Start block of the current result window and page within it
+    window_start_block: int
+    page: int = 1
+    is_done: bool = False
+    # Transfers of the block the window restarted from, yielded by the previous window
+    boundary_transfer_keys: set[Tuple[str, ...]] = set()
+    last_block: str = ""
+    last_block_transfer_keys: set[Tuple[str, ...]] = set()
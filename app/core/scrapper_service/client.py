@@ -1,24 +1,36 @@
+import asyncio
+import itertools
+from collections import deque
+from concurrent.futures import Executor, Future
 from datetime import datetime
 from decimal import Decimal
 import decimal
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple, Union
 from unittest import result
 from hexbytes import HexBytes
 import requests
 from web3 import Web3
 
+from app.core.binance_spot_api.cache import ONE_MINUTE_IN_MILLISECONDS
+from app.core.block_timestamp_index.client import BlockTimestampIndex
 from app.core.binance_spot_api.client import BinanceSpotApiClient
-from app.core.etherscan_http_client.client import EtherscanHttpclient
+from app.core.etherscan_http_client.async_client import AsyncEtherscanHttpclient
+from app.core.etherscan_http_client.client import ETHERSCAN_START_BLOCK_TOKENTX_OFFSET, EtherscanHttpclient
 from app.core.etherscan_http_client.model import EtherscanBlockNumberResponse, EtherscanProxyModuleResult, EtherscanTransaction, EtherscanTransactionWithUsdtFee
-from app.core.scrapper_service.model import ClosedPriceResult, TokenDetail, TransactionFeeCalcResult, TransactionSwapExecutionPrice
+from app.core.scrapper_service.model import ClosedPriceResult, ScrappingJobResult, TokenDetail, TransactionFeeCalcResult, TransactionSwapExecutionPrice
 from app.core.log.logger import Logger
+from app.storage.eth_usdt_klines_repositories.client import EthUsdtKlinesRepository
+from app.storage.pool_scrape_coverage_repositories.client import PoolScrapeCoverageRepository
+from app.storage.pool_scrape_state_repositories.client import PoolScrapeStateRepository
 from app.storage.token_pair_pools_repositories.client import TokenPairPoolsRepository
-from app.storage.models import TokenPairPool
+from app.storage.models import EthUsdtKline, PoolScrapeState, TokenPairPool
 from app.storage.transactions_to_from_pools_repositories.client import TransactionToFromPoolRepository
 from app.storage.models import TransactionToFromPool
 from app.core.scrapper_service.abis import uniswap_v3_swap_abi
 from app.core.config import app_config
 
+ETH_USDT_SYMBOL = "ethusdt"
+
 
 class ScrapperService:
     def __init__(self, 
@@ -26,18 +38,43 @@ class ScrapperService:
                  etherscan_client: EtherscanHttpclient, 
                  token_pair_pool_repo: TokenPairPoolsRepository, 
                  transaction_pool_repo: TransactionToFromPoolRepository,
-                 web3py: Web3
+                 web3py: Web3,
+                 kline_repo: Optional[EthUsdtKlinesRepository] = None,
+                 async_etherscan_client: Optional[AsyncEtherscanHttpclient] = None,
+                 executor: Optional[Executor] = None,
+                 block_timestamp_index: Optional[BlockTimestampIndex] = None,
+                 coverage_repo: Optional[PoolScrapeCoverageRepository] = None,
+                 scrape_state_repo: Optional[PoolScrapeStateRepository] = None,
                  ) -> None:
         self.__binance_spot_client = binance_spot_client
         self.__etherscan_client = etherscan_client
         self.__token_pair_pool_repo = token_pair_pool_repo
         self.__transaction_pool_repo = transaction_pool_repo
         self.__web3py = web3py
+        self.__kline_repo = kline_repo
+        self.__async_etherscan_client = async_etherscan_client
+        self.__executor = executor
+        self.__block_timestamp_index = block_timestamp_index
+        self.__coverage_repo = coverage_repo
+        self.__scrape_state_repo = scrape_state_repo
         self.__logger = Logger(name=self.__class__.__name__) 
 
-    def get_token_txs_by_start_block(self, address: str, start_block: int) -> list[EtherscanTransaction]:
-        result = self.__etherscan_client.get_token_txs_by_start_block(address, start_block)
+    def get_token_txs_by_start_block(
+            self,
+            address: str,
+            start_block: int,
+            offset: Optional[int] = None,
+    ) -> list[EtherscanTransaction]:
+        result = self.__etherscan_client.get_token_txs_by_start_block(address, start_block, offset)
         return result.result
+
+    def get_start_block_tokentx_offset(self, max_count: int) -> int:
+        """
+        Etherscan page size of a scrapping job batch: max_count capped at etherscan_tokentx_page_size,
+        never below ETHERSCAN_START_BLOCK_TOKENTX_OFFSET so the already stored part of the start block
+        cannot fill a small page.
+        """
+        return min(max(max_count, ETHERSCAN_START_BLOCK_TOKENTX_OFFSET), app_config.etherscan_tokentx_page_size)
     
     def get_latest_token_txs(self, address: str) -> list[EtherscanTransaction]:
         result = self.__etherscan_client.get_latest_token_txs(address)
@@ -53,32 +90,237 @@ class ScrapperService:
 
         return self.get_closed_price_from_klines(kline_list[0])
     
-    def scrapping_job(self, address: str, start_block: int, pool_id: int) -> bool:
-        """transaction will ignore first block and duplicate block."""
-        
-        token_txs = self.get_token_txs_by_start_block(address, start_block)
-        transaction_to_be_insert: list[TransactionToFromPool] = []
+    def scrapping_job(
+            self,
+            address: str,
+            start_block: int,
+            pool_id: int,
+            last_tx_index: Optional[int] = None,
+            max_count: Optional[int] = None,
+            start_block_covered: bool = False,
+    ) -> ScrappingJobResult:
+        """
+        transaction will ignore duplicate block.
+        Without last_tx_index the whole start block is ignored, with it the job resumes
+        right after the (start_block, last_tx_index) watermark.
+        start_block_covered tells the watermark was written by a previous batch, so every transfer of
+        start_block up to last_tx_index is stored and start_block can be recorded as covered.
+        At most max_count transactions (default scrapping_job_max_count_per_interval) are inserted,
+        has_more tells whether the batch stopped short of the fetched transactions.
+        """
+        if max_count is None:
+            max_count = app_config.scrapping_job_max_count_per_interval
+
+        requested_offset = self.get_start_block_tokentx_offset(max_count)
+        token_txs = self.get_token_txs_by_start_block(address, start_block, requested_offset)
+        transaction_to_be_priced: list[EtherscanTransaction] = []
         processed_transactions = set()
-        for tx in token_txs:
-            if tx.blockNumber == str(start_block):
+        last_processed_index = len(token_txs) - 1
+        for (index, tx) in enumerate(token_txs):
+            if self.is_before_scrape_watermark(tx, start_block, last_tx_index):
                 continue 
 
             if tx.hash in processed_transactions:
                 continue
             processed_transactions.add(tx.hash)
-            transaction_fee = self.calculate_transaction_fee_in_usdt(tx)
-            transformed_tx = self.convert_etherTx_to_transaction_repo(
-                tx=tx,
-                pool_id=pool_id,
-                usdt_fee=transaction_fee.transaction_fee
-            )
-            transaction_to_be_insert.append(transformed_tx)
+            transaction_to_be_priced.append(tx)
 
-            if len(transaction_to_be_insert) == app_config.scrapping_job_max_count_per_interval:
+            if len(transaction_to_be_priced) == max_count:
+                last_processed_index = index
                 break
 
-        self.__transaction_pool_repo.insert_transaction_to_from_pool_data(transaction_to_be_insert)
-        return True
+        last_block = int(transaction_to_be_priced[-1].blockNumber) if len(transaction_to_be_priced) > 0 else start_block
+        scrape_state = None
+        if len(transaction_to_be_priced) > 0:
+            # A batch ending inside a start block it did not fully store can not vouch for that block
+            scrape_state = self.convert_etherTx_to_scrape_state(
+                transaction_to_be_priced[-1],
+                pool_id,
+                written_by_scrapping_job=start_block_covered or last_block > start_block,
+            )
+        inserted_count = self.insert_priced_transactions(transaction_to_be_priced, pool_id, scrape_state=scrape_state)
+        self.record_scrapped_block_range(
+            pool_id, start_block, token_txs, last_processed_index, requested_offset, start_block_covered
+        )
+
+        chain_head_block_number = self.get_chain_head_block_number()
+        return ScrappingJobResult(
+            success=True,
+            fetched_count=len(transaction_to_be_priced),
+            inserted_count=inserted_count,
+            # Either the batch was capped or etherscan returned a full page, more is waiting past it
+            has_more=len(token_txs) >= requested_offset or last_processed_index < len(token_txs) - 1,
+            last_block=last_block,
+            lag_blocks=max(0, chain_head_block_number - last_block) if chain_head_block_number is not None else None,
+        )
+
+    def get_chain_head_block_number(self) -> Optional[int]:
+        try:
+            return int(self.__web3py.eth.block_number)
+        except Exception as e:
+            self.__logger.warn(f"Read chain head block number failed |Error: {e!s}")
+            return None
+
+    def backfill_transaction_pool(self, address: str, pool_id: int, start_block: int, end_block: int) -> int:
+        """
+        Stream every transfer of [start_block, end_block] into transactions_to_from_pools,
+        one etherscan page priced and bulk inserted at a time. Returns the inserted row count.
+        """
+        inserted_count = 0
+        transaction_to_be_priced: list[EtherscanTransaction] = []
+        # A transaction hash never spans blocks, only the current block hashes are kept
+        current_block = ""
+        current_block_transactions = set()
+        for tx in self.iter_token_txs_by_block_range(address, start_block, end_block):
+            if tx.blockNumber != current_block:
+                current_block = tx.blockNumber
+                current_block_transactions = set()
+            if tx.hash in current_block_transactions:
+                continue
+            current_block_transactions.add(tx.hash)
+            transaction_to_be_priced.append(tx)
+
+            if len(transaction_to_be_priced) == app_config.etherscan_tokentx_page_size:
+                inserted_count += self.insert_backfill_transactions(transaction_to_be_priced, pool_id)
+                transaction_to_be_priced = []
+
+        inserted_count += self.insert_backfill_transactions(transaction_to_be_priced, pool_id)
+
+        if self.__coverage_repo is not None:
+            self.__coverage_repo.insert_covered_block_range(pool_id, start_block, end_block)
+        return inserted_count
+
+    def insert_backfill_transactions(self, transactions: list[EtherscanTransaction], pool_id: int) -> int:
+        """Backfilled months are past the premade partitions, theirs are created before the insert."""
+        if len(transactions) == 0:
+            return 0
+
+        timestamps = [int(tx.timeStamp) for tx in transactions]
+        self.__transaction_pool_repo.create_partitions_for_time_range(min(timestamps), max(timestamps))
+        return self.insert_priced_transactions(transactions, pool_id)
+
+    def insert_priced_transactions(
+            self,
+            transactions: list[EtherscanTransaction],
+            pool_id: int,
+            scrape_state: Optional[PoolScrapeState] = None,
+    ) -> int:
+        """Price and bulk insert, scrape_state, when given, moves the pool watermark atomically with the rows."""
+        if len(transactions) == 0:
+            return 0
+
+        transaction_fees = self.calculate_transaction_fees_in_usdt(transactions)
+        inserted_count = self.__transaction_pool_repo.bulk_insert_transaction_to_from_pool_data(
+            (
+                self.convert_etherTx_to_transaction_repo(
+                    tx=tx,
+                    pool_id=pool_id,
+                    usdt_fee=transaction_fee.transaction_fee
+                )
+                for (tx, transaction_fee) in zip(transactions, transaction_fees)
+            ),
+            scrape_state=scrape_state,
+        )
+        self.record_block_timestamp_anchors(transactions)
+        return inserted_count
+
+    def is_before_scrape_watermark(self, tx: EtherscanTransaction, start_block: int, last_tx_index: Optional[int]) -> bool:
+        block_number = int(tx.blockNumber)
+        if block_number != start_block:
+            return block_number < start_block
+        return last_tx_index is None or int(tx.transactionIndex) <= last_tx_index
+
+    def read_scrape_watermark(self, address: str, pool_id: int) -> Optional[PoolScrapeState]:
+        """
+        Primary key lookup of the pool watermark, derived once from the latest stored
+        transaction for pools scraped before pool_scrape_state existed.
+        """
+        if self.__scrape_state_repo is not None:
+            scrape_state = self.__scrape_state_repo.read_pool_scrape_state(pool_id)
+            if scrape_state is not None:
+                return scrape_state
+
+        latest_tx = self.read_latest_transaction_pool(address=address, token_pool_pair_id=pool_id)
+        if not isinstance(latest_tx, TransactionToFromPool):
+            return None
+
+        return PoolScrapeState(
+            pool_id=pool_id,
+            last_block=latest_tx.block_number,
+            last_tx_index=int(latest_tx.transaction_index),
+        )
+
+    def convert_etherTx_to_scrape_state(
+            self,
+            tx: EtherscanTransaction,
+            pool_id: int,
+            written_by_scrapping_job: bool = False,
+    ) -> PoolScrapeState:
+        return PoolScrapeState(
+            pool_id=pool_id,
+            last_block=int(tx.blockNumber),
+            last_tx_index=int(tx.transactionIndex),
+            written_by_scrapping_job=written_by_scrapping_job,
+        )
+
+    def record_scrapped_block_range(
+            self,
+            pool_id: int,
+            start_block: int,
+            token_txs: list[EtherscanTransaction],
+            last_processed_index: int,
+            page_size: int = ETHERSCAN_START_BLOCK_TOKENTX_OFFSET,
+            start_block_covered: bool = False,
+    ) -> None:
+        if self.__coverage_repo is None:
+            return
+
+        covered_block_range = self.get_scrapped_block_range(
+            start_block, token_txs, last_processed_index, page_size, start_block_covered
+        )
+        if covered_block_range is None:
+            return
+
+        try:
+            self.__coverage_repo.insert_covered_block_range(pool_id, covered_block_range[0], covered_block_range[1])
+        except Exception as e:
+            # Coverage only decides where reads are served from, the scraped rows are already stored
+            self.__logger.warn(f"Record scrapped block range failed |Error: {e!s}")
+
+    def get_scrapped_block_range(
+            self,
+            start_block: int,
+            token_txs: list[EtherscanTransaction],
+            last_processed_index: int,
+            page_size: int = ETHERSCAN_START_BLOCK_TOKENTX_OFFSET,
+            start_block_covered: bool = False,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Blocks from start_block whose every transfer went through the scrapping job.
+        Resuming after a watermark written by a previous batch (start_block_covered), the earlier
+        transfers of start_block are already stored and start_block is covered. Otherwise the start
+        block was skipped in whole or in part (a seeded watermark only stored its newest transfer)
+        and coverage starts after it. The last processed block only counts when the
+        response is known to continue past it.
+        page_size is the etherscan offset token_txs was fetched with, a full page may end inside a block.
+        """
+        if last_processed_index < 0:
+            return None
+
+        last_processed_block = int(token_txs[last_processed_index].blockNumber)
+        if last_processed_index < len(token_txs) - 1:
+            next_block = int(token_txs[last_processed_index + 1].blockNumber)
+            covered_end_block = last_processed_block if next_block > last_processed_block else last_processed_block - 1
+        elif len(token_txs) >= page_size:
+            covered_end_block = last_processed_block - 1
+        else:
+            covered_end_block = last_processed_block
+
+        covered_start_block = start_block if start_block_covered else start_block + 1
+        if covered_end_block < covered_start_block:
+            return None
+
+        return covered_start_block, covered_end_block
     
     def insert_new_latest_transaction_pool(self, address: str, token_pool_pair_id: int) -> bool:
         try:
@@ -96,7 +338,10 @@ class ScrapperService:
                 usdt_fee=transaction_fee.transaction_fee
             )
 
-            self.__transaction_pool_repo.insert_first_transaction_to_from_pool_data([transform_first_block_tx])
+            self.__transaction_pool_repo.insert_first_transaction_to_from_pool_data(
+                [transform_first_block_tx],
+                scrape_state=self.convert_etherTx_to_scrape_state(first_block_tx, token_pool_pair_id),
+            )
 
             return True
 
@@ -153,31 +398,432 @@ class ScrapperService:
             start_time: int,
             end_time: int,
     ) -> list[EtherscanTransactionWithUsdtFee]:
-        historical_start_block = self.__etherscan_client.get_closest_block_number_by_start_timestamp(start_time)
-        historical_end_block = self.__etherscan_client.get_closest_block_number_by_end_timestamp(end_time)
+        return list(self.iter_historical_transaction_data(address, start_time, end_time))
 
-        if historical_start_block.status != "1" or historical_end_block.status != "1":
-            return []
+    def iter_historical_transaction_data(
+            self,
+            address: str,
+            start_time: int,
+            end_time: int,
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        """
+        Stream priced transactions of the time range, pages are fetched lazily
+        and priced one chunk at a time so a busy range is never fully held in memory.
+        """
+        block_range = self.get_historical_block_range(start_time, end_time)
+        if block_range is None:
+            return
+
+        (start_block, end_block) = block_range
+        yield from self.iter_transaction_data_by_block_range(address, start_block, end_block)
 
+    def get_historical_block_range(self, start_time: int, end_time: int) -> Optional[Tuple[int, int]]:
+        block_range = [
+            self.get_local_closest_block_number(start_time, closest="after"),
+            self.get_local_closest_block_number(end_time, closest="before"),
+        ]
+        remote_lookups = [
+            (index, lookup, timestamp)
+            for (index, lookup, timestamp) in (
+                (0, self.__etherscan_client.get_closest_block_number_by_start_timestamp, start_time),
+                (1, self.__etherscan_client.get_closest_block_number_by_end_timestamp, end_time),
+            )
+            if block_range[index] is None
+        ]
+
+        if self.__executor is not None and len(remote_lookups) > 1:
+            # Both lookups are independent, issue them concurrently
+            lookup_futures = [
+                (index, self.__executor.submit(lookup, timestamp))
+                for (index, lookup, timestamp) in remote_lookups
+            ]
+            responses = [(index, future.result()) for (index, future) in lookup_futures]
+        else:
+            responses = [(index, lookup(timestamp)) for (index, lookup, timestamp) in remote_lookups]
 
-        result = self.__etherscan_client.get_token_txs_by_start_and_end_block(
+        return self.merge_block_number_responses(block_range, responses)
+
+    async def get_historical_block_range_async(self, start_time: int, end_time: int) -> Optional[Tuple[int, int]]:
+        """Same as get_historical_block_range, awaiting etherscan instead of blocking the event loop."""
+        if self.__async_etherscan_client is None:
+            return self.get_historical_block_range(start_time, end_time)
+
+        block_range = list(await asyncio.gather(
+            asyncio.to_thread(self.get_local_closest_block_number, start_time, "after"),
+            asyncio.to_thread(self.get_local_closest_block_number, end_time, "before"),
+        ))
+        remote_lookups = [
+            (index, lookup, timestamp)
+            for (index, lookup, timestamp) in (
+                (0, self.__async_etherscan_client.get_closest_block_number_by_start_timestamp, start_time),
+                (1, self.__async_etherscan_client.get_closest_block_number_by_end_timestamp, end_time),
+            )
+            if block_range[index] is None
+        ]
+
+        remote_responses = await asyncio.gather(*[lookup(timestamp) for (_, lookup, timestamp) in remote_lookups])
+        responses = [(index, response) for ((index, _, _), response) in zip(remote_lookups, remote_responses)]
+
+        return self.merge_block_number_responses(block_range, responses)
+
+    def get_local_closest_block_number(self, timestamp: int, closest: str) -> Optional[int]:
+        if self.__block_timestamp_index is None:
+            return None
+        return self.__block_timestamp_index.get_closest_block_number(timestamp, closest)
+
+    def merge_block_number_responses(
+            self,
+            block_range: list[Optional[int]],
+            responses: list[Tuple[int, EtherscanBlockNumberResponse]],
+    ) -> Optional[Tuple[int, int]]:
+        for (index, response) in responses:
+            if response.status != "1":
+                return None
+            block_range[index] = int(response.result)
+
+        return block_range[0], block_range[1]
+
+    def record_block_timestamp_anchors(self, transactions: list[EtherscanTransaction]) -> None:
+        if self.__block_timestamp_index is None:
+            return
+        self.__block_timestamp_index.record_transactions(transactions)
+
+    def iter_transaction_data_by_block_range(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        historical_tx = self.iter_token_txs_by_block_range(
             address=address,
-            start_block=int(historical_start_block.result),
-            end_block=int(historical_end_block.result)
+            start_block=start_block,
+            end_block=end_block
         )
 
-        historical_tx = result.result
-        processed_transactions = set()
+        yield from self.iter_priced_transactions(historical_tx)
 
-        result_list: list[EtherscanTransactionWithUsdtFee] = []
-        for tx in historical_tx:
+    def iter_token_txs_by_block_range(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+    ) -> Iterator[EtherscanTransaction]:
+        """
+        Stream token transactions of the block range in block order.
+        With an executor the range is only fanned out where it is dense: a range whose first page comes
+        back short is complete in that one call, a full page yields its blocks but the last one and the
+        rest of the range is split into up to etherscan_fanout_max_workers sub-ranges of at least
+        etherscan_fanout_block_range_size blocks, each handled the same way. A rest too short to split
+        is paged through in order. Fewer than 2 x etherscan_fanout_max_workers pages are in flight
+        (and held in memory) at once.
+        """
+        if self.__executor is None:
+            yield from self.__etherscan_client.iter_token_txs_by_start_and_end_block(
+                address=address,
+                start_block=start_block,
+                end_block=end_block
+            )
+            return
+
+        page_size = app_config.etherscan_tokentx_page_size
+        fanout_max_workers = max(app_config.etherscan_fanout_max_workers, 1)
+        pending_block_ranges: Deque[Tuple[int, int]] = deque([(start_block, end_block)])
+        futures_by_block_range: Dict[Tuple[int, int], Future] = {}
+
+        try:
+            while pending_block_ranges:
+                for block_range in list(itertools.islice(pending_block_ranges, fanout_max_workers)):
+                    if block_range not in futures_by_block_range:
+                        futures_by_block_range[block_range] = self.__executor.submit(
+                            self.get_token_txs_first_page_by_block_range, address, block_range[0], block_range[1], page_size
+                        )
+
+                (range_start_block, range_end_block) = pending_block_ranges.popleft()
+                page_txs = futures_by_block_range.pop((range_start_block, range_end_block)).result()
+                if len(page_txs) < page_size:
+                    yield from page_txs
+                    continue
+
+                last_block = int(page_txs[-1].blockNumber)
+                if last_block == range_start_block:
+                    # A single block fills the page, only paging through it makes progress
+                    yield from self.__etherscan_client.iter_token_txs_by_start_and_end_block(
+                        address=address,
+                        start_block=range_start_block,
+                        end_block=range_start_block,
+                    )
+                    next_start_block = range_start_block + 1
+                else:
+                    # The last block may continue on the next page, it is read again with the rest of the range
+                    yield from (tx for tx in page_txs if int(tx.blockNumber) < last_block)
+                    next_start_block = last_block
+
+                if next_start_block > range_end_block:
+                    continue
+
+                block_range_size = max(
+                    (range_end_block - next_start_block + fanout_max_workers) // fanout_max_workers,
+                    app_config.etherscan_fanout_block_range_size,
+                )
+                block_ranges = self.split_block_range(next_start_block, range_end_block, block_range_size)
+                if len(block_ranges) == 1:
+                    # Too short to fan out, the rest is paged through in order
+                    yield from self.__etherscan_client.iter_token_txs_by_start_and_end_block(
+                        address=address,
+                        start_block=next_start_block,
+                        end_block=range_end_block,
+                    )
+                else:
+                    pending_block_ranges.extendleft(reversed(block_ranges))
+        finally:
+            for future in futures_by_block_range.values():
+                future.cancel()
+
+    def get_token_txs_first_page_by_block_range(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            page_size: int,
+    ) -> list[EtherscanTransaction]:
+        return self.__etherscan_client.get_token_txs_by_start_and_end_block(
+            address=address,
+            start_block=start_block,
+            end_block=end_block,
+            page=1,
+            offset=page_size,
+        ).result
+
+    def split_block_range(self, start_block: int, end_block: int, block_range_size: int) -> list[Tuple[int, int]]:
+        """Split [start_block, end_block] into consecutive, non overlapping ranges of at most block_range_size blocks."""
+        if block_range_size <= 0:
+            return [(start_block, end_block)]
+
+        return [
+            (range_start_block, min(range_start_block + block_range_size - 1, end_block))
+            for range_start_block in range(start_block, end_block + 1, block_range_size)
+        ]
+
+    def get_transaction_data_with_block_range(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            pool_id: Optional[int] = None,
+            time_range: Optional[Tuple[int, int]] = None,
+    ) -> list[EtherscanTransactionWithUsdtFee]:
+        return list(self.iter_transaction_data_with_block_range(address, start_block, end_block, pool_id, time_range))
+
+    def iter_transaction_data_with_block_range(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            pool_id: Optional[int] = None,
+            time_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        """Lazy version of get_transaction_data_with_block_range, transactions are yielded as they are priced."""
+        if pool_id is not None and self.__coverage_repo is not None:
+            yield from self.iter_transaction_data_by_block_range_with_coverage(
+                address, pool_id, start_block, end_block, time_range
+            )
+            return
+
+        yield from self.iter_transaction_data_by_block_range(address, start_block, end_block)
+
+    def iter_transaction_data_by_block_range_with_coverage(
+            self,
+            address: str,
+            pool_id: int,
+            start_block: int,
+            end_block: int,
+            time_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        """
+        Serve the block range from transactions_to_from_pools where the pool is fully scraped,
+        only the uncovered sub-ranges are fetched from etherscan. Results stay in block order.
+        time_range, the (start, end) timestamps the block range was resolved from, lets the
+        database read prune the monthly partitions.
+        """
+        try:
+            covered_ranges = self.__coverage_repo.read_covered_block_ranges(pool_id, start_block, end_block)
+            covered_block_ranges = [(covered.start_block, covered.end_block) for covered in covered_ranges]
+        except Exception as e:
+            self.__logger.warn(f"Read pool scrape coverage failed, falling back to etherscan |Error: {e!s}")
+            covered_block_ranges = []
+
+        segments = self.get_block_range_segments(covered_block_ranges, start_block, end_block)
+        remote_segment_count = len([segment for segment in segments if not segment[2]])
+        if len(covered_block_ranges) == 0 or remote_segment_count > app_config.pool_coverage_max_remote_sub_ranges:
+            # Too fragmented, one remote scan of the whole range is cheaper than many small ones
+            yield from self.iter_transaction_data_by_block_range(address, start_block, end_block)
+            return
+
+        for (segment_start_block, segment_end_block, is_covered) in segments:
+            if not is_covered:
+                yield from self.iter_transaction_data_by_block_range(address, segment_start_block, segment_end_block)
+                continue
+
+            yield from self.iter_stored_transaction_data(pool_id, segment_start_block, segment_end_block, time_range)
+
+    def iter_stored_transaction_data(
+            self,
+            pool_id: int,
+            start_block: int,
+            end_block: int,
+            time_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        """
+        Stored transactions of the block range in chain order, read in keyset pages of one etherscan page,
+        so a consumer stopping early (a paginated or streamed response) only reads the rows it used.
+        """
+        page_size = app_config.etherscan_tokentx_page_size
+        after_position: Optional[Tuple[int, int]] = None
+        while True:
+            stored_transactions = self.__transaction_pool_repo.read_transaction_data_by_pool_id_and_block_range(
+                pool_id=pool_id,
+                start_block=start_block,
+                end_block=end_block,
+                time_range=time_range,
+                after_position=after_position,
+                limit=page_size,
+            )
+            for stored_tx in stored_transactions:
+                yield self.convert_transaction_repo_to_etherTx_with_usdt_fee(stored_tx)
+
+            if len(stored_transactions) < page_size:
+                return
+            after_position = (stored_transactions[-1].block_number, stored_transactions[-1].transaction_index)
+
+    def get_transaction_data_page_with_block_range(
+            self,
+            address: str,
+            start_block: int,
+            end_block: int,
+            limit: int,
+            after_position: Optional[Tuple[int, int]] = None,
+            pool_id: Optional[int] = None,
+            time_range: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[list[EtherscanTransactionWithUsdtFee], Optional[Tuple[int, int]]]:
+        """
+        One page of at most limit transactions in chain order, strictly after after_position
+        (block number, transaction index). Returns the page and the position the next page resumes from,
+        None on the last page. A page starts at the block of after_position, it never rescans earlier blocks.
+        """
+        if after_position is not None:
+            start_block = max(start_block, after_position[0])
+        if start_block > end_block:
+            return [], None
+
+        transactions = self.iter_in_chain_order(
+            self.iter_transaction_data_with_block_range(address, start_block, end_block, pool_id, time_range)
+        )
+        if after_position is not None:
+            transactions = (tx for tx in transactions if self.get_chain_position(tx) > after_position)
+
+        # One extra transaction tells whether a next page exists
+        page = list(itertools.islice(transactions, limit + 1))
+        if len(page) <= limit:
+            return page, None
+
+        page = page[:limit]
+        return page, self.get_chain_position(page[-1])
+
+    def iter_in_chain_order(
+            self,
+            transactions: Iterable[EtherscanTransactionWithUsdtFee],
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        """Sort the transactions of each block by transaction index, the blocks already come in order."""
+        current_block: list[EtherscanTransactionWithUsdtFee] = []
+        for tx in transactions:
+            if len(current_block) > 0 and tx.blockNumber != current_block[0].blockNumber:
+                yield from sorted(current_block, key=self.get_chain_position)
+                current_block = []
+            current_block.append(tx)
+
+        yield from sorted(current_block, key=self.get_chain_position)
+
+    def get_chain_position(self, tx: EtherscanTransaction) -> Tuple[int, int]:
+        return (int(tx.blockNumber), self.convert_str_to_int(tx.transactionIndex) or 0)
+
+    def get_block_range_segments(
+            self,
+            covered_block_ranges: list[Tuple[int, int]],
+            start_block: int,
+            end_block: int,
+    ) -> list[Tuple[int, int, bool]]:
+        """Split [start_block, end_block] into consecutive (start, end, is_covered) segments."""
+        segments: list[Tuple[int, int, bool]] = []
+        next_block = start_block
+        for (covered_start_block, covered_end_block) in sorted(covered_block_ranges):
+            covered_start_block = max(covered_start_block, next_block)
+            covered_end_block = min(covered_end_block, end_block)
+            if covered_start_block > covered_end_block:
+                continue
+
+            if covered_start_block > next_block:
+                segments.append((next_block, covered_start_block - 1, False))
+            segments.append((covered_start_block, covered_end_block, True))
+            next_block = covered_end_block + 1
+
+        if next_block <= end_block:
+            segments.append((next_block, end_block, False))
+
+        return segments
+
+    def convert_transaction_repo_to_etherTx_with_usdt_fee(self, tx: TransactionToFromPool) -> EtherscanTransactionWithUsdtFee:
+        return EtherscanTransactionWithUsdtFee(
+            blockNumber=str(tx.block_number),
+            timeStamp=str(tx.ts_timestamp),
+            hash=tx.tx_hash,
+            contractAddress=tx.contract_address,
+            to=tx.to_address,
+            value=self.convert_optional_to_str(tx.token_value),
+            tokenName=tx.token_name or "",
+            tokenSymbol=tx.token_symbol or "",
+            tokenDecimal=self.convert_optional_to_str(tx.token_decimal),
+            transactionIndex=self.convert_optional_to_str(tx.transaction_index),
+            gas=self.convert_optional_to_str(tx.gas_limit),
+            gasPrice=self.convert_optional_to_str(tx.gas_price),
+            gasUsed=self.convert_optional_to_str(tx.gas_used),
+            cumulativeGasUsed=self.convert_optional_to_str(tx.cumulative_gas_used),
+            confirmations=self.convert_optional_to_str(tx.confirmations),
+            usdt_fee=self.convert_str_decimal_to_two_decimal_point(str(tx.transaction_fee_usdt or 0)),
+            **{"from": tx.from_address},
+        )
+
+    def iter_priced_transactions(
+            self,
+            transactions: Iterable[EtherscanTransaction],
+    ) -> Iterator[EtherscanTransactionWithUsdtFee]:
+        """Deduplicate transactions by hash and price them in chunks of one etherscan page."""
+        processed_transactions = set()
+        unique_transactions: list[EtherscanTransaction] = []
+        for tx in transactions:
             if tx.hash in processed_transactions:
                 continue
 
             processed_transactions.add(tx.hash)
+            unique_transactions.append(tx)
+
+            if len(unique_transactions) == app_config.etherscan_tokentx_page_size:
+                yield from self.convert_to_transactions_with_usdt_fee(unique_transactions)
+                unique_transactions = []
+
+        yield from self.convert_to_transactions_with_usdt_fee(unique_transactions)
+
+    def convert_to_transactions_with_usdt_fee(
+            self,
+            transactions: list[EtherscanTransaction],
+    ) -> list[EtherscanTransactionWithUsdtFee]:
+        if len(transactions) == 0:
+            return []
 
-            transaction_fee = self.calculate_transaction_fee_in_usdt(tx)
+        self.record_block_timestamp_anchors(transactions)
+        transaction_fees = self.calculate_transaction_fees_in_usdt(transactions)
 
+        result_list: list[EtherscanTransactionWithUsdtFee] = []
+        for (tx, transaction_fee) in zip(transactions, transaction_fees):
             transformed_tx = EtherscanTransactionWithUsdtFee(
                 **tx.model_dump(),
                 usdt_fee=self.convert_str_decimal_to_two_decimal_point(transaction_fee.transaction_fee)
@@ -199,17 +845,30 @@ class ScrapperService:
 
 
     def get_transaction_fee_with_tx_hash(self, tx_hash: str) -> Tuple[str, str]:
-        tx_db = self.__transaction_pool_repo.read_transaction_data_by_tx_hash([tx_hash])
-        pool_name = ""
-        if len(tx_db) == 0:
-            return "0.00", pool_name
-        
-        pool_name_list = self.__token_pair_pool_repo.read_token_pool_pair_data_by_id([tx_db[0].pool_id])
+        (_, fee, pool_name) = self.get_transaction_fees_with_tx_hashes([tx_hash])[0]
+        return fee, pool_name
 
-        if len(pool_name_list) > 0:
-            pool_name = pool_name_list[0].pool_name
-        
-        return self.convert_str_decimal_to_two_decimal_point(tx_db[0].transaction_fee_usdt), pool_name
+    def get_transaction_fees_with_tx_hashes(self, tx_hashes: list[str]) -> list[Tuple[str, str, str]]:
+        """
+        (tx_hash, fee, pool_name) of each hash in request order, resolved with one query.
+        The fee is paid once per transaction, a multi-hop transaction stored for several pools
+        gets the names of all of them comma separated. Hashes not in the database get ("0.00", "").
+        """
+        fee_by_tx_hash: Dict[str, str] = {}
+        pool_names_by_tx_hash: Dict[str, list[str]] = {}
+        for (tx_hash, transaction_fee_usdt, pool_name) in self.__transaction_pool_repo.read_transaction_fee_by_tx_hash(
+            list(dict.fromkeys(tx_hashes))
+        ):
+            fee_by_tx_hash.setdefault(tx_hash, self.convert_str_decimal_to_two_decimal_point(str(transaction_fee_usdt or 0)))
+            pool_names = pool_names_by_tx_hash.setdefault(tx_hash, [])
+            # A row whose pool was deleted still carries the fee, it has no name to add
+            if pool_name != "" and pool_name not in pool_names:
+                pool_names.append(pool_name)
+
+        return [
+            (tx_hash, fee_by_tx_hash.get(tx_hash, "0.00"), ",".join(pool_names_by_tx_hash.get(tx_hash, [])))
+            for tx_hash in tx_hashes
+        ]
 
     def get_decode_uniswap_v3_executed_price(self, tx_hash: str, contract_address: str) -> list[TransactionSwapExecutionPrice]:
 
@@ -309,20 +968,130 @@ class ScrapperService:
             from_address=tx.from_,
             to_address=tx.to,
             contract_address=tx.contractAddress,
-            token_value=tx.value,
+            token_value=self.convert_str_to_int(tx.value),
             token_name=tx.tokenName,
             token_symbol=tx.tokenSymbol,
-            token_decimal=tx.tokenDecimal,
-            transaction_index=tx.transactionIndex,
-            gas_limit=tx.gas,
-            gas_price=tx.gasPrice,
-            gas_used=tx.gasUsed,
-            cumulative_gas_used=tx.cumulativeGasUsed,
-            confirmations=tx.confirmations,
-            transaction_fee_usdt=usdt_fee,
+            token_decimal=self.convert_str_to_int(tx.tokenDecimal),
+            transaction_index=self.convert_str_to_int(tx.transactionIndex),
+            gas_limit=self.convert_str_to_int(tx.gas),
+            gas_price=self.convert_str_to_int(tx.gasPrice),
+            gas_used=self.convert_str_to_int(tx.gasUsed),
+            cumulative_gas_used=self.convert_str_to_int(tx.cumulativeGasUsed),
+            confirmations=self.convert_str_to_int(tx.confirmations),
+            transaction_fee_usdt=Decimal(usdt_fee) if usdt_fee != "" else None,
             pool_id=pool_id,
         )
+
+    def convert_str_to_int(self, value: str) -> Optional[int]:
+        return int(value) if value != "" else None
+
+    def convert_optional_to_str(self, value: Any) -> str:
+        return "" if value is None else str(value)
     
+    def get_closed_price_series(self, symbol: str, transactions: list[EtherscanTransaction]) -> Dict[int, str]:
+        """
+        Prefetch 1m close prices covering every transaction of a batch.
+        Result maps the open time (milliseconds) of each candle to its close price,
+        an empty result makes fee calculation fall back to per transaction lookups.
+        ETH/USDT candles are read from the local kline store first, only missing minutes are fetched from Binance.
+        """
+        timestamps = [int(tx.timeStamp) for tx in transactions if tx.timeStamp]
+        if len(timestamps) == 0:
+            return {}
+
+        start_time = self.convert_timestamp_to_minute_bucket(str(min(timestamps)))
+        end_time = self.convert_timestamp_to_minute_bucket(str(max(timestamps)))
+        is_stored_symbol = symbol == ETH_USDT_SYMBOL and self.__kline_repo is not None
+
+        closed_price_series: Dict[int, str] = {}
+        if is_stored_symbol:
+            closed_price_series.update(self.read_stored_closed_price_series(start_time, end_time))
+
+        for (range_start_time, range_end_time) in self.get_missing_minute_ranges(closed_price_series, start_time, end_time):
+            try:
+                klines = self.__binance_spot_client.get_klines_by_time_range(
+                    symbol=symbol,
+                    interval="1m",
+                    startTime=range_start_time,
+                    endTime=range_end_time,
+                )
+            except Exception as e:
+                description = "Closed price series prefetch failed, fallback to per transaction lookup"
+                log_message = f"Description: {description} |Error: {e!s}"
+                self.__logger.exception(log_message)
+                continue
+
+            for kline in klines:
+                closed_price = self.get_closed_price_from_klines(kline)
+                if closed_price.success:
+                    closed_price_series[int(kline[0])] = closed_price.closed_price
+
+            if is_stored_symbol:
+                self.store_closed_klines(klines)
+
+        return closed_price_series
+
+    def read_stored_closed_price_series(self, start_time: int, end_time: int) -> Dict[int, str]:
+        try:
+            stored_klines = self.__kline_repo.read_klines_by_open_time_range(start_time, end_time)
+        except Exception as e:
+            description = "Read stored klines failed, fetching full range from binance"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            return {}
+
+        return {kline.open_time: str(kline.close) for kline in stored_klines}
+
+    def store_closed_klines(self, klines: list[list[Union[str, int]]]) -> None:
+        """Persist closed candles only, the still-open candle keeps changing."""
+        now_in_milliseconds = int(datetime.now().timestamp() * 1000)
+        closed_klines = [
+            self.convert_kline_to_kline_repo(kline)
+            for kline in klines
+            if len(kline) > 6 and int(kline[6]) < now_in_milliseconds
+        ]
+        try:
+            self.__kline_repo.insert_klines(closed_klines)
+        except Exception as e:
+            description = "Store klines failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+
+    def get_missing_minute_ranges(
+            self,
+            closed_price_series: Dict[int, str],
+            start_time: int,
+            end_time: int,
+    ) -> list[Tuple[int, int]]:
+        """Contiguous (start, end) open time ranges, in milliseconds, of minutes absent from the series."""
+        missing_ranges: list[Tuple[int, int]] = []
+        range_start_time = None
+        for open_time in range(start_time, end_time + ONE_MINUTE_IN_MILLISECONDS, ONE_MINUTE_IN_MILLISECONDS):
+            if open_time not in closed_price_series:
+                if range_start_time is None:
+                    range_start_time = open_time
+                continue
+
+            if range_start_time is not None:
+                missing_ranges.append((range_start_time, open_time - ONE_MINUTE_IN_MILLISECONDS))
+                range_start_time = None
+
+        if range_start_time is not None:
+            missing_ranges.append((range_start_time, end_time))
+
+        return missing_ranges
+
+    def convert_kline_to_kline_repo(self, kline: list[Union[str, int]]) -> EthUsdtKline:
+        return EthUsdtKline(
+            open_time=int(kline[0]),
+            open=kline[1],
+            high=kline[2],
+            low=kline[3],
+            close=kline[4],
+            volume=kline[5],
+            close_time=int(kline[6]),
+        )
+
     def get_closed_price_from_klines(self, kline_data: list[Union[str, int]]) -> ClosedPriceResult:
         result = ClosedPriceResult()
         if len(kline_data) < 5:
@@ -347,10 +1116,31 @@ class ScrapperService:
     def convert_timestamp_to_milliseconds(self, timestamp: str) -> str:
         return str(int(timestamp) * 1000)
 
-    def calculate_transaction_fee_in_usdt(self, transaction: EtherscanTransaction) -> TransactionFeeCalcResult:
-        """Calculate the transaction fee in USDT."""
+    def convert_timestamp_to_minute_bucket(self, timestamp: str) -> int:
+        """Open time (milliseconds) of the 1m candle containing the timestamp."""
+        return int(timestamp) // 60 * ONE_MINUTE_IN_MILLISECONDS
+
+    def get_closed_price_for_transaction(
+            self,
+            transaction: EtherscanTransaction,
+            closed_price_series: Optional[Dict[int, str]] = None,
+    ) -> ClosedPriceResult:
+        """Closed price from the prefetched series when it covers the transaction, otherwise a single kline lookup."""
+        if closed_price_series:
+            series_closed_price = closed_price_series.get(self.convert_timestamp_to_minute_bucket(transaction.timeStamp))
+            if series_closed_price is not None:
+                return ClosedPriceResult(success=True, closed_price=series_closed_price)
+
+        return self.get_closed_price_by_timestamp(ETH_USDT_SYMBOL, self.convert_timestamp_to_milliseconds(transaction.timeStamp))
+
+    def calculate_transaction_fee_in_usdt(
+            self,
+            transaction: EtherscanTransaction,
+            closed_price_series: Optional[Dict[int, str]] = None,
+    ) -> TransactionFeeCalcResult:
+        """Calculate the transaction fee in USDT, using the prefetched closed price series when it covers the transaction."""
         transaction_fee_in_eth = self.calculate_transaction_fee_in_eth(transaction)
-        closed_price = self.get_closed_price_by_timestamp("ethusdt", self.convert_timestamp_to_milliseconds(transaction.timeStamp))
+        closed_price = self.get_closed_price_for_transaction(transaction, closed_price_series)
 
         if not closed_price.success:
             return TransactionFeeCalcResult()
@@ -360,4 +1150,65 @@ class ScrapperService:
         return TransactionFeeCalcResult(
             success=True,
             transaction_fee=str(transaction_fee_in_usdt)
-        )
\ No newline at end of file
+        )
+
+    def calculate_transaction_fees_in_usdt(
+            self,
+            transactions: list[EtherscanTransaction],
+            closed_price_series: Optional[Dict[int, str]] = None,
+    ) -> list[TransactionFeeCalcResult]:
+        """
+        Batch version of calculate_transaction_fee_in_usdt, results are identical to it.
+        gasUsed x gasPrice is computed with exact integer wei arithmetic and turned into one Decimal
+        with the same coefficient and exponent the per transaction Decimal path produces, so only the
+        final multiplication by the closed price is done in Decimal. Closed prices and gas price scales
+        are parsed once per distinct value.
+        """
+        if closed_price_series is None:
+            closed_price_series = self.get_closed_price_series(ETH_USDT_SYMBOL, transactions)
+
+        closed_price_decimals: Dict[str, Decimal] = {}
+        gas_price_scales: Dict[int, Tuple[int, int]] = {}
+        result: list[TransactionFeeCalcResult] = []
+        for transaction in transactions:
+            closed_price = self.get_closed_price_for_transaction(transaction, closed_price_series)
+            if not closed_price.success:
+                result.append(TransactionFeeCalcResult())
+                continue
+
+            closed_price_decimal = closed_price_decimals.get(closed_price.closed_price)
+            if closed_price_decimal is None:
+                closed_price_decimal = Decimal(closed_price.closed_price)
+                closed_price_decimals[closed_price.closed_price] = closed_price_decimal
+
+            gas_price_in_wei = int(transaction.gasPrice)
+            gas_price_scale = gas_price_scales.get(gas_price_in_wei)
+            if gas_price_scale is None:
+                gas_price_scale = self.get_gas_price_in_eth_scale(gas_price_in_wei)
+                gas_price_scales[gas_price_in_wei] = gas_price_scale
+
+            (gas_price_coefficient, gas_price_exponent) = gas_price_scale
+            transaction_fee_in_eth = Decimal(int(transaction.gasUsed) * gas_price_coefficient).scaleb(gas_price_exponent)
+
+            result.append(TransactionFeeCalcResult(
+                success=True,
+                transaction_fee=str(transaction_fee_in_eth * closed_price_decimal)
+            ))
+
+        return result
+
+    def get_gas_price_in_eth_scale(self, gas_price_in_wei: int) -> Tuple[int, int]:
+        """
+        (coefficient, exponent) of Decimal(gas_price_in_wei) / Decimal(10**18).
+        An exact Decimal division keeps the exponent as close to 0 as possible,
+        so trailing zeros of the wei amount (up to 18) move into the exponent.
+        """
+        if gas_price_in_wei == 0:
+            return 0, 0
+
+        trailing_zeros = 0
+        while trailing_zeros < 18 and gas_price_in_wei % 10 == 0:
+            gas_price_in_wei //= 10
+            trailing_zeros += 1
+
+        return gas_price_in_wei, trailing_zeros - 18
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -9,6 +11,17 @@ class TransactionFeeCalcResult(BaseModel):
     success: bool = False
     transaction_fee: str = ""
 
+class ScrappingJobResult(BaseModel):
+    success: bool = False
+    # Transactions selected from etherscan vs rows actually new in the database
+    fetched_count: int = 0
+    inserted_count: int = 0
+    # More transactions are pending after this batch, the next one can run right away
+    has_more: bool = False
+    last_block: Optional[int] = None
+    # Blocks between last_block and the chain head, None when the head could not be read
+    lag_blocks: Optional[int] = None
+
 class TransactionSwapExecutionPrice(BaseModel):
     transaction_hash: str
     execution_price: str
@@ -0,0 +1,190 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.core.log.logger import Logger
+from app.core.scrapper_service.client import ScrapperService
+from app.core.scrapper_service.model import ScrappingJobResult
+from app.core.scrapping_engine.model import ScrappingPoolJob
+from app.storage.models import PoolScrapeState
+
+
+class ScrappingEngine:
+    """
+    Schedules the scrapping jobs of every started pool on a bounded worker pool, apart from the route handlers.
+
+    A pool has at most one job queued or running. Ready pools wait in one FIFO queue, so with more pools
+    than workers each pool gets its turn in order instead of a busy pool starving the others. The blocking
+    job (etherscan, binance, database) runs on the executor, never on the event loop.
+
+    A pool behind the chain head (last batch full) is requeued right away with a doubled batch size,
+    up to max_batch_size, and only waits interval_seconds between batches once it has caught up.
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], ScrapperService],
+        max_workers: int,
+        interval_seconds: float,
+        batch_size: int,
+        max_batch_size: int,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.__service_factory = service_factory
+        self.__max_workers = max(1, max_workers)
+        self.__interval_seconds = interval_seconds
+        self.__batch_size = max(1, batch_size)
+        self.__max_batch_size = max(self.__batch_size, max_batch_size)
+        self.__executor = executor or ThreadPoolExecutor(
+            max_workers=self.__max_workers,
+            thread_name_prefix="scrapping_engine",
+        )
+        self.__pools: Dict[str, ScrappingPoolJob] = {}
+        self.__ready_pools: Optional[asyncio.Queue] = None
+        self.__workers: list[asyncio.Task] = []
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    @staticmethod
+    def get_pool_key(pool_name: str) -> str:
+        return pool_name.lower().strip()
+
+    def is_running(self, pool_name: str) -> bool:
+        return self.get_pool_key(pool_name) in self.__pools
+
+    def get_running_pools(self) -> list[str]:
+        return list(self.__pools.keys())
+
+    async def start_pool(self, pool_name: str) -> bool:
+        """
+        Schedule the scrapping of pool_name, returns False when it is already running.
+        """
+        pool_key = self.get_pool_key(pool_name)
+        if pool_key in self.__pools:
+            return False
+
+        self.__start_workers()
+        pool_job = ScrappingPoolJob(pool_name=pool_key, batch_size=self.__batch_size)
+        self.__pools[pool_key] = pool_job
+        self.__ready_pools.put_nowait(pool_job)
+        return True
+
+    async def stop_pool(self, pool_name: str) -> bool:
+        """
+        Stop scheduling pool_name, a running cycle finishes but is not rescheduled. Returns False when not running.
+        """
+        pool_job = self.__pools.pop(self.get_pool_key(pool_name), None)
+        if pool_job is None:
+            return False
+
+        pool_job.stopped = True
+        return True
+
+    async def shutdown(self) -> None:
+        for pool_job in self.__pools.values():
+            pool_job.stopped = True
+        self.__pools.clear()
+
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers = []
+        self.__ready_pools = None
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __start_workers(self) -> None:
+        if len(self.__workers) > 0:
+            return
+
+        self.__ready_pools = asyncio.Queue()
+        self.__workers = [
+            asyncio.create_task(self.__run_worker(), name=f"scrapping_engine_worker_{index}")
+            for index in range(self.__max_workers)
+        ]
+
+    def __reschedule(self, pool_job: ScrappingPoolJob) -> None:
+        if pool_job.stopped or self.__ready_pools is None:
+            return
+        self.__ready_pools.put_nowait(pool_job)
+
+    async def __run_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pool_job = await self.__ready_pools.get()
+            if pool_job.stopped:
+                continue
+
+            try:
+                keep_running = await loop.run_in_executor(self.__executor, self.run_pool_cycle, pool_job)
+            except Exception as e:
+                self.__logger.warn(f"Scrapping cycle of {pool_job.pool_name} failed |Error: {e!s}")
+                # Retry after the regular interval with the base batch, a failing upstream is not hammered
+                pool_job.catching_up = False
+                pool_job.batch_size = self.__batch_size
+                keep_running = True
+
+            if not keep_running:
+                pool_job.stopped = True
+                # A restarted pool has a new job, only drop the registration of this one
+                if self.__pools.get(pool_job.pool_name) is pool_job:
+                    del self.__pools[pool_job.pool_name]
+                continue
+
+            if pool_job.catching_up:
+                # Back of the queue, still behind the other ready pools
+                self.__reschedule(pool_job)
+            else:
+                loop.call_later(self.__interval_seconds, self.__reschedule, pool_job)
+
+    def run_pool_cycle(self, pool_job: ScrappingPoolJob) -> bool:
+        """
+        One blocking scrapping cycle of a pool, runs on the executor.
+        Returns False when the pool can not be scraped and has to be stopped.
+        """
+        scrapper_client = self.__service_factory()
+        pool_job.cycle_count += 1
+
+        if pool_job.pool_id is None:
+            pool_data = scrapper_client.get_token_pool_pair_by_pool_name(pool_job.pool_name)
+            if len(pool_data) == 0:
+                self.__logger.warn(f"Stopped scraping for {pool_job.pool_name}, due to pool not found.")
+                return False
+
+            pool_job.pool_id = pool_data[0].pool_id
+            pool_job.address = pool_data[0].contract_address
+            self.__logger.info(f"Scraping transactions for {pool_job.pool_name}...")
+
+        # Primary key lookup of the watermark, independent of the transactions table size
+        scrape_state = scrapper_client.read_scrape_watermark(
+            address=pool_job.address,
+            pool_id=pool_job.pool_id,
+        )
+
+        if not isinstance(scrape_state, PoolScrapeState):
+            is_success = scrapper_client.insert_new_latest_transaction_pool(pool_job.address, pool_job.pool_id)
+            if not is_success:
+                self.__logger.warn(f"Stopped scraping for {pool_job.pool_name}, due to first tx is not found.")
+            return is_success
+
+        self.__logger.info(f"Transaction Pair: {pool_job.pool_name},Latest block: {scrape_state.last_block}")
+        job_result = scrapper_client.scrapping_job(
+            address=pool_job.address,
+            start_block=scrape_state.last_block,
+            pool_id=pool_job.pool_id,
+            last_tx_index=scrape_state.last_tx_index,
+            max_count=pool_job.batch_size,
+            start_block_covered=bool(scrape_state.written_by_scrapping_job),
+        )
+        self.update_catch_up_state(pool_job, job_result)
+        self.__logger.info(
+            f"Transaction Pair: {pool_job.pool_name},New transactions: {job_result.inserted_count}/{job_result.fetched_count},"
+            f"Lag blocks: {job_result.lag_blocks},Catching up: {pool_job.catching_up},Next batch size: {pool_job.batch_size}"
+        )
+        return True
+
+    def update_catch_up_state(self, pool_job: ScrappingPoolJob, job_result: ScrappingJobResult) -> None:
+        pool_job.lag_blocks = job_result.lag_blocks
+        pool_job.catching_up = job_result.has_more
+        if job_result.has_more:
+            pool_job.batch_size = min(pool_job.batch_size * 2, self.__max_batch_size)
+        else:
+            pool_job.batch_size = self.__batch_size
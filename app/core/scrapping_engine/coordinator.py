@@ -0,0 +1,171 @@
+import asyncio
+import math
+import os
+import socket
+import uuid
+from typing import Dict, Optional
+
+from app.core.log.logger import Logger
+from app.core.scrapping_engine.client import ScrappingEngine
+from app.storage.pool_scrape_tasks_repositories.client import PoolScrapeTasksRepository
+
+
+def get_worker_owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class ScrappingTaskCoordinator:
+    """
+    Cluster wide ownership of the pool scrape tasks, backed by leases in pool_scrape_tasks.
+
+    start-task / stop-task only flip the task's desired state, on whichever worker they land. Every worker
+    heartbeats: it marks itself live in scrape_workers, renews the leases it holds, stops the pools it lost
+    (stopped or expired) and claims free tasks up to its fair share (active tasks / live workers), or hands
+    the leases past its share back. One scraper runs per pool across all workers and nodes and the pools
+    spread over them, a worker joining later takes its share over from the others. A worker that can not
+    renew in time stops its pools locally, the lease then expires and another worker takes over.
+    """
+
+    def __init__(
+        self,
+        engine: ScrappingEngine,
+        task_repo: PoolScrapeTasksRepository,
+        owner_id: str,
+        heartbeat_seconds: float,
+        lease_ttl_seconds: float,
+    ) -> None:
+        self.__engine = engine
+        self.__task_repo = task_repo
+        self.__owner_id = owner_id
+        self.__heartbeat_seconds = heartbeat_seconds
+        self.__lease_ttl_seconds = lease_ttl_seconds
+        # pool_id -> pool_name of the leases held by this worker
+        self.__held_pools: Dict[int, str] = {}
+        self.__lease_deadline = 0.0
+        self.__wake_event: Optional[asyncio.Event] = None
+        self.__heartbeat_task: Optional[asyncio.Task] = None
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    @property
+    def owner_id(self) -> str:
+        return self.__owner_id
+
+    def get_held_pool_ids(self) -> list[int]:
+        return list(self.__held_pools.keys())
+
+    async def start(self) -> None:
+        if self.__heartbeat_task is not None:
+            return
+
+        self.__wake_event = asyncio.Event()
+        self.__heartbeat_task = asyncio.create_task(self.__run_heartbeat(), name="scrapping_task_heartbeat")
+
+    async def shutdown(self) -> None:
+        if self.__heartbeat_task is not None:
+            self.__heartbeat_task.cancel()
+            await asyncio.gather(self.__heartbeat_task, return_exceptions=True)
+            self.__heartbeat_task = None
+
+        await self.__stop_held_pools(list(self.__held_pools.keys()))
+        try:
+            # Hand the tasks over right away instead of after the lease ttl
+            await asyncio.to_thread(self.__task_repo.release_pool_scrape_leases, self.__owner_id)
+            await asyncio.to_thread(self.__task_repo.delete_scrape_worker, self.__owner_id)
+        except Exception as e:
+            self.__logger.warn(f"Release pool scrape leases failed |Error: {e!s}")
+
+    def wake(self) -> None:
+        if self.__wake_event is not None:
+            self.__wake_event.set()
+
+    async def request_start(self, pool_id: int) -> bool:
+        """
+        Mark the task of pool_id active cluster wide, returns False when it already was.
+        """
+        is_activated = await asyncio.to_thread(self.__task_repo.activate_pool_scrape_task, pool_id)
+        self.wake()
+        return is_activated
+
+    async def request_stop(self, pool_id: int) -> bool:
+        """
+        Mark the task of pool_id inactive cluster wide, returns False when it was not active.
+        """
+        is_deactivated = await asyncio.to_thread(self.__task_repo.deactivate_pool_scrape_task, pool_id)
+        if pool_id in self.__held_pools:
+            await self.__stop_held_pools([pool_id])
+        return is_deactivated
+
+    async def __run_heartbeat(self) -> None:
+        while True:
+            await self.heartbeat()
+            try:
+                await asyncio.wait_for(self.__wake_event.wait(), timeout=self.__heartbeat_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self.__wake_event.clear()
+
+    async def heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await self.__drop_finished_pools()
+            await asyncio.to_thread(self.__task_repo.renew_scrape_worker, self.__owner_id, self.__lease_ttl_seconds)
+            # Taken before the renewal, the leases never outlive this deadline
+            renewal_started_at = loop.time()
+            await self.__renew_held_pools()
+            self.__lease_deadline = renewal_started_at + self.__lease_ttl_seconds
+            await self.__balance_fair_share()
+        except Exception as e:
+            self.__logger.warn(f"Scrapping task heartbeat failed |Error: {e!s}")
+            # The next heartbeat may come after the deadline, by then another worker may own the leases
+            if loop.time() >= self.__lease_deadline - self.__heartbeat_seconds:
+                await self.__stop_held_pools(list(self.__held_pools.keys()))
+
+    async def __drop_finished_pools(self) -> None:
+        # The engine stops a pool it can not scrape (not found, no first transaction), so is its task
+        finished_pool_ids = [
+            pool_id for (pool_id, pool_name) in self.__held_pools.items()
+            if not self.__engine.is_running(pool_name)
+        ]
+        for pool_id in finished_pool_ids:
+            await asyncio.to_thread(self.__task_repo.deactivate_pool_scrape_task, pool_id)
+            del self.__held_pools[pool_id]
+
+    async def __renew_held_pools(self) -> None:
+        if len(self.__held_pools) == 0:
+            return
+
+        renewed_pool_ids = await asyncio.to_thread(
+            self.__task_repo.renew_pool_scrape_leases,
+            self.__owner_id,
+            list(self.__held_pools.keys()),
+            self.__lease_ttl_seconds,
+        )
+        lost_pool_ids = [pool_id for pool_id in self.__held_pools if pool_id not in set(renewed_pool_ids)]
+        await self.__stop_held_pools(lost_pool_ids)
+
+    async def __balance_fair_share(self) -> None:
+        (active_count, live_owner_count) = await asyncio.to_thread(self.__task_repo.read_pool_scrape_task_load)
+        fair_share = math.ceil(active_count / max(1, live_owner_count))
+
+        if len(self.__held_pools) > fair_share:
+            # Stopped before the leases are released, so the pools never run on two workers
+            excess_pool_ids = sorted(self.__held_pools.keys())[fair_share:]
+            await self.__stop_held_pools(excess_pool_ids)
+            await asyncio.to_thread(self.__task_repo.release_pool_scrape_leases, self.__owner_id, excess_pool_ids)
+            return
+
+        claimed_pools = await asyncio.to_thread(
+            self.__task_repo.acquire_pool_scrape_leases,
+            self.__owner_id,
+            self.__lease_ttl_seconds,
+            fair_share - len(self.__held_pools),
+        )
+        for pool in claimed_pools:
+            self.__held_pools[pool.pool_id] = pool.pool_name
+            await self.__engine.start_pool(pool.pool_name)
+
+    async def __stop_held_pools(self, pool_ids: list[int]) -> None:
+        for pool_id in pool_ids:
+            pool_name = self.__held_pools.pop(pool_id, None)
+            if pool_name is not None:
+                await self.__engine.stop_pool(pool_name)
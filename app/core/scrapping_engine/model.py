@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ScrappingPoolJob(BaseModel):
+    pool_name: str
+    # Resolved on the first cycle
+    pool_id: Optional[int] = None
+    address: Optional[str] = None
+    cycle_count: int = 0
+    stopped: bool = False
+    # Adaptive batch: grows while the pool is catching up, back to the base size once at chain head
+    batch_size: int = 0
+    catching_up: bool = False
+    lag_blocks: Optional[int] = None
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 from fastapi.responses import HTMLResponse
 
+from app.utils.blocking_executor.client import route_blocking_executor
+from app.utils.blocking_executor.model import BlockingExecutorStats
+
 health_check_router = APIRouter()
 
 
@@ -21,3 +24,12 @@ async def health_check(greeting: str = "Hello", name: str = "World") -> HTMLResp
         </body>
         </html>
         """
+
+
+@health_check_router.get(
+    "/health_check/blocking_executor", response_model=BlockingExecutorStats, summary="Blocking Executor Stats"
+)
+async def blocking_executor_stats() -> BlockingExecutorStats:
+    """Returns queue depth and wait time of the executor running the blocking calls of this worker's routes."""
+
+    return route_blocking_executor.get_stats()
@@ -1,19 +1,21 @@
-from typing import Dict
-from fastapi import APIRouter, HTTPException, Request, status, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.core.dependencies import get_scrapper_service
+from app.core.dependencies import get_scrapper_service, scrapping_task_coordinator
 from app.core.log.logger import Logger
-
-import asyncio
-
-from app.routes.scrapper_route.models import GeneralResponse, TimeRangeRequest, TimeRangeResponse, TokenPairPoolSchema, TokenPoolPairResponse, TransactionFeeWithHashResponse, TransactionPoolModelRequest, UniswapUsdcWethExecutionPriceResponse
-from app.storage.models import TransactionToFromPool
+from app.utils.blocking_executor.client import route_blocking_executor
 from app.core.config import app_config
 
+from app.routes.scrapper_route.handler import (
+    decode_page_cursor,
+    encode_page_cursor,
+    stream_transactions_as_json_array,
+    stream_transactions_as_ndjson,
+)
+from app.routes.scrapper_route.models import GeneralResponse, TimeRangeRequest, TimeRangeResponse, TokenPairPoolSchema, TokenPoolPairResponse, TransactionFeeBatchRequest, TransactionFeeBatchResponse, TransactionFeeWithHashResponse, TransactionPoolModelRequest, UniswapUsdcWethExecutionPriceResponse
+
 
 scrapper_route = APIRouter()
-running_tasks: Dict[str,asyncio.Event] = {}
 logger = Logger(name="scrapper_route_controller")
 
 
@@ -30,7 +32,7 @@ async def get_existing_transaction_pools(request: Request):
         await log_request(request)
         response = TokenPoolPairResponse()
         scrapper_client = get_scrapper_service()
-        result = scrapper_client.get_all_token_pool_pair()
+        result = await route_blocking_executor.run(scrapper_client.get_all_token_pool_pair)
         registered_pool = []
         for pool in result:
             registered_pool.append(TokenPairPoolSchema.model_validate(pool.__dict__))
@@ -54,7 +56,8 @@ async def register_transaction(request: Request, pool_register_request: Transact
                 detail="Pool name should not contain '/'"
             )
         
-        scrapper_client.register_new_token_pool(
+        await route_blocking_executor.run(
+            scrapper_client.register_new_token_pool,
             pool_name=pool_register_request.pool_name.lower(),
             contract_address=pool_register_request.pool_address.lower(),
         )
@@ -64,70 +67,24 @@ async def register_transaction(request: Request, pool_register_request: Transact
         return JSONResponse(content={"message": f"No duplicate pool name and addrss allowed. {e!s}"}, status_code=500)
     
 
-async def scrape_transactions(transaction_pair: str, stop_event: asyncio.Event) -> None:
-    """
-    This is the main function executed by the background tasks.
-    """
-    scrapper_client = get_scrapper_service()
-    poolData = scrapper_client.get_token_pool_pair_by_pool_name(transaction_pair)
-
-    if len(poolData) == 0:
-        print(f"Stopped scraping for {transaction_pair}, due to pool not found.")
-        return
-
-    
-    pool_id = poolData[0].pool_id
-    address = poolData[0].contract_address
-
-    latest_tx = scrapper_client.read_latest_transaction_pool(
-        address=address,
-        token_pool_pair_id=pool_id
-    )
-
-    if latest_tx == None:
-        is_success = scrapper_client.insert_new_latest_transaction_pool(address, pool_id)
-
-        if not is_success:
-            # Catch by controller
-            del running_tasks[transaction_pair]
-            print(f"Stopped scraping for {transaction_pair}, due to first tx is not found.")
-        
-    
-    # Start block for etherscan
-    # Enter job scraping while first insert is success.
-    print(f"Scraping transactions for {transaction_pair}...")
-    while not stop_event.is_set():
-        latest_tx = scrapper_client.read_latest_transaction_pool(
-            address=address,
-            token_pool_pair_id=pool_id
-        )
-        if isinstance(latest_tx, TransactionToFromPool):
-            print(f"Transaction Pair: {transaction_pair},Latest block: {latest_tx.block_number}")
-            start_block = latest_tx.block_number
-            scrapper_client.scrapping_job(address=address, start_block=start_block, pool_id=pool_id)
-            await asyncio.sleep(app_config.scrapping_job_interval_seconds)  # Simulate scraping delay
-
-    print(f"Stopped scraping for {transaction_pair}.")
-
-
 @scrapper_route.post("/start-task/{transaction_pair}",
                      response_model=GeneralResponse)
-async def start_task(transaction_pair: str, background_tasks: BackgroundTasks):
+async def start_task(transaction_pair: str):
 
     try:
-        if transaction_pair in running_tasks:
-            return {"message": f"Task for {transaction_pair} is already running."}
-        
         scrapper_client = get_scrapper_service()
-        poolData = scrapper_client.get_token_pool_pair_by_pool_name(transaction_pair)
+        poolData = await route_blocking_executor.run(
+            scrapper_client.get_token_pool_pair_by_pool_name, transaction_pair.lower().strip()
+        )
 
         if len(poolData) == 0:
             return JSONResponse(content={"message": "Pool not found"}, status_code=404)
-        
-        # Create an asyncio Event to control task stopping
-        stop_event = asyncio.Event()
-        running_tasks[transaction_pair.lower().strip()] = stop_event
-        background_tasks.add_task(scrape_transactions, transaction_pair, stop_event)
+
+        # Persisted cluster wide, one worker claims the task and schedules it on its scrapping engine
+        is_started = await scrapping_task_coordinator.request_start(poolData[0].pool_id)
+        if not is_started:
+            return {"message": f"Task for {transaction_pair} is already running."}
+
         return GeneralResponse(
             message=f"Started task for {transaction_pair}"
         )
@@ -138,13 +95,18 @@ async def start_task(transaction_pair: str, background_tasks: BackgroundTasks):
 @scrapper_route.post("/stop-task/{transaction_pair}",
                      response_model=GeneralResponse)
 async def stop_task(transaction_pair: str):
-    stop_event = running_tasks.get(transaction_pair.lower().strip())
-    if not stop_event:
+    scrapper_client = get_scrapper_service()
+    poolData = await route_blocking_executor.run(
+        scrapper_client.get_token_pool_pair_by_pool_name, transaction_pair.lower().strip()
+    )
+    if len(poolData) == 0:
+        raise HTTPException(status_code=404, detail="Task not found for this pair.")
+
+    # The owning worker, wherever it runs, stops on its next heartbeat
+    is_stopped = await scrapping_task_coordinator.request_stop(poolData[0].pool_id)
+    if not is_stopped:
         raise HTTPException(status_code=404, detail="Task not found for this pair.")
 
-    # Signal the task to stop
-    stop_event.set()
-    del running_tasks[transaction_pair.lower().strip()]
     return GeneralResponse(
         message=f"Stopped task for {transaction_pair}"
     )
@@ -162,6 +124,17 @@ async def get_transactions_in_time_range(request: Request, time_range_request: T
     try:
         await log_request(request)
 
+        is_paginated = time_range_request.limit is not None or time_range_request.cursor is not None
+        if is_paginated and time_range_request.response_format != "json":
+            return JSONResponse(
+                content={"message": "limit and cursor are only supported by the json response_format"},
+                status_code=400,
+            )
+        try:
+            after_position = decode_page_cursor(time_range_request.cursor) if time_range_request.cursor else None
+        except ValueError as e:
+            return JSONResponse(content={"message": f"Error: {e!s}"}, status_code=400)
+
         start_time = time_range_request.start_time
         end_time = time_range_request.end_time
 
@@ -171,15 +144,58 @@ async def get_transactions_in_time_range(request: Request, time_range_request: T
 
         scrapper_client = get_scrapper_service()
 
-        poolData = scrapper_client.get_token_pool_pair_by_pool_name(time_range_request.pool_name)
+        poolData = await route_blocking_executor.run(
+            scrapper_client.get_token_pool_pair_by_pool_name, time_range_request.pool_name
+        )
         if len(poolData) == 0:
             raise HTTPException(status_code=404, detail="Pool not found")
 
-        transaction_list = scrapper_client.get_transaction_data_with_time_range(
-            address=poolData[0].contract_address,
-            start_time=start_time_ts,
-            end_time=end_time_ts
-        )
+        block_range = await scrapper_client.get_historical_block_range_async(start_time_ts, end_time_ts)
+
+        if time_range_request.response_format != "json":
+            result.success = True
+            transactions = iter(())
+            if block_range is not None:
+                # Lazy, advanced chunk by chunk on the blocking executor while the response is written
+                transactions = scrapper_client.iter_transaction_data_with_block_range(
+                    address=poolData[0].contract_address,
+                    start_block=block_range[0],
+                    end_block=block_range[1],
+                    pool_id=poolData[0].pool_id,
+                    time_range=(start_time_ts, end_time_ts),
+                )
+            if time_range_request.response_format == "ndjson":
+                return StreamingResponse(
+                    stream_transactions_as_ndjson(route_blocking_executor, transactions),
+                    media_type="application/x-ndjson",
+                )
+            return StreamingResponse(
+                stream_transactions_as_json_array(route_blocking_executor, result, transactions),
+                media_type="application/json",
+            )
+
+        transaction_list = []
+        if block_range is not None and is_paginated:
+            (transaction_list, next_position) = await route_blocking_executor.run(
+                scrapper_client.get_transaction_data_page_with_block_range,
+                address=poolData[0].contract_address,
+                start_block=block_range[0],
+                end_block=block_range[1],
+                limit=min(time_range_request.limit or app_config.time_range_max_page_size, app_config.time_range_max_page_size),
+                after_position=after_position,
+                pool_id=poolData[0].pool_id,
+                time_range=(start_time_ts, end_time_ts),
+            )
+            result.next_cursor = encode_page_cursor(next_position) if next_position is not None else None
+        elif block_range is not None:
+            transaction_list = await route_blocking_executor.run(
+                scrapper_client.get_transaction_data_with_block_range,
+                address=poolData[0].contract_address,
+                start_block=block_range[0],
+                end_block=block_range[1],
+                pool_id=poolData[0].pool_id,
+                time_range=(start_time_ts, end_time_ts),
+            )
 
         result.success = True
         result.transactions = transaction_list
@@ -197,7 +213,7 @@ async def get_transaction_fee(request: Request, tx_hash: str) -> JSONResponse:
     try:
         await log_request(request)
         scrapper_client = get_scrapper_service()
-        (fee, pool_name) = scrapper_client.get_transaction_fee_with_tx_hash(tx_hash)
+        (fee, pool_name) = await route_blocking_executor.run(scrapper_client.get_transaction_fee_with_tx_hash, tx_hash)
         result.tx_hash = tx_hash
         result.pool_name = pool_name
         result.fee = fee
@@ -209,13 +225,39 @@ async def get_transaction_fee(request: Request, tx_hash: str) -> JSONResponse:
         result.message = f"Error: {e!s}"
         return JSONResponse(content=result.model_dump(), status_code=404)
     
+@scrapper_route.post("/transaction/fees/batch",
+                     response_model=TransactionFeeBatchResponse)
+async def get_transaction_fees(request: Request, fee_batch_request: TransactionFeeBatchRequest) -> JSONResponse:
+    result = TransactionFeeBatchResponse()
+    try:
+        await log_request(request)
+        if len(fee_batch_request.tx_hashes) > app_config.transaction_fee_batch_max_size:
+            result.message = f"At most {app_config.transaction_fee_batch_max_size} tx hashes per request"
+            return JSONResponse(content=result.model_dump(), status_code=400)
+
+        scrapper_client = get_scrapper_service()
+        fees = await route_blocking_executor.run(
+            scrapper_client.get_transaction_fees_with_tx_hashes, fee_batch_request.tx_hashes
+        )
+        for (tx_hash, fee, pool_name) in fees:
+            fee_result = TransactionFeeWithHashResponse(tx_hash=tx_hash, pool_name=pool_name, fee=fee)
+            if (fee == "0.00"):
+                fee_result.message = "Transaction not found, you might querying tx that is not in the database. (not recorded)"
+            result.transactions.append(fee_result)
+
+        result.success = True
+        return JSONResponse(content=result.model_dump())
+    except Exception as e:
+        result.message = f"Error: {e!s}"
+        return JSONResponse(content=result.model_dump(), status_code=500)
+
 @scrapper_route.get("/transaction/{tx_hash}/{pool_name}/executed-price",
                     response_model=UniswapUsdcWethExecutionPriceResponse)
 async def get_uniswap_executed_price(request: Request, tx_hash: str, pool_name: str) -> JSONResponse:
     try:
         await log_request(request)
         scrapper_client = get_scrapper_service()
-        pool_data = scrapper_client.get_token_pool_pair_by_pool_name(pool_name)
+        pool_data = await route_blocking_executor.run(scrapper_client.get_token_pool_pair_by_pool_name, pool_name)
         if len(pool_data) == 0:
             return JSONResponse(content={"message": "Pool not found"}, status_code=404)
         pool_address = pool_data[0].contract_address
@@ -223,7 +265,9 @@ async def get_uniswap_executed_price(request: Request, tx_hash: str, pool_name:
         if pool_address != "0x88e6a0c2ddd26feeb64f039a2c41296fcb3f5640":
             return JSONResponse(content={"message": "This endpoint currently only support uniswap_v3 (usdc/weth) pool"}, status_code=404)
 
-        result = scrapper_client.get_decode_uniswap_v3_executed_price(tx_hash, pool_address)
+        result = await route_blocking_executor.run(
+            scrapper_client.get_decode_uniswap_v3_executed_price, tx_hash, pool_address
+        )
         response = UniswapUsdcWethExecutionPriceResponse(
             success=True,
             result=result
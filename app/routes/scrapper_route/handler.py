@@ -0,0 +1,90 @@
+import base64
+import itertools
+import json
+from typing import AsyncIterator, Iterator, Tuple, TypeVar
+
+from app.core.etherscan_http_client.model import EtherscanTransactionWithUsdtFee
+from app.core.log.logger import Logger
+from app.routes.scrapper_route.models import TimeRangeResponse
+from app.utils.blocking_executor.base_class import BlockingCallExecutor
+
+T = TypeVar("T")
+
+# Transactions pulled from the service per executor hop, and written per response chunk
+STREAM_CHUNK_SIZE = 100
+
+logger = Logger(name="scrapper_route_handler")
+
+
+def encode_page_cursor(position: Tuple[int, int]) -> str:
+    """Opaque cursor of a (block number, transaction index) chain position."""
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode()).decode().rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        (block_number, transaction_index) = json.loads(base64.urlsafe_b64decode(padded_cursor))
+        return int(block_number), int(transaction_index)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def take_chunk(iterator: Iterator[T], chunk_size: int) -> list[T]:
+    return list(itertools.islice(iterator, chunk_size))
+
+
+async def iter_chunks_on_executor(
+    executor: BlockingCallExecutor,
+    iterator: Iterator[T],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncIterator[list[T]]:
+    """
+    Advance a blocking iterator (etherscan, binance, database) on the executor, chunk_size items per hop.
+    """
+    while True:
+        chunk = await executor.run(take_chunk, iterator, chunk_size)
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+async def stream_transactions_as_ndjson(
+    executor: BlockingCallExecutor,
+    transactions: Iterator[EtherscanTransactionWithUsdtFee],
+) -> AsyncIterator[str]:
+    """
+    One JSON transaction per line. The status code is sent before the first line, a failure past
+    that point ends the stream with a {"success": false, "message": ...} line.
+    """
+    try:
+        async for chunk in iter_chunks_on_executor(executor, transactions):
+            yield "".join(tx.model_dump_json() + "\n" for tx in chunk)
+    except Exception as e:
+        logger.exception(f"Description: Stream transactions as ndjson failed |Error: {e!s}")
+        yield json.dumps({"success": False, "message": f"Error: {e!s}"}) + "\n"
+
+
+async def stream_transactions_as_json_array(
+    executor: BlockingCallExecutor,
+    result: TimeRangeResponse,
+    transactions: Iterator[EtherscanTransactionWithUsdtFee],
+) -> AsyncIterator[str]:
+    """
+    The TimeRangeResponse body of the json mode, with the transactions array written chunk by chunk.
+    A failure past the first chunk truncates the body, which clients see as invalid JSON.
+    """
+    envelope = result.model_dump_json(exclude={"transactions"})
+    yield envelope[:-1] + ',"transactions":['
+
+    is_first_chunk = True
+    try:
+        async for chunk in iter_chunks_on_executor(executor, transactions):
+            separator = "" if is_first_chunk else ","
+            is_first_chunk = False
+            yield separator + ",".join(tx.model_dump_json() for tx in chunk)
+    except Exception as e:
+        logger.exception(f"Description: Stream transactions as json array failed |Error: {e!s}")
+        return
+
+    yield "]}"
@@ -1,7 +1,9 @@
 
 
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
 
 from app.core.etherscan_http_client.model import EtherscanTransactionWithUsdtFee
 from app.core.scrapper_service.model import TransactionSwapExecutionPrice
@@ -34,6 +36,13 @@ class TimeRangeRequest(BaseModel):
     pool_name: str
     start_time: datetime
     end_time: datetime
+    # json: one TimeRangeResponse body, ndjson: one transaction per line streamed as priced,
+    # json_array: the TimeRangeResponse body streamed with transactions written as they are priced
+    response_format: Literal["json", "ndjson", "json_array"] = "json"
+    # Pagination of the json format: page size (capped by time_range_max_page_size) and the
+    # next_cursor of the previous page, rejected with 400 for the streamed formats
+    limit: Optional[int] = Field(default=None, ge=1)
+    cursor: Optional[str] = None
 
 class TimeRangeResponse(BaseModel):
     pool_name: str = ""
@@ -41,6 +50,8 @@ class TimeRangeResponse(BaseModel):
     end_time: str = ""
     success: bool = False
     transactions: list[EtherscanTransactionWithUsdtFee] = []
+    # Set when more transactions follow, pass it as cursor to get the next page
+    next_cursor: Optional[str] = None
 
 class TransactionFeeWithHashResponse(BaseModel):
     message: str = ""
@@ -48,6 +59,15 @@ class TransactionFeeWithHashResponse(BaseModel):
     pool_name: str = ""
     fee: str = ""
 
+class TransactionFeeBatchRequest(BaseModel):
+    # At most transaction_fee_batch_max_size hashes per request
+    tx_hashes: list[str] = Field(min_length=1)
+
+class TransactionFeeBatchResponse(BaseModel):
+    success: bool = False
+    message: str = ""
+    transactions: list[TransactionFeeWithHashResponse] = []
+
 class UniswapUsdcWethExecutionPriceResponse(BaseModel):
     success: bool = False
     result: list[TransactionSwapExecutionPrice] = []
\ No newline at end of file
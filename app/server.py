@@ -1,7 +1,28 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
 import toml
 from fastapi import FastAPI
 
+from app.core.dependencies import scrapping_engine, scrapping_task_coordinator, service_container
 from app.routes.api import router
+from app.utils.blocking_executor.client import route_blocking_executor
+from app.utils.http_client.client import async_ether_scan_client, ether_scan_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    service_container.start()
+    # Resume the pool scrape tasks started before, on whichever workers claim them
+    await scrapping_task_coordinator.start()
+    yield
+    await scrapping_task_coordinator.shutdown()
+    await scrapping_engine.shutdown()
+    route_blocking_executor.shutdown()
+    service_container.shutdown()
+    # release pooled http connections on shutdown
+    await async_ether_scan_client.aclose()
+    ether_scan_client.close()
 
 
 def get_app() -> FastAPI:
@@ -10,6 +31,7 @@ def get_app() -> FastAPI:
         title=project_metadata["name"],
         version=project_metadata["version"],
         description=project_metadata["description"],
+        lifespan=lifespan,
     )
     app.include_router(router)
 
@@ -0,0 +1,78 @@
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.log.logger import Logger
+from app.storage.models import BlockTimestampAnchor
+
+INSERT_CHUNK_SIZE = 5000
+
+
+class BlockTimestampAnchorsRepository:
+    def __init__(self, db_session: Callable[..., Session]) -> None:
+        self.__db_session = db_session
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    def insert_anchors(self, data: list[BlockTimestampAnchor]) -> None:
+        """
+        Method to insert bulk data into table/schema, input is a list.
+        Anchors already stored are skipped, a block timestamp never changes.
+        """
+        try:
+            if len(data) == 0:
+                return
+
+            rows = [
+                {
+                    "block_number": anchor.block_number,
+                    "ts_timestamp": anchor.ts_timestamp,
+                }
+                for anchor in data
+            ]
+
+            with self.__db_session() as session:
+                for index in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    session.execute(
+                        insert(BlockTimestampAnchor)
+                        .values(rows[index:index + INSERT_CHUNK_SIZE])
+                        .on_conflict_do_nothing(index_elements=[BlockTimestampAnchor.block_number])
+                    )
+                session.commit()
+        except Exception as e:
+            description = "Insert block timestamp anchors data failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Insert block timestamp anchors data failed"
+            raise Exception(error_message) from e
+
+    def read_bracketing_anchors(
+        self,
+        timestamp: int,
+    ) -> Tuple[Optional[BlockTimestampAnchor], Optional[BlockTimestampAnchor]]:
+        """
+        Method to read the closest anchor at or before timestamp and the closest anchor at or after timestamp.
+        """
+        try:
+            with self.__db_session() as session:
+                lower_anchor = (
+                    session.query(BlockTimestampAnchor)
+                    .filter(BlockTimestampAnchor.ts_timestamp <= timestamp)
+                    .order_by(BlockTimestampAnchor.ts_timestamp.desc())
+                    .first()
+                )
+                upper_anchor = (
+                    session.query(BlockTimestampAnchor)
+                    .filter(BlockTimestampAnchor.ts_timestamp >= timestamp)
+                    .order_by(BlockTimestampAnchor.ts_timestamp.asc())
+                    .first()
+                )
+
+                return lower_anchor, upper_anchor
+
+        except Exception as e:
+            description = "Read bracketing block timestamp anchors failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read bracketing block timestamp anchors failed"
+            raise Exception(error_message) from e
@@ -0,0 +1,84 @@
+from typing import Callable
+
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.log.logger import Logger
+from app.storage.models import EthUsdtKline
+
+INSERT_CHUNK_SIZE = 5000
+
+
+class EthUsdtKlinesRepository:
+    def __init__(self, db_session: Callable[..., Session]) -> None:
+        self.__db_session = db_session
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    def insert_klines(self, data: list[EthUsdtKline]) -> None:
+        """
+        Method to insert bulk data into table/schema, input is a list.
+        Candles already stored are skipped, klines are immutable once closed.
+        """
+        try:
+            if len(data) == 0:
+                return
+
+            rows = [
+                {
+                    "open_time": kline.open_time,
+                    "open": kline.open,
+                    "high": kline.high,
+                    "low": kline.low,
+                    "close": kline.close,
+                    "volume": kline.volume,
+                    "close_time": kline.close_time,
+                }
+                for kline in data
+            ]
+
+            with self.__db_session() as session:
+                # Chunked to stay below the postgres bind parameter limit on long backfills
+                for index in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    session.execute(
+                        insert(EthUsdtKline)
+                        .values(rows[index:index + INSERT_CHUNK_SIZE])
+                        .on_conflict_do_nothing(index_elements=[EthUsdtKline.open_time])
+                    )
+                session.commit()
+        except Exception as e:
+            description = "Insert eth usdt klines data failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Insert eth usdt klines data failed"
+            raise Exception(error_message) from e
+
+    def read_klines_by_open_time_range(
+        self,
+        start_open_time: int,
+        end_open_time: int,
+    ) -> list[EthUsdtKline] | None:
+        """
+        Method to read EthUsdtKline with open_time between start_open_time and end_open_time (inclusive, milliseconds).
+        """
+        try:
+            with self.__db_session() as session:
+
+                clause_statement_list = [
+                    EthUsdtKline.open_time >= start_open_time,
+                    EthUsdtKline.open_time <= end_open_time,
+                ]
+                query_statement = session.query(EthUsdtKline)
+
+                return (
+                    query_statement.filter(and_(*clause_statement_list))
+                    .order_by(EthUsdtKline.open_time.asc())
+                    .all()
+                )
+
+        except Exception as e:
+            description = "Read eth usdt klines data by open time range failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read eth usdt klines data by open time range failed"
+            raise Exception(error_message) from e
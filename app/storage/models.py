@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, BigInteger, Numeric, String, ForeignKey, UniqueConstraint, false, func, true
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -15,24 +15,31 @@ class TransactionToFromPool(Base):
     
     transaction_id = Column(Integer, primary_key=True, autoincrement=True)
     block_number = Column(BigInteger, nullable=False)
-    ts_timestamp = Column(BigInteger, nullable=False)
-    tx_hash = Column(String, unique=True, nullable=False)
+    # Partition key of the monthly partitions, see 0007-partition-transactions-to-from-pools-by-month.sql
+    ts_timestamp = Column(BigInteger, primary_key=True, autoincrement=False)
+    tx_hash = Column(String, nullable=False)
     from_address = Column(String, nullable=False)
     to_address = Column(String, nullable=False)
     contract_address = Column(String, nullable=False)
-    token_value = Column(String, nullable=False)
+    token_value = Column(Numeric(78, 0), nullable=False)
     token_name = Column(String)
     token_symbol = Column(String)
-    token_decimal = Column(String)
-    transaction_index = Column(String, nullable=False)
-    gas_limit = Column(String, nullable=False)
-    gas_price = Column(String, nullable=False)
-    gas_used = Column(String, nullable=False)
-    cumulative_gas_used = Column(String)
-    confirmations = Column(String)
-    transaction_fee_usdt = Column(String)
+    token_decimal = Column(Integer)
+    transaction_index = Column(BigInteger, nullable=False)
+    gas_limit = Column(BigInteger, nullable=False)
+    gas_price = Column(Numeric(78, 0), nullable=False)
+    gas_used = Column(BigInteger, nullable=False)
+    cumulative_gas_used = Column(BigInteger)
+    confirmations = Column(BigInteger)
+    transaction_fee_usdt = Column(Numeric)
     pool_id = Column(Integer, ForeignKey('token_pair_pools.pool_id'), nullable=True)
 
+    __table_args__ = (
+        UniqueConstraint('tx_hash', 'pool_id', 'ts_timestamp', name='transactions_to_from_pools_tx_hash_pool_id_ts_timestamp_key'),
+        Index('idx_pool_id_block_number_transaction_index', 'pool_id', 'block_number', 'transaction_index'),
+        Index('idx_pool_id_ts_timestamp', 'pool_id', ts_timestamp.desc()),
+    )
+
     # Relationship to token pair pool
     # pool = relationship("TokenPairPool", back_populates="transactions")
 
@@ -44,3 +51,88 @@ class TransactionToFromPool(Base):
                 f"transaction_fee_usdt={self.transaction_fee_usdt})>")
 
 
+class EthUsdtKline(Base):
+    __tablename__ = 'eth_usdt_klines'
+
+    open_time = Column(BigInteger, primary_key=True, autoincrement=False)
+    open = Column(Numeric, nullable=False)
+    high = Column(Numeric, nullable=False)
+    low = Column(Numeric, nullable=False)
+    close = Column(Numeric, nullable=False)
+    volume = Column(Numeric, nullable=False)
+    close_time = Column(BigInteger, nullable=False)
+
+    def __repr__(self):
+        return (f"<EthUsdtKline(open_time={self.open_time}, close={self.close}, "
+                f"close_time={self.close_time})>")
+
+
+class BlockTimestampAnchor(Base):
+    __tablename__ = 'block_timestamp_anchors'
+
+    block_number = Column(BigInteger, primary_key=True, autoincrement=False)
+    ts_timestamp = Column(BigInteger, nullable=False, index=True)
+
+    def __repr__(self):
+        return (f"<BlockTimestampAnchor(block_number={self.block_number}, "
+                f"ts_timestamp={self.ts_timestamp})>")
+
+
+class PoolScrapeCoverage(Base):
+    __tablename__ = 'pool_scrape_coverage'
+
+    # Contiguous, inclusive block range whose transfers are all stored in transactions_to_from_pools
+    pool_id = Column(Integer, ForeignKey('token_pair_pools.pool_id', ondelete='CASCADE'), primary_key=True)
+    start_block = Column(BigInteger, primary_key=True, autoincrement=False)
+    end_block = Column(BigInteger, nullable=False)
+
+    def __repr__(self):
+        return (f"<PoolScrapeCoverage(pool_id={self.pool_id}, "
+                f"start_block={self.start_block}, end_block={self.end_block})>")
+
+
+class PoolScrapeState(Base):
+    __tablename__ = 'pool_scrape_state'
+
+    # Scrape watermark, the last (block, transaction index) stored for the pool
+    pool_id = Column(Integer, ForeignKey('token_pair_pools.pool_id', ondelete='CASCADE'), primary_key=True)
+    last_block = Column(BigInteger, nullable=False)
+    last_tx_index = Column(BigInteger, nullable=False)
+    # Written by a scrapping job batch, every transfer of last_block up to last_tx_index is stored
+    written_by_scrapping_job = Column(Boolean, nullable=False, server_default=false())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return (f"<PoolScrapeState(pool_id={self.pool_id}, last_block={self.last_block}, "
+                f"last_tx_index={self.last_tx_index}, written_by_scrapping_job={self.written_by_scrapping_job}, "
+                f"updated_at={self.updated_at})>")
+
+
+class PoolScrapeTask(Base):
+    __tablename__ = 'pool_scrape_tasks'
+
+    # Cluster wide scrape task of a pool, exactly one worker holds its lease at a time
+    pool_id = Column(Integer, ForeignKey('token_pair_pools.pool_id', ondelete='CASCADE'), primary_key=True)
+    is_active = Column(Boolean, nullable=False, server_default=true())
+    owner_id = Column(String(255))
+    lease_expires_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_pool_scrape_tasks_owner_id', 'owner_id'),
+    )
+
+    def __repr__(self):
+        return (f"<PoolScrapeTask(pool_id={self.pool_id}, is_active={self.is_active}, "
+                f"owner_id={self.owner_id}, lease_expires_at={self.lease_expires_at})>")
+
+
+class ScrapeWorker(Base):
+    __tablename__ = 'scrape_workers'
+
+    # Live scrapping worker process, counted in the fair share of the pool scrape tasks
+    owner_id = Column(String(255), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ScrapeWorker(owner_id={self.owner_id}, expires_at={self.expires_at})>"
@@ -0,0 +1,89 @@
+from typing import Callable
+
+from sqlalchemy import and_, delete
+from sqlalchemy.orm import Session
+
+from app.core.log.logger import Logger
+from app.storage.models import PoolScrapeCoverage
+
+
+class PoolScrapeCoverageRepository:
+    def __init__(self, db_session: Callable[..., Session]) -> None:
+        self.__db_session = db_session
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    def insert_covered_block_range(self, pool_id: int, start_block: int, end_block: int) -> None:
+        """
+        Method to mark [start_block, end_block] as fully scraped for pool_id.
+        Overlapping and adjacent ranges are merged so a pool keeps a few, wide rows.
+        """
+        try:
+            if start_block > end_block:
+                return
+
+            with self.__db_session() as session:
+                touching_ranges = (
+                    session.query(PoolScrapeCoverage)
+                    .filter(and_(
+                        PoolScrapeCoverage.pool_id == pool_id,
+                        PoolScrapeCoverage.start_block <= end_block + 1,
+                        PoolScrapeCoverage.end_block >= start_block - 1,
+                    ))
+                    .with_for_update()
+                    .all()
+                )
+
+                merged_start_block = min([start_block] + [covered.start_block for covered in touching_ranges])
+                merged_end_block = max([end_block] + [covered.end_block for covered in touching_ranges])
+
+                if len(touching_ranges) > 0:
+                    session.execute(
+                        delete(PoolScrapeCoverage).where(and_(
+                            PoolScrapeCoverage.pool_id == pool_id,
+                            PoolScrapeCoverage.start_block.in_([covered.start_block for covered in touching_ranges]),
+                        ))
+                    )
+                session.add(PoolScrapeCoverage(
+                    pool_id=pool_id,
+                    start_block=merged_start_block,
+                    end_block=merged_end_block,
+                ))
+                session.commit()
+        except Exception as e:
+            description = "Insert pool scrape coverage data failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Insert pool scrape coverage data failed"
+            raise Exception(error_message) from e
+
+    def read_covered_block_ranges(
+        self,
+        pool_id: int,
+        start_block: int,
+        end_block: int,
+    ) -> list[PoolScrapeCoverage] | None:
+        """
+        Method to read the covered ranges of pool_id overlapping [start_block, end_block], ordered by start_block.
+        """
+        try:
+            with self.__db_session() as session:
+
+                clause_statement_list = [
+                    PoolScrapeCoverage.pool_id == pool_id,
+                    PoolScrapeCoverage.start_block <= end_block,
+                    PoolScrapeCoverage.end_block >= start_block,
+                ]
+                query_statement = session.query(PoolScrapeCoverage)
+
+                return (
+                    query_statement.filter(and_(*clause_statement_list))
+                    .order_by(PoolScrapeCoverage.start_block.asc())
+                    .all()
+                )
+
+        except Exception as e:
+            description = "Read pool scrape coverage data failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read pool scrape coverage data failed"
+            raise Exception(error_message) from e
@@ -0,0 +1,55 @@
+from typing import Callable
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.orm import Session
+
+from app.core.log.logger import Logger
+from app.storage.models import PoolScrapeState
+
+
+def build_pool_scrape_state_upsert(scrape_state: PoolScrapeState) -> Insert:
+    """
+    Upsert statement of a pool watermark, it only ever moves forward in (last_block, last_tx_index) order.
+    Executed by the repositories inserting transactions, inside the same transaction as the batch.
+    """
+    insert_statement = insert(PoolScrapeState).values(
+        pool_id=scrape_state.pool_id,
+        last_block=scrape_state.last_block,
+        last_tx_index=scrape_state.last_tx_index,
+        written_by_scrapping_job=bool(scrape_state.written_by_scrapping_job),
+    )
+    return insert_statement.on_conflict_do_update(
+        index_elements=[PoolScrapeState.pool_id],
+        set_={
+            "last_block": insert_statement.excluded.last_block,
+            "last_tx_index": insert_statement.excluded.last_tx_index,
+            "written_by_scrapping_job": insert_statement.excluded.written_by_scrapping_job,
+            "updated_at": func.now(),
+        },
+        where=(
+            tuple_(PoolScrapeState.last_block, PoolScrapeState.last_tx_index)
+            < tuple_(insert_statement.excluded.last_block, insert_statement.excluded.last_tx_index)
+        ),
+    )
+
+
+class PoolScrapeStateRepository:
+    def __init__(self, db_session: Callable[..., Session]) -> None:
+        self.__db_session = db_session
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    def read_pool_scrape_state(self, pool_id: int) -> PoolScrapeState | None:
+        """
+        Method to read the scrape watermark of pool_id, a primary key lookup.
+        """
+        try:
+            with self.__db_session() as session:
+                return session.get(PoolScrapeState, pool_id)
+
+        except Exception as e:
+            description = "Read pool scrape state data failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read pool scrape state data failed"
+            raise Exception(error_message) from e
@@ -0,0 +1,228 @@
+from datetime import timedelta
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.log.logger import Logger
+from app.storage.models import PoolScrapeTask, ScrapeWorker, TokenPairPool
+
+
+class PoolScrapeTasksRepository:
+    def __init__(self, db_session: Callable[..., Session]) -> None:
+        self.__db_session = db_session
+        self.__logger = Logger(name=self.__class__.__name__)
+
+    def activate_pool_scrape_task(self, pool_id: int) -> bool:
+        """
+        Method to mark the scrape task of pool_id active, returns False when it already was.
+        """
+        try:
+            with self.__db_session() as session:
+                insert_statement = insert(PoolScrapeTask).values(pool_id=pool_id, is_active=True)
+                activated_pool_id = session.execute(
+                    insert_statement.on_conflict_do_update(
+                        index_elements=[PoolScrapeTask.pool_id],
+                        set_={"is_active": True, "updated_at": func.now()},
+                        where=PoolScrapeTask.is_active.is_(False),
+                    ).returning(PoolScrapeTask.pool_id)
+                ).scalar()
+                session.commit()
+
+            return activated_pool_id is not None
+        except Exception as e:
+            description = "Activate pool scrape task failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Activate pool scrape task failed"
+            raise Exception(error_message) from e
+
+    def deactivate_pool_scrape_task(self, pool_id: int) -> bool:
+        """
+        Method to mark the scrape task of pool_id inactive and free its lease, returns False when it was not active.
+        The owner notices on its next heartbeat.
+        """
+        try:
+            with self.__db_session() as session:
+                deactivated_pool_id = session.execute(
+                    update(PoolScrapeTask)
+                    .where(and_(PoolScrapeTask.pool_id == pool_id, PoolScrapeTask.is_active.is_(True)))
+                    .values(is_active=False, owner_id=None, lease_expires_at=None, updated_at=func.now())
+                    .returning(PoolScrapeTask.pool_id)
+                ).scalar()
+                session.commit()
+
+            return deactivated_pool_id is not None
+        except Exception as e:
+            description = "Deactivate pool scrape task failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Deactivate pool scrape task failed"
+            raise Exception(error_message) from e
+
+    def renew_pool_scrape_leases(self, owner_id: str, pool_ids: list[int], ttl_seconds: float) -> list[int]:
+        """
+        Method to extend the leases owner_id holds on pool_ids, returns the pool ids still owned and active.
+        """
+        try:
+            if len(pool_ids) == 0:
+                return []
+
+            with self.__db_session() as session:
+                renewed_pool_ids = session.execute(
+                    update(PoolScrapeTask)
+                    .where(and_(
+                        PoolScrapeTask.pool_id.in_(pool_ids),
+                        PoolScrapeTask.owner_id == owner_id,
+                        PoolScrapeTask.is_active.is_(True),
+                    ))
+                    .values(lease_expires_at=func.now() + timedelta(seconds=ttl_seconds), updated_at=func.now())
+                    .returning(PoolScrapeTask.pool_id)
+                ).scalars().all()
+                session.commit()
+
+            return list(renewed_pool_ids)
+        except Exception as e:
+            description = "Renew pool scrape leases failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Renew pool scrape leases failed"
+            raise Exception(error_message) from e
+
+    def acquire_pool_scrape_leases(self, owner_id: str, ttl_seconds: float, max_count: int) -> list[TokenPairPool]:
+        """
+        Method to claim up to max_count active tasks nobody holds a live lease on, returns their pools.
+        SKIP LOCKED lets concurrent workers claim disjoint tasks without waiting on each other.
+        """
+        try:
+            if max_count <= 0:
+                return []
+
+            with self.__db_session() as session:
+                claimable_pool_ids = (
+                    select(PoolScrapeTask.pool_id)
+                    .where(and_(
+                        PoolScrapeTask.is_active.is_(True),
+                        or_(PoolScrapeTask.owner_id.is_(None), PoolScrapeTask.lease_expires_at < func.now()),
+                    ))
+                    .order_by(PoolScrapeTask.pool_id)
+                    .limit(max_count)
+                    .with_for_update(skip_locked=True)
+                    .scalar_subquery()
+                )
+                claimed_pool_ids = session.execute(
+                    update(PoolScrapeTask)
+                    .where(PoolScrapeTask.pool_id.in_(claimable_pool_ids))
+                    .values(
+                        owner_id=owner_id,
+                        lease_expires_at=func.now() + timedelta(seconds=ttl_seconds),
+                        updated_at=func.now(),
+                    )
+                    .returning(PoolScrapeTask.pool_id)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+
+                claimed_pools = []
+                if len(claimed_pool_ids) > 0:
+                    claimed_pools = (
+                        session.query(TokenPairPool)
+                        .filter(TokenPairPool.pool_id.in_(claimed_pool_ids))
+                        .order_by(TokenPairPool.pool_id)
+                        .all()
+                    )
+                session.commit()
+
+            return claimed_pools
+        except Exception as e:
+            description = "Acquire pool scrape leases failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Acquire pool scrape leases failed"
+            raise Exception(error_message) from e
+
+    def read_pool_scrape_task_load(self) -> Tuple[int, int]:
+        """
+        Method to read (active task count, live worker count), used to size a fair share.
+        """
+        try:
+            with self.__db_session() as session:
+                active_count = session.execute(
+                    select(func.count()).where(PoolScrapeTask.is_active.is_(True))
+                ).scalar()
+                live_owner_count = session.execute(
+                    select(func.count()).where(ScrapeWorker.expires_at >= func.now())
+                ).scalar()
+
+            return int(active_count), int(live_owner_count)
+        except Exception as e:
+            description = "Read pool scrape task load failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read pool scrape task load failed"
+            raise Exception(error_message) from e
+
+    def renew_scrape_worker(self, owner_id: str, ttl_seconds: float) -> None:
+        """
+        Method to mark owner_id live for ttl_seconds, workers past their expiry are removed on the way.
+        """
+        try:
+            with self.__db_session() as session:
+                session.execute(delete(ScrapeWorker).where(ScrapeWorker.expires_at < func.now()))
+                insert_statement = insert(ScrapeWorker).values(
+                    owner_id=owner_id,
+                    expires_at=func.now() + timedelta(seconds=ttl_seconds),
+                )
+                session.execute(
+                    insert_statement.on_conflict_do_update(
+                        index_elements=[ScrapeWorker.owner_id],
+                        set_={"expires_at": insert_statement.excluded.expires_at},
+                    )
+                )
+                session.commit()
+        except Exception as e:
+            description = "Renew scrape worker failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Renew scrape worker failed"
+            raise Exception(error_message) from e
+
+    def delete_scrape_worker(self, owner_id: str) -> None:
+        """
+        Method to remove owner_id from the live workers, so the others grow their fair share at once.
+        """
+        try:
+            with self.__db_session() as session:
+                session.execute(delete(ScrapeWorker).where(ScrapeWorker.owner_id == owner_id))
+                session.commit()
+        except Exception as e:
+            description = "Delete scrape worker failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Delete scrape worker failed"
+            raise Exception(error_message) from e
+
+    def release_pool_scrape_leases(self, owner_id: str, pool_ids: Optional[list[int]] = None) -> None:
+        """
+        Method to give up the leases of owner_id (all of them when pool_ids is None), so other workers claim them at once.
+        """
+        try:
+            clause_statement_list = [PoolScrapeTask.owner_id == owner_id]
+            if pool_ids is not None:
+                if len(pool_ids) == 0:
+                    return
+                clause_statement_list.append(PoolScrapeTask.pool_id.in_(pool_ids))
+
+            with self.__db_session() as session:
+                session.execute(
+                    update(PoolScrapeTask)
+                    .where(and_(*clause_statement_list))
+                    .values(owner_id=None, lease_expires_at=None, updated_at=func.now())
+                )
+                session.commit()
+        except Exception as e:
+            description = "Release pool scrape leases failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Release pool scrape leases failed"
+            raise Exception(error_message) from e
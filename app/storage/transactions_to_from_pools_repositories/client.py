@@ -1,29 +1,76 @@
-from typing import Callable
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Optional, Tuple
 
-from sqlalchemy import and_, case, or_
+from psycopg2.extras import execute_values
+from sqlalchemy import and_, case, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.log.logger import Logger
-from app.storage.models import TransactionToFromPool
+from app.storage.models import PoolScrapeState, TokenPairPool, TransactionToFromPool
+from app.storage.pool_scrape_state_repositories.client import build_pool_scrape_state_upsert
+
+# Rows per multi-row INSERT statement of the bulk ingest path
+BULK_INSERT_PAGE_SIZE = 1000
+
+BULK_INSERT_COLUMNS = (
+    "block_number",
+    "ts_timestamp",
+    "tx_hash",
+    "from_address",
+    "to_address",
+    "contract_address",
+    "token_value",
+    "token_name",
+    "token_symbol",
+    "token_decimal",
+    "transaction_index",
+    "gas_limit",
+    "gas_price",
+    "gas_used",
+    "cumulative_gas_used",
+    "confirmations",
+    "transaction_fee_usdt",
+    "pool_id",
+)
 
 class TransactionToFromPoolRepository:
     def __init__(self, db_session: Callable[..., Session]) -> None:
         self.__db_session = db_session
         self.__logger = Logger(name=self.__class__.__name__)
 
-    def insert_transaction_to_from_pool_data(self, data: list[TransactionToFromPool]) -> None:
+    def insert_transaction_to_from_pool_data(
+        self,
+        data: list[TransactionToFromPool],
+        scrape_state: Optional[PoolScrapeState] = None,
+    ) -> int:
         """
         Method to insert bulk data into table/schema, input is a list.
+        Rows whose tx_hash is already stored for the pool are skipped, returns the count of rows actually inserted.
+        scrape_state, when given, is advanced in the same transaction as the rows.
         """
-        # Need to prevent duplicate too
         try:
             if len(data) == 0:
-                return
+                return 0
 
             with self.__db_session() as session:
-                for transaction in data:
-                    session.add(transaction)
+                inserted_tx_hashes = session.execute(
+                    insert(TransactionToFromPool)
+                    .values([self.convert_transaction_to_mapping(transaction) for transaction in data])
+                    .on_conflict_do_nothing(
+                        index_elements=[
+                            TransactionToFromPool.tx_hash,
+                            TransactionToFromPool.pool_id,
+                            TransactionToFromPool.ts_timestamp,
+                        ]
+                    )
+                    .returning(TransactionToFromPool.tx_hash)
+                ).fetchall()
+                if scrape_state is not None:
+                    session.execute(build_pool_scrape_state_upsert(scrape_state))
                 session.commit()
+
+            return len(inserted_tx_hashes)
         except Exception as e:
             description = "Insert transaction to from pool data failed"
             log_message = f"Description: {description} |Error: {e!s}"
@@ -31,30 +78,95 @@ class TransactionToFromPoolRepository:
             error_message = "Insert transaction to from pool data failed"
             raise Exception(error_message) from e
         
-    def insert_first_transaction_to_from_pool_data(self, data: list[TransactionToFromPool]) -> None:
+    def insert_first_transaction_to_from_pool_data(
+        self,
+        data: list[TransactionToFromPool],
+        scrape_state: Optional[PoolScrapeState] = None,
+    ) -> int:
         """
         Method to insert bulk data into table/schema, input is a list.
+        Duplicates are resolved by the ON CONFLICT clause, no read round trip is needed first.
         """
-        # Need to prevent duplicate too
-        existing_tx_hash = self.read_transaction_data_by_tx_hash([transaction.tx_hash for transaction in data])
-        if len(existing_tx_hash) > 0:
-            return
+        return self.insert_transaction_to_from_pool_data(data, scrape_state)
 
+    def bulk_insert_transaction_to_from_pool_data(
+        self,
+        data: Iterable[TransactionToFromPool],
+        scrape_state: Optional[PoolScrapeState] = None,
+    ) -> int:
+        """
+        Method to bulk ingest data into table/schema, input is any iterable so backfills can stream rows.
+        Rows go through psycopg2 execute_values, one multi-row INSERT per BULK_INSERT_PAGE_SIZE rows,
+        without the ORM unit of work nor identity fetches. Rows whose tx_hash is already stored for the pool are
+        skipped, returns the count of rows actually inserted.
+        scrape_state, when given, is advanced in the same transaction as the rows.
+        """
         try:
-            if len(data) == 0:
-                return
+            inserted_count = 0
+            with self.__db_session() as session:
+                # Raw DBAPI cursor on the session connection, the insert stays in the session transaction
+                cursor = session.connection().connection.cursor()
+                try:
+                    rows: list[tuple[Any, ...]] = []
+                    for transaction in data:
+                        rows.append(self.convert_transaction_to_row(transaction))
+                        if len(rows) == BULK_INSERT_PAGE_SIZE:
+                            inserted_count += self.__execute_bulk_insert(cursor, rows)
+                            rows = []
+                    inserted_count += self.__execute_bulk_insert(cursor, rows)
+                finally:
+                    cursor.close()
+                if scrape_state is not None:
+                    session.execute(build_pool_scrape_state_upsert(scrape_state))
+                session.commit()
 
+            return inserted_count
+        except Exception as e:
+            description = "Bulk insert transaction to from pool data failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Bulk insert transaction to from pool data failed"
+            raise Exception(error_message) from e
+
+    def create_partitions_for_time_range(self, start_timestamp: int, end_timestamp: int) -> list[str]:
+        """
+        Method to create the missing monthly partitions of [start_timestamp, end_timestamp] (seconds),
+        so rows of historical months never land in the default partition. Returns the created partitions.
+        """
+        try:
             with self.__db_session() as session:
-                for transaction in data:
-                    session.add(transaction)
+                created_partitions = session.execute(
+                    select(func.create_transactions_to_from_pools_partitions_between(start_timestamp, end_timestamp))
+                ).scalars().all()
                 session.commit()
+
+            return list(created_partitions)
         except Exception as e:
-            description = "Insert transaction to from pool data failed"
+            description = "Create transaction to from pool partitions failed"
             log_message = f"Description: {description} |Error: {e!s}"
             self.__logger.exception(log_message)
-            error_message = "Insert transaction to from pool data failed"
+            error_message = "Create transaction to from pool partitions failed"
             raise Exception(error_message) from e
 
+    def __execute_bulk_insert(self, cursor: Any, rows: list[tuple[Any, ...]]) -> int:
+        if len(rows) == 0:
+            return 0
+
+        inserted_tx_hashes = execute_values(
+            cursor,
+            f"INSERT INTO {TransactionToFromPool.__tablename__} ({', '.join(BULK_INSERT_COLUMNS)}) VALUES %s "
+            "ON CONFLICT (tx_hash, pool_id, ts_timestamp) DO NOTHING RETURNING tx_hash",
+            rows,
+            page_size=len(rows),
+            fetch=True,
+        )
+        return len(inserted_tx_hashes)
+
+    def convert_transaction_to_row(self, transaction: TransactionToFromPool) -> tuple[Any, ...]:
+        return tuple(getattr(transaction, column) for column in BULK_INSERT_COLUMNS)
+
+    def convert_transaction_to_mapping(self, transaction: TransactionToFromPool) -> dict[str, Any]:
+        return {column: getattr(transaction, column) for column in BULK_INSERT_COLUMNS}
 
     def read_token_pool_pair_data_by_id(
         self, ids: list[int]
@@ -116,7 +228,43 @@ class TransactionToFromPoolRepository:
             self.__logger.exception(log_message)
             error_message = "Read transaction to from pool data by id failed"
             raise Exception(error_message) from e
-        
+
+    def read_transaction_fee_by_tx_hash(
+        self, tx_hashs: list[str]
+    ) -> list[Tuple[str, Optional[Decimal], str]]:
+        """
+        Method to bulk read (tx_hash, transaction_fee_usdt, pool_name) based on tx_hashs,
+        the pool name is joined from token_pair_pools in the same query, "" for rows whose pool was deleted.
+        A multi-hop transaction has one row per pool it went through, rows come in pool_id order.
+        """
+        try:
+            if len(tx_hashs) == 0:
+                return []
+
+            with self.__db_session() as session:
+                rows = (
+                    session.query(
+                        TransactionToFromPool.tx_hash,
+                        TransactionToFromPool.transaction_fee_usdt,
+                        TokenPairPool.pool_name,
+                    )
+                    .outerjoin(TokenPairPool, TokenPairPool.pool_id == TransactionToFromPool.pool_id)
+                    .filter(TransactionToFromPool.tx_hash.in_(tx_hashs))
+                    .order_by(TransactionToFromPool.pool_id)
+                    .all()
+                )
+                return [
+                    (tx_hash, transaction_fee_usdt, pool_name or "")
+                    for (tx_hash, transaction_fee_usdt, pool_name) in rows
+                ]
+
+        except Exception as e:
+            description = "Read transaction fee by tx hash failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read transaction fee by tx hash failed"
+            raise Exception(error_message) from e
+
     def read_transaction_data_by_to_from_address(
         self, 
         address: str,
@@ -156,7 +304,7 @@ class TransactionToFromPoolRepository:
     ) -> TransactionToFromPool | None:
         """
         Method to get the latest TransactionToFromPool based on to_address, from_address, and pool_id,
-        ordered by created date.
+        ordered by block number so it is answered by a backward scan of idx_pool_id_block_number_transaction_index.
         """
         try:
             with self.__db_session() as session:
@@ -172,7 +320,7 @@ class TransactionToFromPoolRepository:
 
                 return (
                     query_statement.filter(and_(*clause_statement_list))
-                    .order_by(TransactionToFromPool.ts_timestamp.desc())
+                    .order_by(TransactionToFromPool.block_number.desc())
                     .first()
                 )
 
@@ -188,8 +336,8 @@ class TransactionToFromPoolRepository:
             pool_id: str,
     ) -> TransactionToFromPool | None:
         """
-        Method to get the earliest TransactionToFromPool based on timestamp and pool_id,
-        ordered by created date.
+        Method to get the earliest TransactionToFromPool based on pool_id,
+        ordered by block number so it is answered by a forward scan of idx_pool_id_block_number_transaction_index.
         """
         try:
             with self.__db_session() as session:
@@ -201,7 +349,7 @@ class TransactionToFromPoolRepository:
 
                 return (
                     query_statement.filter(and_(*clause_statement_list))
-                    .order_by(TransactionToFromPool.ts_timestamp.asc())
+                    .order_by(TransactionToFromPool.block_number.asc())
                     .first()
                 )
 
@@ -210,4 +358,56 @@ class TransactionToFromPoolRepository:
             log_message = f"Description: {description} |Error: {e!s}"
             self.__logger.exception(log_message)
             error_message = "Read earliest transaction to from pool data by timestamp and pool_id failed"
-            raise Exception(error_message) from e
\ No newline at end of file
+            raise Exception(error_message) from e
+
+    def read_transaction_data_by_pool_id_and_block_range(
+            self,
+            pool_id: int,
+            start_block: int,
+            end_block: int,
+            time_range: Optional[Tuple[int, int]] = None,
+            after_position: Optional[Tuple[int, int]] = None,
+            limit: Optional[int] = None,
+    ) -> list[TransactionToFromPool] | None:
+        """
+        Method to read TransactionToFromPool of pool_id between start_block and end_block (inclusive),
+        in chain order (block number, transaction index).
+        time_range (inclusive ts_timestamp bounds) only narrows the scan to the matching monthly partitions.
+        after_position (block number, transaction index) and limit read one keyset page, a range scan of
+        idx_pool_id_block_number_transaction_index whose cost does not depend on how deep the page is.
+        """
+        try:
+            with self.__db_session() as session:
+
+                clause_statement_list = [
+                    TransactionToFromPool.pool_id == pool_id,
+                    TransactionToFromPool.block_number >= start_block,
+                    TransactionToFromPool.block_number <= end_block,
+                ]
+                if time_range is not None:
+                    clause_statement_list.append(TransactionToFromPool.ts_timestamp >= time_range[0])
+                    clause_statement_list.append(TransactionToFromPool.ts_timestamp <= time_range[1])
+                if after_position is not None:
+                    clause_statement_list.append(
+                        tuple_(TransactionToFromPool.block_number, TransactionToFromPool.transaction_index)
+                        > tuple_(after_position[0], after_position[1])
+                    )
+                query_statement = (
+                    session.query(TransactionToFromPool)
+                    .filter(and_(*clause_statement_list))
+                    .order_by(
+                        TransactionToFromPool.block_number.asc(),
+                        TransactionToFromPool.transaction_index.asc(),
+                    )
+                )
+                if limit is not None:
+                    query_statement = query_statement.limit(limit)
+
+                return query_statement.all()
+
+        except Exception as e:
+            description = "Read transaction to from pool data by pool_id and block range failed"
+            log_message = f"Description: {description} |Error: {e!s}"
+            self.__logger.exception(log_message)
+            error_message = "Read transaction to from pool data by pool_id and block range failed"
+            raise Exception(error_message) from e
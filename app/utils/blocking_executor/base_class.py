@@ -0,0 +1,102 @@
+import asyncio
+import functools
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, TypeVar
+
+from app.utils.blocking_executor.model import BlockingExecutorStats
+
+T = TypeVar("T")
+
+RECENT_WAIT_SAMPLE_SIZE = 1000
+
+
+class BlockingCallExecutor:
+    """
+    Bounded thread pool for the synchronous calls (SQLAlchemy, requests, web3) made from async handlers.
+
+    Awaiting run() keeps the event loop free while the call runs, so one slow upstream call no longer
+    stalls every other request of the worker. Calls beyond max_workers queue in arrival order and
+    their queue depth and wait time are recorded.
+    """
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        self.name = name
+        self.__max_workers = max(1, max_workers)
+        self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix=name)
+        self.__lock = threading.Lock()
+        self.__stats = BlockingExecutorStats(max_workers=self.__max_workers)
+        self.__recent_wait_seconds: Deque[float] = deque(maxlen=RECENT_WAIT_SAMPLE_SIZE)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run func(*args, **kwargs) on the pool and await its result, exceptions are re-raised to the caller.
+        """
+        submitted_at = time.monotonic()
+        # Set once the call left the queue, by the thread starting it or by the caller giving up on it
+        dequeued = threading.Event()
+        with self.__lock:
+            self.__stats.queue_depth += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.__executor,
+                functools.partial(self.__run_measured, submitted_at, dequeued, func, *args, **kwargs),
+            )
+        finally:
+            # Cancelled by the caller (e.g. client disconnect) or dropped by shutdown before it started
+            self.__dequeue(dequeued)
+
+    def __dequeue(self, dequeued: threading.Event) -> None:
+        with self.__lock:
+            if not dequeued.is_set():
+                dequeued.set()
+                self.__stats.queue_depth -= 1
+
+    def __run_measured(
+        self,
+        submitted_at: float,
+        dequeued: threading.Event,
+        func: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        wait_seconds = time.monotonic() - submitted_at
+        self.__dequeue(dequeued)
+        with self.__lock:
+            self.__stats.active_count += 1
+            self.__stats.total_wait_seconds += wait_seconds
+            self.__stats.max_wait_seconds = max(self.__stats.max_wait_seconds, wait_seconds)
+            self.__recent_wait_seconds.append(wait_seconds)
+
+        is_failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            is_failed = True
+            raise
+        finally:
+            with self.__lock:
+                self.__stats.active_count -= 1
+                self.__stats.completed_count += 1
+                if is_failed:
+                    self.__stats.failed_count += 1
+
+    def get_stats(self) -> BlockingExecutorStats:
+        with self.__lock:
+            stats = self.__stats.model_copy()
+            recent_wait_seconds = sorted(self.__recent_wait_seconds)
+
+        started_count = len(recent_wait_seconds)
+        if stats.completed_count + stats.active_count > 0:
+            stats.average_wait_seconds = stats.total_wait_seconds / (stats.completed_count + stats.active_count)
+        if started_count > 0:
+            stats.p99_wait_seconds = recent_wait_seconds[min(started_count - 1, math.ceil(started_count * 0.99) - 1)]
+        return stats
+
+    def shutdown(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,8 @@
+from app.core.config import app_config
+from app.utils.blocking_executor.base_class import BlockingCallExecutor
+
+# Singleton executor of the blocking service calls made by the async route handlers of this process
+route_blocking_executor = BlockingCallExecutor(
+    name="route_blocking_call",
+    max_workers=app_config.route_blocking_executor_max_workers,
+)
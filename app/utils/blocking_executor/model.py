@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class BlockingExecutorStats(BaseModel):
+    """
+    Queue-depth and wait-time metrics of a BlockingCallExecutor.
+    """
+    max_workers: int = 0
+    # Calls submitted but not started yet, waiting for a free worker
+    queue_depth: int = 0
+    active_count: int = 0
+    completed_count: int = 0
+    failed_count: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    average_wait_seconds: float = 0.0
+    # Over the most recent calls
+    p99_wait_seconds: float = 0.0
@@ -0,0 +1,73 @@
+from typing import Any, Optional
+
+import httpx
+
+from app.core.log.logger import Logger
+
+
+class AsyncHttpClient:
+    """
+    Async http client sharing one httpx.AsyncClient (and its keep-alive pool) across callers.
+    The httpx client is created on first use so it binds to the running event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout_seconds: float = 30,
+    ) -> None:
+        self.base_url = base_url
+        self.__logger = Logger(name=self.__class__.__name__)
+        self.__name = name
+        self.__limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.__timeout = httpx.Timeout(timeout_seconds)
+        self.__client: Optional[httpx.AsyncClient] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        if self.__client is None or self.__client.is_closed:
+            self.__client = httpx.AsyncClient(limits=self.__limits, timeout=self.__timeout)
+        return self.__client
+
+    async def get(
+        self,
+        endpoint: str = "",
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        **kwargs: dict[str, Any],
+    ) -> dict:
+        """
+        Perform a GET request using the shared async client.
+        """
+        try:
+            response = await self.get_client().get(
+                f"{self.base_url}{endpoint}",
+                params=self.__drop_none_params(params),
+                headers=headers,
+                **kwargs,
+            )
+            response.raise_for_status()  # Raise an exception for 4xx/5xx responses if any
+            return response.json()
+        except httpx.HTTPError as e:
+            res_body_text = f"{self.__name} http request failed: {e!s}"
+            self.__logger.exception(res_body_text)
+            raise
+
+    async def aclose(self) -> None:
+        """
+        Close the shared async client, call on application shutdown.
+        """
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+
+    def __drop_none_params(self, params: Optional[dict]) -> Optional[dict]:
+        # requests silently skips None params, httpx would send them as empty values
+        if params is None:
+            return None
+        return {key: value for key, value in params.items() if value is not None}
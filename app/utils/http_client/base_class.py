@@ -1,33 +1,70 @@
+import threading
 from contextlib import contextmanager
 from typing import Any, Generator, Optional
 
 import requests
 from requests import RequestException, Session
 from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.log.logger import Logger
+from app.utils.http_client.model import HttpConnectionStats
 
 
 class HttpClient:
-    def __init__(self, name: str, base_url: str) -> None:
+    """
+    Long-lived http client, keep-alive connections are pooled for the lifetime of the client.
+    Each thread gets its own requests.Session (sessions are not thread-safe), all of them
+    mounted on one shared HTTPAdapter whose urllib3 connection pool is thread-safe.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+    ) -> None:
         self.base_url = base_url
-        self.session = requests.Session()
         self.__logger = Logger(name=self.__class__.__name__)
         self.__name = name
+        self.__adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                # 429 is left to the caller, its retries have to go through the caller's rate limiter
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            ),
+        )
+        self.__thread_local = threading.local()
+        self.__sessions: list[Session] = []
+        self.__sessions_lock = threading.Lock()
+
+    def __get_thread_session(self) -> Session:
+        session = getattr(self.__thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self.__adapter)
+            session.mount("http://", self.__adapter)
+            self.__thread_local.session = session
+            with self.__sessions_lock:
+                self.__sessions.append(session)
+        return session
 
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
         """
-        Context manager to provide a session and ensure proper cleanup.
+        Context manager to provide the pooled session of the calling thread.
+        The session is kept open so its connections are reused by the next call.
         """
         try:
-            # Create an HTTPAdapter object and configure connection pooling and retries
-            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=5, max_retries=3)
-
-            # Mount the HTTPAdpater object to the session
-            self.session.mount("https://", adapter)
-            self.session.mount("http://", adapter)
-            yield self.session
+            yield self.__get_thread_session()
         except ConnectionError as e:
             error_message = f"Hades kb service client error: {e!s}"
             self.__logger.exception(error_message)
@@ -35,8 +72,33 @@ class HttpClient:
             res_body_text = f"http request failed: {e!s}"
             self.__logger.exception(res_body_text)
             raise RequestException(res_body_text) from e
-        finally:
-            self.session.close()
+
+    def get_connection_stats(self) -> HttpConnectionStats:
+        """
+        Requests sent and connections opened by the pools currently held by the adapter.
+        """
+        stats = HttpConnectionStats()
+        pools = self.__adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.requests_sent += pool.num_requests
+            stats.connections_opened += pool.num_connections
+
+        stats.connections_reused = max(stats.requests_sent - stats.connections_opened, 0)
+        return stats
+
+    def close(self) -> None:
+        """
+        Close every session and the shared connection pool, call on application shutdown.
+        """
+        with self.__sessions_lock:
+            for session in self.__sessions:
+                session.close()
+            self.__sessions.clear()
+        self.__thread_local = threading.local()
+        self.__adapter.close()
 
     def get(
         self,
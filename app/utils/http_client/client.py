@@ -1,8 +1,25 @@
 from app.core.config import app_config
+from app.utils.http_client.async_base_class import AsyncHttpClient
 from app.utils.http_client.base_class import HttpClient   
 
 # Base Url
 ether_scan_url = app_config.etherscan_base_url
 
 # Singleton http client
-ether_scan_client = HttpClient(name="ether_scan_api", base_url=ether_scan_url)
+ether_scan_client = HttpClient(
+    name="ether_scan_api",
+    base_url=ether_scan_url,
+    pool_connections=app_config.http_client_pool_connections,
+    pool_maxsize=app_config.http_client_pool_maxsize,
+    max_retries=app_config.http_client_max_retries,
+    backoff_factor=app_config.http_client_backoff_factor,
+)
+
+# Singleton async http client
+async_ether_scan_client = AsyncHttpClient(
+    name="async_ether_scan_api",
+    base_url=ether_scan_url,
+    max_connections=app_config.http_client_pool_maxsize,
+    max_keepalive_connections=app_config.http_client_pool_maxsize,
+    timeout_seconds=app_config.http_client_timeout_seconds,
+)
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class HttpConnectionStats(BaseModel):
+    """
+    Connection pool counters of an HttpClient.
+    connections_reused close to requests_sent means keep-alive connections are being reused.
+    """
+    requests_sent: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+from app.utils.rate_limiter.model import RateLimiterStats
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket shared by every caller of a rate limited api.
+
+    Each call reserves a token; once the bucket is empty the reservation goes into debt and the
+    caller sleeps until its token has been refilled. Reservations are handed out in arrival order,
+    so bursts are queued and smoothed to rate_per_second instead of being rejected by the api.
+    A rate_per_second of 0 or below disables limiting.
+    """
+
+    def __init__(self, name: str, rate_per_second: float, burst: int = 1) -> None:
+        self.name = name
+        self.__rate_per_second = rate_per_second
+        self.__burst = max(burst, 1)
+        self.__tokens = float(self.__burst)
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+        self.__stats = RateLimiterStats()
+
+    def __reserve(self) -> float:
+        """
+        Take one token and return how many seconds the caller must wait for it.
+        """
+        if self.__rate_per_second <= 0:
+            return 0.0
+
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                float(self.__burst),
+                self.__tokens + (now - self.__updated_at) * self.__rate_per_second,
+            )
+            self.__updated_at = now
+            self.__tokens -= 1
+
+            wait_seconds = max(-self.__tokens / self.__rate_per_second, 0.0)
+
+            self.__stats.acquired_count += 1
+            if wait_seconds > 0:
+                self.__stats.waited_count += 1
+                self.__stats.total_wait_seconds += wait_seconds
+                self.__stats.max_wait_seconds = max(self.__stats.max_wait_seconds, wait_seconds)
+            return wait_seconds
+
+    def acquire(self) -> float:
+        """
+        Block until a call is allowed, returns the seconds waited.
+        """
+        wait_seconds = self.__reserve()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    async def acquire_async(self) -> float:
+        """
+        Same as acquire, without blocking the event loop.
+        """
+        wait_seconds = self.__reserve()
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
+
+    def get_stats(self) -> RateLimiterStats:
+        with self.__lock:
+            stats = self.__stats.model_copy()
+
+        if stats.acquired_count > 0:
+            stats.average_wait_seconds = stats.total_wait_seconds / stats.acquired_count
+        return stats
@@ -0,0 +1,9 @@
+from app.core.config import app_config
+from app.utils.rate_limiter.base_class import TokenBucketRateLimiter
+
+# Singleton rate limiter, shared by the sync and async etherscan clients of this process
+etherscan_rate_limiter = TokenBucketRateLimiter(
+    name="etherscan",
+    rate_per_second=app_config.etherscan_rate_limit_calls_per_second,
+    burst=app_config.etherscan_rate_limit_burst,
+)
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class RateLimiterStats(BaseModel):
+    """
+    Wait-time metrics of a TokenBucketRateLimiter.
+    """
+    acquired_count: int = 0
+    waited_count: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    average_wait_seconds: float = 0.0
@@ -0,0 +1,13 @@
+-- +migrate Up
+CREATE TABLE eth_usdt_klines (
+    open_time BIGINT PRIMARY KEY,                -- 1m candle open time in milliseconds
+    open NUMERIC NOT NULL,
+    high NUMERIC NOT NULL,
+    low NUMERIC NOT NULL,
+    close NUMERIC NOT NULL,
+    volume NUMERIC NOT NULL,
+    close_time BIGINT NOT NULL                   -- 1m candle close time in milliseconds
+);
+
+-- +migrate Down
+DROP TABLE IF EXISTS eth_usdt_klines;
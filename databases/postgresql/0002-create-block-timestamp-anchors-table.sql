@@ -0,0 +1,16 @@
+-- +migrate Up
+CREATE TABLE block_timestamp_anchors (
+    block_number BIGINT PRIMARY KEY,
+    ts_timestamp BIGINT NOT NULL                 -- block timestamp in seconds
+);
+
+CREATE INDEX ix_block_timestamp_anchors_ts_timestamp ON block_timestamp_anchors (ts_timestamp);
+
+-- Seed the index with every block we already hold a transaction for
+INSERT INTO block_timestamp_anchors (block_number, ts_timestamp)
+SELECT DISTINCT block_number, ts_timestamp
+FROM transactions_to_from_pools
+ON CONFLICT (block_number) DO NOTHING;
+
+-- +migrate Down
+DROP TABLE IF EXISTS block_timestamp_anchors;
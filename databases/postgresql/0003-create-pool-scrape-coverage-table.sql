@@ -0,0 +1,11 @@
+-- +migrate Up
+CREATE TABLE pool_scrape_coverage (
+    pool_id INTEGER NOT NULL REFERENCES token_pair_pools(pool_id) ON DELETE CASCADE,
+    start_block BIGINT NOT NULL,                 -- inclusive
+    end_block BIGINT NOT NULL,                   -- inclusive
+    PRIMARY KEY (pool_id, start_block),
+    CHECK (start_block <= end_block)
+);
+
+-- +migrate Down
+DROP TABLE IF EXISTS pool_scrape_coverage;
@@ -0,0 +1,9 @@
+-- +migrate Up
+-- Serve the per pool watermark (latest / earliest transaction) and block range reads
+-- from an index scan instead of sorting the pool's whole history
+CREATE INDEX IF NOT EXISTS idx_pool_id_block_number ON transactions_to_from_pools (pool_id, block_number DESC);
+CREATE INDEX IF NOT EXISTS idx_pool_id_ts_timestamp ON transactions_to_from_pools (pool_id, ts_timestamp DESC);
+
+-- +migrate Down
+DROP INDEX IF EXISTS idx_pool_id_ts_timestamp;
+DROP INDEX IF EXISTS idx_pool_id_block_number;
@@ -0,0 +1,18 @@
+-- +migrate Up
+CREATE TABLE pool_scrape_state (
+    pool_id INTEGER PRIMARY KEY REFERENCES token_pair_pools(pool_id) ON DELETE CASCADE,
+    last_block BIGINT NOT NULL,                  -- block of the last stored transaction
+    last_tx_index BIGINT NOT NULL,               -- transaction index of the last stored transaction within last_block
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Seed the watermark of pools already being scraped from their latest stored transaction
+INSERT INTO pool_scrape_state (pool_id, last_block, last_tx_index)
+SELECT DISTINCT ON (pool_id) pool_id, block_number, transaction_index::BIGINT
+FROM transactions_to_from_pools
+WHERE pool_id IS NOT NULL
+ORDER BY pool_id, block_number DESC, transaction_index::BIGINT DESC
+ON CONFLICT (pool_id) DO NOTHING;
+
+-- +migrate Down
+DROP TABLE IF EXISTS pool_scrape_state;
@@ -0,0 +1,25 @@
+-- +migrate Up
+-- Run scripts/backfill_numeric_columns.py first on large tables, it rewrites the values
+-- these casts would reject in small batches so this single table rewrite can not fail half way
+ALTER TABLE transactions_to_from_pools
+    ALTER COLUMN token_value TYPE NUMERIC(78, 0) USING NULLIF(TRIM(token_value), '')::NUMERIC(78, 0),
+    ALTER COLUMN token_decimal TYPE INTEGER USING NULLIF(TRIM(token_decimal), '')::INTEGER,
+    ALTER COLUMN transaction_index TYPE BIGINT USING NULLIF(TRIM(transaction_index), '')::BIGINT,
+    ALTER COLUMN gas_limit TYPE BIGINT USING NULLIF(TRIM(gas_limit), '')::BIGINT,
+    ALTER COLUMN gas_price TYPE NUMERIC(78, 0) USING NULLIF(TRIM(gas_price), '')::NUMERIC(78, 0),   -- wei, uint256
+    ALTER COLUMN gas_used TYPE BIGINT USING NULLIF(TRIM(gas_used), '')::BIGINT,
+    ALTER COLUMN cumulative_gas_used TYPE BIGINT USING NULLIF(TRIM(cumulative_gas_used), '')::BIGINT,
+    ALTER COLUMN confirmations TYPE BIGINT USING NULLIF(TRIM(confirmations), '')::BIGINT,
+    ALTER COLUMN transaction_fee_usdt TYPE NUMERIC USING NULLIF(TRIM(transaction_fee_usdt), '')::NUMERIC;
+
+-- +migrate Down
+ALTER TABLE transactions_to_from_pools
+    ALTER COLUMN token_value TYPE VARCHAR(255) USING token_value::TEXT,
+    ALTER COLUMN token_decimal TYPE VARCHAR(255) USING token_decimal::TEXT,
+    ALTER COLUMN transaction_index TYPE VARCHAR(255) USING transaction_index::TEXT,
+    ALTER COLUMN gas_limit TYPE VARCHAR(255) USING gas_limit::TEXT,
+    ALTER COLUMN gas_price TYPE VARCHAR(255) USING gas_price::TEXT,
+    ALTER COLUMN gas_used TYPE VARCHAR(255) USING gas_used::TEXT,
+    ALTER COLUMN cumulative_gas_used TYPE VARCHAR(255) USING cumulative_gas_used::TEXT,
+    ALTER COLUMN confirmations TYPE VARCHAR(255) USING confirmations::TEXT,
+    ALTER COLUMN transaction_fee_usdt TYPE VARCHAR(255) USING transaction_fee_usdt::TEXT;
@@ -0,0 +1,142 @@
+-- +migrate Up
+-- Rebuild transactions_to_from_pools as a table partitioned by month of ts_timestamp (seconds, UTC).
+-- Every unique constraint of a partitioned table has to hold the partition key, tx_hash uniqueness
+-- becomes (tx_hash, ts_timestamp) which is equivalent since a transaction has a single block timestamp.
+ALTER TABLE transactions_to_from_pools RENAME TO transactions_to_from_pools_legacy;
+ALTER SEQUENCE transactions_to_from_pools_transaction_id_seq OWNED BY NONE;
+
+CREATE TABLE transactions_to_from_pools (
+    transaction_id INTEGER NOT NULL DEFAULT nextval('transactions_to_from_pools_transaction_id_seq'),
+    block_number BIGINT NOT NULL,
+    ts_timestamp BIGINT NOT NULL,                -- partition key
+    tx_hash VARCHAR(66) NOT NULL,
+    from_address VARCHAR(42) NOT NULL,
+    to_address VARCHAR(42) NOT NULL,
+    contract_address VARCHAR(42) NOT NULL,
+    token_value NUMERIC(78, 0) NOT NULL,
+    token_name VARCHAR(50),
+    token_symbol VARCHAR(20),
+    token_decimal INTEGER,
+    transaction_index BIGINT NOT NULL,
+    gas_limit BIGINT NOT NULL,
+    gas_price NUMERIC(78, 0) NOT NULL,
+    gas_used BIGINT NOT NULL,
+    cumulative_gas_used BIGINT,
+    confirmations BIGINT,
+    transaction_fee_usdt NUMERIC,
+    pool_id INTEGER REFERENCES token_pair_pools(pool_id) ON DELETE SET NULL
+) PARTITION BY RANGE (ts_timestamp);
+
+ALTER SEQUENCE transactions_to_from_pools_transaction_id_seq OWNED BY transactions_to_from_pools.transaction_id;
+
+-- Catches rows outside every monthly partition. Backfills create the partitions of their months first and
+-- the partition maintenance job drains what still lands here, see 0013.
+CREATE TABLE transactions_to_from_pools_default PARTITION OF transactions_to_from_pools DEFAULT;
+
+CREATE OR REPLACE FUNCTION create_transactions_to_from_pools_partition(month_start DATE) RETURNS TEXT AS $$
+DECLARE
+    partition_start DATE := date_trunc('month', month_start)::DATE;
+    partition_name TEXT := 'transactions_to_from_pools_' || to_char(partition_start, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF transactions_to_from_pools FOR VALUES FROM (%s) TO (%s)',
+        partition_name,
+        extract(epoch FROM partition_start::TIMESTAMP AT TIME ZONE 'UTC')::BIGINT,
+        extract(epoch FROM (partition_start + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC')::BIGINT
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detached partitions stay as plain tables, ready to be dumped to cold storage and dropped
+CREATE OR REPLACE FUNCTION detach_transactions_to_from_pools_partitions(before_month DATE) RETURNS SETOF TEXT AS $$
+DECLARE
+    partition_name TEXT;
+BEGIN
+    FOR partition_name IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'transactions_to_from_pools'
+            AND child.relname ~ '^transactions_to_from_pools_[0-9]{4}_[0-9]{2}$'
+            AND to_date(right(child.relname, 7), 'YYYY_MM') < date_trunc('month', before_month)
+        ORDER BY child.relname
+    LOOP
+        EXECUTE format('ALTER TABLE transactions_to_from_pools DETACH PARTITION %I', partition_name);
+        RETURN NEXT partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Monthly partitions for the stored history up to 3 months ahead
+SELECT create_transactions_to_from_pools_partition(month_start::DATE)
+FROM generate_series(
+    date_trunc('month', COALESCE(
+        (SELECT to_timestamp(MIN(ts_timestamp)) AT TIME ZONE 'UTC' FROM transactions_to_from_pools_legacy),
+        now() AT TIME ZONE 'UTC'
+    )),
+    date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '3 month',
+    INTERVAL '1 month'
+) AS month_start;
+
+INSERT INTO transactions_to_from_pools (
+    transaction_id, block_number, ts_timestamp, tx_hash, from_address, to_address, contract_address,
+    token_value, token_name, token_symbol, token_decimal, transaction_index, gas_limit, gas_price,
+    gas_used, cumulative_gas_used, confirmations, transaction_fee_usdt, pool_id
+)
+SELECT
+    transaction_id, block_number, ts_timestamp, tx_hash, from_address, to_address, contract_address,
+    token_value, token_name, token_symbol, token_decimal, transaction_index, gas_limit, gas_price,
+    gas_used, cumulative_gas_used, confirmations, transaction_fee_usdt, pool_id
+FROM transactions_to_from_pools_legacy;
+
+DROP TABLE transactions_to_from_pools_legacy;
+
+-- Built after the copy, the unique index leads with tx_hash and replaces idx_tx_hash
+ALTER TABLE transactions_to_from_pools ADD PRIMARY KEY (transaction_id, ts_timestamp);
+ALTER TABLE transactions_to_from_pools ADD CONSTRAINT transactions_to_from_pools_tx_hash_ts_timestamp_key UNIQUE (tx_hash, ts_timestamp);
+CREATE INDEX idx_from_address ON transactions_to_from_pools(from_address);
+CREATE INDEX idx_to_address ON transactions_to_from_pools(to_address);
+CREATE INDEX idx_pool_id_block_number ON transactions_to_from_pools (pool_id, block_number DESC);
+CREATE INDEX idx_pool_id_ts_timestamp ON transactions_to_from_pools (pool_id, ts_timestamp DESC);
+
+-- +migrate Down
+ALTER TABLE transactions_to_from_pools RENAME TO transactions_to_from_pools_partitioned;
+ALTER SEQUENCE transactions_to_from_pools_transaction_id_seq OWNED BY NONE;
+
+CREATE TABLE transactions_to_from_pools (
+    transaction_id INTEGER PRIMARY KEY DEFAULT nextval('transactions_to_from_pools_transaction_id_seq'),
+    block_number BIGINT NOT NULL,
+    ts_timestamp BIGINT NOT NULL,
+    tx_hash VARCHAR(66) UNIQUE NOT NULL,
+    from_address VARCHAR(42) NOT NULL,
+    to_address VARCHAR(42) NOT NULL,
+    contract_address VARCHAR(42) NOT NULL,
+    token_value NUMERIC(78, 0) NOT NULL,
+    token_name VARCHAR(50),
+    token_symbol VARCHAR(20),
+    token_decimal INTEGER,
+    transaction_index BIGINT NOT NULL,
+    gas_limit BIGINT NOT NULL,
+    gas_price NUMERIC(78, 0) NOT NULL,
+    gas_used BIGINT NOT NULL,
+    cumulative_gas_used BIGINT,
+    confirmations BIGINT,
+    transaction_fee_usdt NUMERIC,
+    pool_id INTEGER REFERENCES token_pair_pools(pool_id) ON DELETE SET NULL
+);
+
+ALTER SEQUENCE transactions_to_from_pools_transaction_id_seq OWNED BY transactions_to_from_pools.transaction_id;
+
+INSERT INTO transactions_to_from_pools SELECT * FROM transactions_to_from_pools_partitioned;
+
+DROP TABLE transactions_to_from_pools_partitioned;
+DROP FUNCTION IF EXISTS detach_transactions_to_from_pools_partitions(DATE);
+DROP FUNCTION IF EXISTS create_transactions_to_from_pools_partition(DATE);
+
+CREATE INDEX idx_tx_hash ON transactions_to_from_pools(tx_hash);
+CREATE INDEX idx_from_address ON transactions_to_from_pools(from_address);
+CREATE INDEX idx_to_address ON transactions_to_from_pools(to_address);
+CREATE INDEX idx_pool_id_block_number ON transactions_to_from_pools (pool_id, block_number DESC);
+CREATE INDEX idx_pool_id_ts_timestamp ON transactions_to_from_pools (pool_id, ts_timestamp DESC);
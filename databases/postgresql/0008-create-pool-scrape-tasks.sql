@@ -0,0 +1,13 @@
+-- +migrate Up
+CREATE TABLE pool_scrape_tasks (
+    pool_id INTEGER PRIMARY KEY REFERENCES token_pair_pools(pool_id) ON DELETE CASCADE,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,     -- desired state, set by start-task / stop-task on any worker
+    owner_id VARCHAR(255),                       -- worker process holding the scrape lease
+    lease_expires_at TIMESTAMPTZ,                -- renewed by the owner heartbeat, free to claim once past
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_pool_scrape_tasks_owner_id ON pool_scrape_tasks (owner_id);
+
+-- +migrate Down
+DROP TABLE IF EXISTS pool_scrape_tasks;
@@ -0,0 +1,10 @@
+-- +migrate Up
+-- Keyset pagination walks a pool in (block_number, transaction_index) order, every page is a range scan
+-- of this index from the cursor. The latest / earliest watermark lookups read the same index backward /
+-- forward, so it replaces idx_pool_id_block_number.
+CREATE INDEX IF NOT EXISTS idx_pool_id_block_number_transaction_index ON transactions_to_from_pools (pool_id, block_number, transaction_index);
+DROP INDEX IF EXISTS idx_pool_id_block_number;
+
+-- +migrate Down
+CREATE INDEX IF NOT EXISTS idx_pool_id_block_number ON transactions_to_from_pools (pool_id, block_number DESC);
+DROP INDEX IF EXISTS idx_pool_id_block_number_transaction_index;
@@ -0,0 +1,56 @@
+-- +migrate Up
+-- Detaching a month also trims pool_scrape_coverage in the same transaction, blocks up to the last
+-- detached transaction of a pool are no longer stored and have to be read from etherscan again.
+-- Blocks of a pool past that transaction hold none of its transfers, their coverage stays valid.
+CREATE OR REPLACE FUNCTION detach_transactions_to_from_pools_partitions(before_month DATE) RETURNS SETOF TEXT AS $$
+DECLARE
+    partition_name TEXT;
+BEGIN
+    FOR partition_name IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'transactions_to_from_pools'
+            AND child.relname ~ '^transactions_to_from_pools_[0-9]{4}_[0-9]{2}$'
+            AND to_date(right(child.relname, 7), 'YYYY_MM') < date_trunc('month', before_month)
+        ORDER BY child.relname
+    LOOP
+        EXECUTE format('ALTER TABLE transactions_to_from_pools DETACH PARTITION %I', partition_name);
+        EXECUTE format(
+            'DELETE FROM pool_scrape_coverage coverage '
+            'USING (SELECT pool_id, MAX(block_number) AS end_block FROM %I GROUP BY pool_id) detached '
+            'WHERE coverage.pool_id = detached.pool_id AND coverage.end_block <= detached.end_block',
+            partition_name
+        );
+        EXECUTE format(
+            'UPDATE pool_scrape_coverage coverage SET start_block = detached.end_block + 1 '
+            'FROM (SELECT pool_id, MAX(block_number) AS end_block FROM %I GROUP BY pool_id) detached '
+            'WHERE coverage.pool_id = detached.pool_id AND coverage.start_block <= detached.end_block',
+            partition_name
+        );
+        RETURN NEXT partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- +migrate Down
+CREATE OR REPLACE FUNCTION detach_transactions_to_from_pools_partitions(before_month DATE) RETURNS SETOF TEXT AS $$
+DECLARE
+    partition_name TEXT;
+BEGIN
+    FOR partition_name IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'transactions_to_from_pools'
+            AND child.relname ~ '^transactions_to_from_pools_[0-9]{4}_[0-9]{2}$'
+            AND to_date(right(child.relname, 7), 'YYYY_MM') < date_trunc('month', before_month)
+        ORDER BY child.relname
+    LOOP
+        EXECUTE format('ALTER TABLE transactions_to_from_pools DETACH PARTITION %I', partition_name);
+        RETURN NEXT partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
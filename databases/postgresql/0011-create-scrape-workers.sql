@@ -0,0 +1,10 @@
+-- +migrate Up
+-- Live scrapping workers, including the ones holding no lease yet, so the fair share of every worker
+-- counts them and a worker holding more than its share hands the excess over.
+CREATE TABLE scrape_workers (
+    owner_id VARCHAR(255) PRIMARY KEY,           -- worker process, same id as pool_scrape_tasks.owner_id
+    expires_at TIMESTAMPTZ NOT NULL              -- renewed by the worker heartbeat, live until past
+);
+
+-- +migrate Down
+DROP TABLE IF EXISTS scrape_workers;
@@ -0,0 +1,15 @@
+-- +migrate Up
+-- A multi-hop swap moves tokens through several registered pools in one transaction, every pool keeps
+-- its own row of the tx_hash. The unique key still leads with tx_hash so lookups by hash keep using it.
+ALTER TABLE transactions_to_from_pools ADD CONSTRAINT transactions_to_from_pools_tx_hash_pool_id_ts_timestamp_key UNIQUE (tx_hash, pool_id, ts_timestamp);
+ALTER TABLE transactions_to_from_pools DROP CONSTRAINT transactions_to_from_pools_tx_hash_ts_timestamp_key;
+
+-- +migrate Down
+-- Keeps the first stored row of every tx_hash, the global key allows one row per transaction
+DELETE FROM transactions_to_from_pools duplicate
+USING transactions_to_from_pools kept
+WHERE duplicate.tx_hash = kept.tx_hash
+    AND duplicate.ts_timestamp = kept.ts_timestamp
+    AND duplicate.transaction_id > kept.transaction_id;
+ALTER TABLE transactions_to_from_pools ADD CONSTRAINT transactions_to_from_pools_tx_hash_ts_timestamp_key UNIQUE (tx_hash, ts_timestamp);
+ALTER TABLE transactions_to_from_pools DROP CONSTRAINT transactions_to_from_pools_tx_hash_pool_id_ts_timestamp_key;
@@ -0,0 +1,56 @@
+-- +migrate Up
+-- A month can not get its partition while the default partition holds rows of it. Draining detaches the
+-- default partition, creates the monthly partitions of every row it holds, moves the rows back through
+-- the parent and attaches it again empty. Returns the moved row count, 0 without touching the table
+-- when the default partition is already empty.
+CREATE OR REPLACE FUNCTION drain_transactions_to_from_pools_default_partition() RETURNS BIGINT AS $$
+DECLARE
+    moved_count BIGINT;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM transactions_to_from_pools_default) THEN
+        RETURN 0;
+    END IF;
+
+    ALTER TABLE transactions_to_from_pools DETACH PARTITION transactions_to_from_pools_default;
+    PERFORM create_transactions_to_from_pools_partition(month_start)
+    FROM (
+        SELECT DISTINCT date_trunc('month', to_timestamp(ts_timestamp) AT TIME ZONE 'UTC')::DATE AS month_start
+        FROM transactions_to_from_pools_default
+    ) months;
+    INSERT INTO transactions_to_from_pools SELECT * FROM transactions_to_from_pools_default;
+    GET DIAGNOSTICS moved_count = ROW_COUNT;
+    TRUNCATE transactions_to_from_pools_default;
+    ALTER TABLE transactions_to_from_pools ATTACH PARTITION transactions_to_from_pools_default DEFAULT;
+    RETURN moved_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Monthly partitions of [start_timestamp, end_timestamp] (seconds, UTC), for writes of historical months.
+-- Only missing months are created, an existing month costs a catalog lookup and no lock on the parent.
+CREATE OR REPLACE FUNCTION create_transactions_to_from_pools_partitions_between(
+    start_timestamp BIGINT,
+    end_timestamp BIGINT
+) RETURNS SETOF TEXT AS $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', to_timestamp(start_timestamp) AT TIME ZONE 'UTC'),
+            date_trunc('month', to_timestamp(end_timestamp) AT TIME ZONE 'UTC'),
+            INTERVAL '1 month'
+        )::DATE
+    LOOP
+        IF to_regclass('transactions_to_from_pools_' || to_char(month_start, 'YYYY_MM')) IS NULL THEN
+            PERFORM drain_transactions_to_from_pools_default_partition();
+            RETURN NEXT create_transactions_to_from_pools_partition(month_start);
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT drain_transactions_to_from_pools_default_partition();
+
+-- +migrate Down
+DROP FUNCTION IF EXISTS create_transactions_to_from_pools_partitions_between(BIGINT, BIGINT);
+DROP FUNCTION IF EXISTS drain_transactions_to_from_pools_default_partition();
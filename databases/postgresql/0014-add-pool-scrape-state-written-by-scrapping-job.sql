@@ -0,0 +1,8 @@
+-- +migrate Up
+-- Set once a scrapping job batch wrote the watermark, every transfer of last_block up to last_tx_index is
+-- then stored and the next batch may record last_block as covered. A watermark seeded from the newest
+-- transaction of a pool (or from its latest stored row) only vouches for that one transfer.
+ALTER TABLE pool_scrape_state ADD COLUMN written_by_scrapping_job BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- +migrate Down
+ALTER TABLE pool_scrape_state DROP COLUMN IF EXISTS written_by_scrapping_job;
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Prepare transactions_to_from_pools for 0006-convert-transaction-amount-columns-to-numeric.sql.
+
+The migration converts the VARCHAR amount columns in one table rewrite, a single value the cast
+rejects aborts it after the whole table was read. This script rewrites such values first, in
+transaction_id batches each committed on its own so no long lock is held:
+    NOT NULL columns -> '0', nullable columns -> NULL
+
+    python -m scripts.backfill_numeric_columns --dry-run
+    python -m scripts.backfill_numeric_columns --batch-size 50000
+"""
+
+import argparse
+import sys
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+TABLE_NAME = "transactions_to_from_pools"
+INTEGER_PATTERN = r"^\s*-?[0-9]+\s*$"
+DECIMAL_PATTERN = r"^\s*-?[0-9]+(\.[0-9]+)?\s*$"
+
+# column -> (pattern accepted by the target type cast, replacement of rejected values)
+NUMERIC_COLUMNS: Dict[str, Tuple[str, Optional[str]]] = {
+    "token_value": (INTEGER_PATTERN, "0"),
+    "token_decimal": (INTEGER_PATTERN, None),
+    "transaction_index": (INTEGER_PATTERN, "0"),
+    "gas_limit": (INTEGER_PATTERN, "0"),
+    "gas_price": (INTEGER_PATTERN, "0"),
+    "gas_used": (INTEGER_PATTERN, "0"),
+    "cumulative_gas_used": (INTEGER_PATTERN, None),
+    "confirmations": (INTEGER_PATTERN, None),
+    "transaction_fee_usdt": (DECIMAL_PATTERN, None),
+}
+
+
+def get_transaction_id_range(engine: Engine) -> Tuple[int, int]:
+    with engine.connect() as connection:
+        (min_id, max_id) = connection.execute(
+            text(f"SELECT COALESCE(MIN(transaction_id), 0), COALESCE(MAX(transaction_id), 0) FROM {TABLE_NAME}")
+        ).one()
+    return int(min_id), int(max_id)
+
+
+def is_already_converted(engine: Engine) -> bool:
+    with engine.connect() as connection:
+        data_type = connection.execute(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = :table_name AND column_name = 'gas_price'"
+            ),
+            {"table_name": TABLE_NAME},
+        ).scalar()
+    return data_type != "character varying"
+
+
+def backfill_column(engine: Engine, column: str, batch_size: int, dry_run: bool) -> int:
+    (pattern, replacement) = NUMERIC_COLUMNS[column]
+    (min_id, max_id) = get_transaction_id_range(engine)
+    rejected_filter = f"{column} IS NOT NULL AND {column} !~ :pattern"
+
+    rewritten_count = 0
+    for batch_start_id in range(min_id, max_id + 1, batch_size):
+        batch_params = {
+            "pattern": pattern,
+            "replacement": replacement,
+            "batch_start_id": batch_start_id,
+            "batch_end_id": batch_start_id + batch_size,
+        }
+        batch_filter = "transaction_id >= :batch_start_id AND transaction_id < :batch_end_id"
+        with engine.begin() as connection:
+            if dry_run:
+                rewritten_count += connection.execute(
+                    text(f"SELECT COUNT(*) FROM {TABLE_NAME} WHERE {batch_filter} AND {rejected_filter}"),
+                    batch_params,
+                ).scalar()
+            else:
+                rewritten_count += connection.execute(
+                    text(f"UPDATE {TABLE_NAME} SET {column} = :replacement WHERE {batch_filter} AND {rejected_filter}"),
+                    batch_params,
+                ).rowcount
+
+    return rewritten_count
+
+
+def backfill(engine: Engine, batch_size: int, dry_run: bool) -> None:
+    if is_already_converted(engine):
+        print(f"{TABLE_NAME} amount columns are already numeric, nothing to do.", file=sys.stderr)
+        return
+
+    for column in NUMERIC_COLUMNS:
+        rewritten_count = backfill_column(engine, column, batch_size, dry_run)
+        action = "would be rewritten" if dry_run else "rewritten"
+        print(f"{column}: {rewritten_count} values {action}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rewrite amount values the numeric migration would reject.")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+
+    # Imported late, the connection module connects to the configured database on import
+    from app.storage.connection import engine
+
+    print("~~~ Start to backfill numeric columns ~~~", file=sys.stderr)
+    backfill(engine, args.batch_size, args.dry_run)
+    print("~~~ End to backfill numeric columns ~~~", file=sys.stderr)
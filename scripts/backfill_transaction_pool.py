@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Backfill the transfers of a registered pool over a block range into transactions_to_from_pools.
+
+Runs ScrapperService.backfill_transaction_pool, one etherscan page priced and bulk inserted at a time,
+over chunks of --chunk-blocks blocks. Every finished chunk is recorded in pool_scrape_coverage, so an
+interrupted backfill keeps what it stored and time-range reads serve those blocks from Postgres.
+Transfers already stored are skipped by the insert, re-running a range is safe.
+
+    python -m scripts.backfill_transaction_pool --pool-name usdc_weth --start-block 12376729 --end-block 12500000
+"""
+
+import argparse
+import sys
+
+from app.core.scrapper_service.client import ScrapperService
+
+
+def backfill(
+        scrapper_service: ScrapperService,
+        pool_name: str,
+        start_block: int,
+        end_block: int,
+        chunk_blocks: int,
+) -> int:
+    pool_data = scrapper_service.get_token_pool_pair_by_pool_name(pool_name)
+    if len(pool_data) == 0:
+        error_message = f"Pool {pool_name} is not registered"
+        raise ValueError(error_message)
+
+    inserted_count = 0
+    for (chunk_start_block, chunk_end_block) in scrapper_service.split_block_range(start_block, end_block, chunk_blocks):
+        chunk_inserted_count = scrapper_service.backfill_transaction_pool(
+            address=pool_data[0].contract_address,
+            pool_id=pool_data[0].pool_id,
+            start_block=chunk_start_block,
+            end_block=chunk_end_block,
+        )
+        inserted_count += chunk_inserted_count
+        print(f"blocks {chunk_start_block}-{chunk_end_block}: {chunk_inserted_count} rows inserted", file=sys.stderr)
+
+    return inserted_count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the transfers of a pool over a block range.")
+    parser.add_argument("--pool-name", required=True)
+    parser.add_argument("--start-block", type=int, required=True)
+    parser.add_argument("--end-block", type=int, required=True)
+    parser.add_argument("--chunk-blocks", type=int, default=10000)
+
+    args = parser.parse_args()
+    if args.start_block > args.end_block:
+        parser.error("--start-block must not be after --end-block")
+
+    # Imported late, the connection module connects to the configured database on import
+    from app.core.dependencies import build_scrapper_service
+
+    print("~~~ Start to backfill transaction pool ~~~", file=sys.stderr)
+    inserted_count = backfill(
+        build_scrapper_service(), args.pool_name, args.start_block, args.end_block, args.chunk_blocks
+    )
+    print(f"~~~ End to backfill transaction pool, {inserted_count} rows inserted ~~~", file=sys.stderr)
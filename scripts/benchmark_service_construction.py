@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of getting a ScrapperService.
+
+    before: build_scrapper_service(), the whole graph (Spot, Web3 provider, repositories, loggers) per request
+    after:  get_scrapper_service(), the application-lifetime ServiceContainer instance
+
+Building the graph never opens a database session, by default the connection module is replaced by a
+stub so the benchmark runs without Postgres. --with-database uses the configured database instead.
+
+    python -m scripts.benchmark_service_construction --iterations 2000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import types
+from typing import Callable
+
+
+def measure_microseconds(get_service: Callable[[], object], iterations: int) -> list[float]:
+    durations = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        get_service()
+        durations.append((time.perf_counter() - started_at) * 1_000_000)
+    return durations
+
+
+def install_stub_database_session() -> None:
+    """Stand in for app.storage.connection, which connects to the configured database on import."""
+    stub_connection = types.ModuleType("app.storage.connection")
+
+    def get_session() -> None:
+        error_message = "The benchmark stub database session can not be used"
+        raise RuntimeError(error_message)
+
+    stub_connection.get_session = get_session
+    sys.modules["app.storage.connection"] = stub_connection
+
+
+def print_durations(label: str, durations: list[float]) -> None:
+    ordered = sorted(durations)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<8} mean={statistics.fmean(ordered):10.1f}us "
+        f"p50={statistics.median(ordered):10.1f}us p99={p99:10.1f}us",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ScrapperService construction per request.")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--with-database", action="store_true")
+
+    args = parser.parse_args()
+    if not args.with_database:
+        install_stub_database_session()
+
+    # Imported late, the connection module connects to the configured database on import
+    from app.core.dependencies import build_scrapper_service, get_scrapper_service, service_container
+
+    service_container.start()
+    # Warm up imports and lazy module state of both paths
+    build_scrapper_service()
+    get_scrapper_service()
+
+    print(f"~~~ {args.iterations} iterations ~~~", file=sys.stderr)
+    print_durations("before", measure_microseconds(build_scrapper_service, args.iterations))
+    print_durations("after", measure_microseconds(get_scrapper_service, args.iterations))
+    service_container.shutdown()
@@ -14,6 +14,11 @@ code_dir = "."
 postgres_host = os.environ.get("POSTGRES_HOST", "localhost")
 all_dbs = {}
 
+# Months ahead of the current one whose transactions_to_from_pools partitions are pre-created
+partition_premake_months = int(os.environ.get("PARTITION_PREMAKE_MONTHS", "3"))
+# Months of transactions_to_from_pools partitions kept attached, 0 keeps every month
+partition_retention_months = int(os.environ.get("PARTITION_RETENTION_MONTHS", "0"))
+
 
 def need_migration(ci_file: str) -> bool:
     with Path(ci_file).open() as f:
@@ -70,7 +75,8 @@ def validate_sql_command(cmd: str) -> bool:
         "GRANT",
         "REVOKE",
     ]
-    cmd_upper = cmd.strip().upper()
+    # Migrations may open with -- comment lines explaining the change
+    cmd_upper = re.sub(r"\A(\s*--[^\n]*\n)*", "", cmd).strip().upper()
     return any(cmd_upper.startswith(keyword) for keyword in allowed_commands)
 
 
@@ -127,6 +133,34 @@ def create_and_grant_postgres(name: str) -> None:
     print(f"Create postgres {name}", file=sys.stderr)
 
 
+def maintain_postgres_partitions(db: Dict[str, Any]) -> None:
+    """
+    Create the upcoming monthly partitions of transactions_to_from_pools, so new rows never land
+    in the default partition, move rows that still landed there into their monthly partitions,
+    and detach the months past the retention for cold storage.
+    Backfills create the partitions of the historical months they write themselves.
+    Meant to run periodically (e.g. a daily cron), every step is idempotent.
+    """
+    run_postgres(
+        db["name"],
+        "SELECT drain_transactions_to_from_pools_default_partition();",
+    )
+    run_postgres(
+        db["name"],
+        "SELECT create_transactions_to_from_pools_partition(month_start::DATE) "
+        "FROM generate_series(date_trunc('month', now() AT TIME ZONE 'UTC'), "
+        f"date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '{partition_premake_months} month', "
+        "INTERVAL '1 month') AS month_start;",
+    )
+
+    if partition_retention_months > 0:
+        run_postgres(
+            db["name"],
+            "SELECT detach_transactions_to_from_pools_partitions("
+            f"(date_trunc('month', now() AT TIME ZONE 'UTC') - INTERVAL '{partition_retention_months} month')::DATE);",
+        )
+
+
 def migrate_postgres(db: Dict[str, Any], action: str) -> None:
     if action in ("init", "create"):
         create_and_grant_postgres(db["name"])
@@ -134,6 +168,9 @@ def migrate_postgres(db: Dict[str, Any], action: str) -> None:
     if action in ("init", "up", "down", "down-to-bottom", "status"):
         migrate_postgres_tables(db, action)
 
+    if action == "partition":
+        maintain_postgres_partitions(db)
+
 
 def init_service(service: str, max_len: int, action: str) -> None:
     os.chdir(str(Path(code_dir) / service))
@@ -183,6 +220,9 @@ if __name__ == "__main__":
     group.add_argument(
         "-test", "--test", action="store_const", const="test", dest="action"
     )
+    group.add_argument(
+        "-partition", "--partition", action="store_const", const="partition", dest="action"
+    )
 
     args = parser.parse_args()
 
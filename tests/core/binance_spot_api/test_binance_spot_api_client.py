@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+from app.core.binance_spot_api.cache import KlinePriceCache
+from app.core.binance_spot_api.client import BinanceSpotApiClient
+
+
+def get_mock_kline(open_time: int, close_price: str = "0.0015") -> list:
+    return [
+        open_time,          # Open time
+        "0.0010",           # Open
+        "0.0020",           # High
+        "0.0005",           # Low
+        close_price,        # Close
+        "1000",             # Volume
+        open_time + 59999,  # Close time
+        "1.5",              # Quote asset volume
+        100,                # Number of trades
+        "500",              # Taker buy base asset volume
+        "0.75",             # Taker buy quote asset volume
+        "0"                 # Ignore
+    ]
+
+
+def test_get_closed_price_by_timestamp_hits_cache_within_same_minute() -> None:
+    spot_client = MagicMock()
+    spot_client.klines = MagicMock(return_value=[get_mock_kline(1700000040000)])
+
+    client = BinanceSpotApiClient(
+        spot_client=spot_client,
+        price_cache=KlinePriceCache(max_size=10, ttl_seconds=60),
+    )
+
+    first = client.get_closed_price_by_timestamp("ethusdt", "1700000041000")
+    second = client.get_closed_price_by_timestamp("ethusdt", "1700000099000")
+
+    assert first == second
+    assert spot_client.klines.call_count == 1
+
+
+def test_get_closed_price_by_timestamp_without_cache_always_calls_binance() -> None:
+    spot_client = MagicMock()
+    spot_client.klines = MagicMock(return_value=[get_mock_kline(1700000040000)])
+
+    client = BinanceSpotApiClient(spot_client=spot_client)
+
+    client.get_closed_price_by_timestamp("ethusdt", "1700000041000")
+    client.get_closed_price_by_timestamp("ethusdt", "1700000042000")
+
+    assert spot_client.klines.call_count == 2
+
+
+def test_kline_price_cache_evicts_least_recently_used() -> None:
+    cache = KlinePriceCache(max_size=2, ttl_seconds=60)
+    cache.put("ethusdt", get_mock_kline(60000))
+    cache.put("ethusdt", get_mock_kline(120000))
+
+    # touch the first entry so the second becomes least recently used
+    assert cache.get("ETHUSDT", 60001) is not None
+    cache.put("ethusdt", get_mock_kline(180000))
+
+    assert len(cache) == 2
+    assert cache.get("ethusdt", 120000) is None
+    assert cache.get("ethusdt", 60000) is not None
+
+
+def test_kline_price_cache_expires_entries_after_ttl() -> None:
+    cache = KlinePriceCache(max_size=2, ttl_seconds=-1)
+    cache.put("ethusdt", get_mock_kline(60000))
+
+    assert cache.get("ethusdt", 60000) is None
+    assert cache.misses == 1
+
+
+def test_get_klines_by_time_range_paginates_until_end_time() -> None:
+    first_page = [get_mock_kline(open_time * 60000) for open_time in range(1000)]
+    second_page = [get_mock_kline(open_time * 60000) for open_time in range(1000, 1500)]
+
+    spot_client = MagicMock()
+    spot_client.klines = MagicMock(side_effect=[first_page, second_page])
+
+    client = BinanceSpotApiClient(spot_client=spot_client)
+    result = client.get_klines_by_time_range("ethusdt", "1m", 0, 1499 * 60000)
+
+    assert len(result) == 1500
+    assert spot_client.klines.call_count == 2
+    assert spot_client.klines.call_args_list[1].kwargs["startTime"] == 1000 * 60000
@@ -0,0 +1,28 @@
+import threading
+
+from app.core.binance_spot_api.spot_pool import ThreadLocalSpot
+
+
+def test_each_thread_gets_its_own_spot_client_on_a_shared_adapter() -> None:
+    spot_pool = ThreadLocalSpot(base_url="https://api.binance.com", timeout=5)
+    spot_clients = []
+
+    def get_spot_clients() -> None:
+        spot_clients.append(spot_pool.get_thread_spot_client())
+        spot_clients.append(spot_pool.get_thread_spot_client())
+
+    threads = [threading.Thread(target=get_spot_clients) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Reused within a thread, never shared between threads
+    assert spot_clients[0] is spot_clients[1]
+    assert spot_clients[2] is spot_clients[3]
+    assert spot_clients[0] is not spot_clients[2]
+    assert spot_clients[0].session is not spot_clients[2].session
+    assert spot_clients[0].session.get_adapter("https://api.binance.com") is spot_clients[2].session.get_adapter(
+        "https://api.binance.com"
+    )
+    spot_pool.close()
@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+
+from app.core.block_timestamp_index.client import BlockTimestampIndex
+from app.core.etherscan_http_client.model import EtherscanTransaction
+from app.storage.models import BlockTimestampAnchor
+
+POS_BLOCK = 20_000_000
+POS_TIMESTAMP = 1_717_000_000
+
+
+def get_index_with_anchors(lower: BlockTimestampAnchor | None, upper: BlockTimestampAnchor | None, web3py=None) -> BlockTimestampIndex:
+    anchor_repo = MagicMock()
+    anchor_repo.read_bracketing_anchors = MagicMock(return_value=(lower, upper))
+    return BlockTimestampIndex(anchor_repo=anchor_repo, web3py=web3py)
+
+
+def test_exact_anchor_answers_both_directions() -> None:
+    anchor = BlockTimestampAnchor(block_number=POS_BLOCK, ts_timestamp=POS_TIMESTAMP)
+    index = get_index_with_anchors(anchor, anchor)
+
+    assert index.get_closest_block_number(POS_TIMESTAMP, "before") == POS_BLOCK
+    assert index.get_closest_block_number(POS_TIMESTAMP, "after") == POS_BLOCK
+
+
+def test_consecutive_anchors_bracket_timestamp() -> None:
+    index = get_index_with_anchors(
+        BlockTimestampAnchor(block_number=100, ts_timestamp=1000),
+        BlockTimestampAnchor(block_number=101, ts_timestamp=1013),
+    )
+
+    assert index.get_closest_block_number(1005, "before") == 100
+    assert index.get_closest_block_number(1005, "after") == 101
+
+
+def test_slot_consistent_bracket_is_interpolated_exactly() -> None:
+    index = get_index_with_anchors(
+        BlockTimestampAnchor(block_number=POS_BLOCK, ts_timestamp=POS_TIMESTAMP),
+        BlockTimestampAnchor(block_number=POS_BLOCK + 10, ts_timestamp=POS_TIMESTAMP + 120),
+    )
+
+    assert index.get_closest_block_number(POS_TIMESTAMP + 30, "before") == POS_BLOCK + 2
+    assert index.get_closest_block_number(POS_TIMESTAMP + 30, "after") == POS_BLOCK + 3
+    assert index.get_closest_block_number(POS_TIMESTAMP + 36, "after") == POS_BLOCK + 3
+
+
+def test_bracket_with_missed_slot_falls_back_without_node() -> None:
+    index = get_index_with_anchors(
+        BlockTimestampAnchor(block_number=POS_BLOCK, ts_timestamp=POS_TIMESTAMP),
+        BlockTimestampAnchor(block_number=POS_BLOCK + 10, ts_timestamp=POS_TIMESTAMP + 132),
+    )
+
+    assert index.get_closest_block_number(POS_TIMESTAMP + 30, "before") is None
+    assert index.misses == 1
+
+
+def test_pre_merge_bracket_is_not_slot_interpolated() -> None:
+    index = get_index_with_anchors(
+        BlockTimestampAnchor(block_number=1000, ts_timestamp=10_000),
+        BlockTimestampAnchor(block_number=1010, ts_timestamp=10_120),
+    )
+
+    assert index.get_closest_block_number(10_030, "before") is None
+
+
+def test_verification_probe_narrows_bracket_and_records_anchor() -> None:
+    # Slot missed right after POS_BLOCK, the rest of the range is gap free
+    web3py = MagicMock()
+    web3py.eth.get_block = MagicMock(side_effect=lambda block_number: {"timestamp": POS_TIMESTAMP + 12 * (block_number - POS_BLOCK) + 12})
+    anchor_repo = MagicMock()
+    anchor_repo.read_bracketing_anchors = MagicMock(return_value=(
+        BlockTimestampAnchor(block_number=POS_BLOCK, ts_timestamp=POS_TIMESTAMP),
+        BlockTimestampAnchor(block_number=POS_BLOCK + 10, ts_timestamp=POS_TIMESTAMP + 132),
+    ))
+    index = BlockTimestampIndex(anchor_repo=anchor_repo, web3py=web3py, max_verification_probes=2)
+
+    result = index.get_closest_block_number(POS_TIMESTAMP + 100, "before")
+
+    assert result == POS_BLOCK + 7
+    assert web3py.eth.get_block.call_count <= 2
+    recorded = anchor_repo.insert_anchors.call_args[0][0]
+    assert all(anchor.ts_timestamp == POS_TIMESTAMP + 12 * (anchor.block_number - POS_BLOCK) + 12 for anchor in recorded)
+
+
+def test_repository_error_falls_back_to_etherscan() -> None:
+    anchor_repo = MagicMock()
+    anchor_repo.read_bracketing_anchors = MagicMock(side_effect=Exception("db down"))
+    index = BlockTimestampIndex(anchor_repo=anchor_repo)
+
+    assert index.get_closest_block_number(POS_TIMESTAMP, "before") is None
+
+
+def test_record_transactions_keeps_one_anchor_per_block() -> None:
+    anchor_repo = MagicMock()
+    index = BlockTimestampIndex(anchor_repo=anchor_repo)
+
+    index.record_transactions([
+        EtherscanTransaction(blockNumber="10", timeStamp="1000", hash="0x1"),
+        EtherscanTransaction(blockNumber="10", timeStamp="1000", hash="0x2"),
+        EtherscanTransaction(blockNumber="11", timeStamp="1012", hash="0x3"),
+    ])
+
+    recorded = anchor_repo.insert_anchors.call_args[0][0]
+    assert [(anchor.block_number, anchor.ts_timestamp) for anchor in recorded] == [(10, 1000), (11, 1012)]
@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.etherscan_http_client.async_client import AsyncEtherscanHttpclient
+from app.core.etherscan_http_client.model import EtherscanTransaction, EtherscanTxResponse
+
+
+def get_async_etherscan_client_with_response(response_json: dict) -> AsyncEtherscanHttpclient:
+    http_client = MagicMock()
+    http_client.get = AsyncMock(return_value=response_json)
+    return AsyncEtherscanHttpclient(http_client=http_client, api_key="key")
+
+
+def test_get_closest_block_number_by_start_timestamp_returns_block() -> None:
+    client = get_async_etherscan_client_with_response({"status": "1", "message": "OK", "result": "12345678"})
+
+    result = asyncio.run(client.get_closest_block_number_by_start_timestamp(1700000000))
+
+    assert result.result == "12345678"
+
+
+def test_iter_token_txs_by_start_and_end_block_collects_async_pages() -> None:
+    pages = [
+        {"status": "1", "message": "OK", "result": [{"blockNumber": "1", "hash": "0x1"}, {"blockNumber": "2", "hash": "0x2"}]},
+        {"status": "1", "message": "OK", "result": [{"blockNumber": "3", "hash": "0x3"}]},
+    ]
+    http_client = MagicMock()
+    http_client.get = AsyncMock(side_effect=pages)
+    client = AsyncEtherscanHttpclient(http_client=http_client, api_key="key")
+
+    async def collect() -> list:
+        return [tx async for tx in client.iter_token_txs_by_start_and_end_block("0x1", 0, 10, page_size=2)]
+
+    result = asyncio.run(collect())
+
+    assert [tx.hash for tx in result] == ["0x1", "0x2", "0x3"]
+    assert http_client.get.await_args_list[1].kwargs["params"]["page"] == 2
+
+
+def test_iter_token_txs_by_start_and_end_block_resplits_like_sync_client() -> None:
+    transfers = [
+        EtherscanTransaction(blockNumber=str(index // 3), hash=f"0x{index}", value=str(index))
+        for index in range(12001)
+    ]
+    client = AsyncEtherscanHttpclient(http_client=MagicMock(), api_key="key")
+
+    async def get_page(address: str, start_block: int, end_block: int, page: int, offset: int) -> EtherscanTxResponse:
+        in_range = [tx for tx in transfers if start_block <= int(tx.blockNumber) <= end_block]
+        return EtherscanTxResponse(status="1", message="OK", result=in_range[(page - 1) * offset:page * offset])
+
+    client.get_token_txs_by_start_and_end_block = AsyncMock(side_effect=get_page)
+
+    async def collect() -> list:
+        return [tx async for tx in client.iter_token_txs_by_start_and_end_block("0x1", 0, 100000, page_size=5000)]
+
+    result = asyncio.run(collect())
+
+    assert [tx.hash for tx in result] == [tx.hash for tx in transfers]
+    restarted_start_blocks = [
+        call.kwargs["start_block"]
+        for call in client.get_token_txs_by_start_and_end_block.await_args_list
+        if call.kwargs["page"] == 1
+    ]
+    assert restarted_start_blocks == [0, 3333]
@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from app.core.etherscan_http_client.client import EtherscanHttpclient
+from app.core.etherscan_http_client.model import EtherscanTransaction, EtherscanTxResponse
+from app.utils.http_client.client import ether_scan_client
+from app.utils.rate_limiter.base_class import TokenBucketRateLimiter
+
+
+def get_mock_token_transfers(count: int, transfers_per_block: int) -> list[EtherscanTransaction]:
+    return [
+        EtherscanTransaction(
+            blockNumber=str(index // transfers_per_block),
+            hash=f"0x{index}",
+            value=str(index),
+        )
+        for index in range(count)
+    ]
+
+
+def get_etherscan_client_with_mock_pages(transfers: list[EtherscanTransaction]) -> EtherscanHttpclient:
+    client = EtherscanHttpclient(
+        http_client=ether_scan_client,
+        api_key="",
+    )
+
+    def get_page(address: str, start_block: int, end_block: int, page: int = 1, offset: int = 100) -> EtherscanTxResponse:
+        in_range = [tx for tx in transfers if start_block <= int(tx.blockNumber) <= end_block]
+        return EtherscanTxResponse(
+            status="1",
+            message="OK",
+            result=in_range[(page - 1) * offset:page * offset],
+        )
+
+    client.get_token_txs_by_start_and_end_block = MagicMock(side_effect=get_page)
+    return client
+
+
+def test_iter_token_txs_by_start_and_end_block_walks_every_page() -> None:
+    transfers = get_mock_token_transfers(count=250, transfers_per_block=3)
+    client = get_etherscan_client_with_mock_pages(transfers)
+
+    result = list(client.iter_token_txs_by_start_and_end_block("0x1", 0, 1000, page_size=100))
+
+    assert [tx.hash for tx in result] == [tx.hash for tx in transfers]
+    assert client.get_token_txs_by_start_and_end_block.call_count == 3
+
+
+def test_iter_token_txs_by_start_and_end_block_resplits_when_result_window_is_hit() -> None:
+    transfers = get_mock_token_transfers(count=12001, transfers_per_block=3)
+    client = get_etherscan_client_with_mock_pages(transfers)
+
+    result = list(client.iter_token_txs_by_start_and_end_block("0x1", 0, 100000, page_size=5000))
+
+    assert [tx.hash for tx in result] == [tx.hash for tx in transfers]
+    restarted_start_blocks = [
+        call.kwargs["start_block"]
+        for call in client.get_token_txs_by_start_and_end_block.call_args_list
+        if call.kwargs["page"] == 1
+    ]
+    assert restarted_start_blocks == [0, 3333]
+
+
+def test_iter_token_txs_by_start_and_end_block_raises_when_single_block_exceeds_window() -> None:
+    transfers = get_mock_token_transfers(count=10001, transfers_per_block=20000)
+    client = get_etherscan_client_with_mock_pages(transfers)
+
+    with pytest.raises(Exception):
+        list(client.iter_token_txs_by_start_and_end_block("0x1", 0, 10, page_size=5000))
+
+
+def test_etherscan_http_client_retries_rate_limited_response() -> None:
+    http_client = MagicMock()
+    http_client.get = MagicMock(side_effect=[
+        {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"},
+        {"status": "1", "message": "OK", "result": "12345678"},
+    ])
+    rate_limiter = TokenBucketRateLimiter(name="test", rate_per_second=1000, burst=1)
+
+    client = EtherscanHttpclient(
+        http_client=http_client,
+        api_key="",
+        rate_limiter=rate_limiter,
+    )
+
+    result = client.get_closest_block_number_by_start_timestamp(1700000000)
+
+    assert result.result == "12345678"
+    assert http_client.get.call_count == 2
+    assert rate_limiter.get_stats().acquired_count == 2
+
+
+def test_etherscan_http_client_retries_http_429_through_rate_limiter() -> None:
+    too_many_requests = requests.Response()
+    too_many_requests.status_code = 429
+    http_client = MagicMock()
+    http_client.get = MagicMock(side_effect=[
+        requests.HTTPError("429 Client Error: Too Many Requests", response=too_many_requests),
+        {"status": "1", "message": "OK", "result": "12345678"},
+    ])
+    rate_limiter = TokenBucketRateLimiter(name="test", rate_per_second=1000, burst=1)
+
+    client = EtherscanHttpclient(
+        http_client=http_client,
+        api_key="",
+        rate_limiter=rate_limiter,
+    )
+
+    result = client.get_closest_block_number_by_start_timestamp(1700000000)
+
+    assert result.result == "12345678"
+    # The retry took its own token
+    assert rate_limiter.get_stats().acquired_count == 2
+
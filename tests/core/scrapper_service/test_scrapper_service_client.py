@@ -1,8 +1,12 @@
 
+import asyncio
 import re
+import time
 import token
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from typing import Dict
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, call
 import binance
 from binance.spot import Spot
 from hexbytes import HexBytes
@@ -13,15 +17,18 @@ from sqlalchemy import Transaction
 from app.core import etherscan_http_client
 from app.core.binance_spot_api.client import BinanceSpotApiClient
 from app.core.etherscan_http_client.client import EtherscanHttpclient
-from app.core.etherscan_http_client.model import EtherscanBlockNumberResponse, EtherscanTransaction, EtherscanTxResponse
+from app.core.etherscan_http_client.model import EtherscanBlockNumberResponse, EtherscanTransaction, EtherscanTransactionWithUsdtFee, EtherscanTxResponse
 from app.core.scrapper_service.client import ScrapperService
-from app.storage.models import TokenPairPool, TransactionToFromPool
+from app.core.scrapper_service.model import TransactionFeeCalcResult
+from app.storage.eth_usdt_klines_repositories.client import EthUsdtKlinesRepository
+from app.storage.models import EthUsdtKline, PoolScrapeCoverage, PoolScrapeState, TokenPairPool, TransactionToFromPool
 from app.storage.token_pair_pools_repositories.client import TokenPairPoolsRepository
 from app.storage.transactions_to_from_pools_repositories.client import TransactionToFromPoolRepository
 from app.utils.http_client.client import ether_scan_client
 from web3 import Web3
 from web3.types import TxReceipt
 from app.core.scrapper_service.abis import uniswap_v3_swap_abi
+from app.core.config import app_config
 
 
 
@@ -226,17 +233,17 @@ def test_convert_etherTx_to_transaction_repo_with_correct_value() -> None:
     assert result.from_address == tx.from_
     assert result.to_address == tx.to
     assert result.contract_address == tx.contractAddress
-    assert result.token_value == tx.value
+    assert result.token_value == int(tx.value)
     assert result.token_name == tx.tokenName
     assert result.token_symbol == tx.tokenSymbol
-    assert result.token_decimal == tx.tokenDecimal
-    assert result.transaction_index == tx.transactionIndex
-    assert result.gas_limit == tx.gas
-    assert result.gas_price == tx.gasPrice
-    assert result.gas_used == tx.gasUsed
-    assert result.cumulative_gas_used == tx.cumulativeGasUsed
-    assert result.confirmations == tx.confirmations
-    assert result.transaction_fee_usdt == usdt_fee
+    assert result.token_decimal == int(tx.tokenDecimal)
+    assert result.transaction_index == int(tx.transactionIndex)
+    assert result.gas_limit == int(tx.gas)
+    assert result.gas_price == int(tx.gasPrice)
+    assert result.gas_used == int(tx.gasUsed)
+    assert result.cumulative_gas_used == int(tx.cumulativeGasUsed)
+    assert result.confirmations == int(tx.confirmations)
+    assert result.transaction_fee_usdt == Decimal(usdt_fee)
     assert result.pool_id == pool_id
 
 def test_get_closed_price_from_klines_with_correct_value() -> None:
@@ -355,6 +362,150 @@ def test_calculate_transaction_fee_in_usdt() -> None:
     assert result.transaction_fee == '2.26935E-17'
 
 
+def test_calculate_transaction_fee_in_usdt_with_closed_price_series() -> None:
+    binance_spot_client = BinanceSpotApiClient(
+        spot_client=Spot(base_url=base_url, timeout=5),
+    )
+    binance_spot_client.get_closed_price_by_timestamp = MagicMock()
+
+    client = ScrapperService(
+        binance_spot_client=binance_spot_client,
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=MagicMock(),
+        web3py=MagicMock(),
+    )
+    tx = EtherscanTransaction(
+        timeStamp="123",
+        gasPrice="123",
+        gasUsed="123",
+    )
+    result = client.calculate_transaction_fee_in_usdt(tx, {120000: "0.0015"})
+
+    assert result.transaction_fee == '2.26935E-17'
+    binance_spot_client.get_closed_price_by_timestamp.assert_not_called()
+
+
+def test_get_closed_price_series_fetches_batch_range_once() -> None:
+    binance_spot_client = BinanceSpotApiClient(
+        spot_client=Spot(base_url=base_url, timeout=5),
+    )
+    binance_spot_client.get_klines_by_time_range = MagicMock(return_value=[
+        [0, "1", "1", "1", "1.5", "1", 59999],
+        [60000, "1", "1", "1", "2.5", "1", 119999],
+        [120000, "1", "1", "1", "3.5", "1", 179999],
+    ])
+
+    client = ScrapperService(
+        binance_spot_client=binance_spot_client,
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=MagicMock(),
+        web3py=MagicMock(),
+    )
+    transactions = [
+        EtherscanTransaction(timeStamp="30"),
+        EtherscanTransaction(timeStamp="150"),
+    ]
+
+    result = client.get_closed_price_series("ethusdt", transactions)
+
+    assert result == {0: "1.5", 60000: "2.5", 120000: "3.5"}
+    binance_spot_client.get_klines_by_time_range.assert_called_once_with(
+        symbol="ethusdt",
+        interval="1m",
+        startTime=0,
+        endTime=120000,
+    )
+
+
+def test_get_closed_price_series_only_fetches_minutes_missing_from_kline_store() -> None:
+    binance_spot_client = BinanceSpotApiClient(
+        spot_client=Spot(base_url=base_url, timeout=5),
+    )
+    binance_spot_client.get_klines_by_time_range = MagicMock(return_value=[
+        [60000, "1", "1", "1", "2.5", "1", 119999],
+    ])
+
+    kline_repo = EthUsdtKlinesRepository(db_session=MagicMock())
+    kline_repo.read_klines_by_open_time_range = MagicMock(return_value=[
+        EthUsdtKline(open_time=0, close=Decimal("1.5")),
+        EthUsdtKline(open_time=120000, close=Decimal("3.5")),
+    ])
+    kline_repo.insert_klines = MagicMock()
+
+    client = ScrapperService(
+        binance_spot_client=binance_spot_client,
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=MagicMock(),
+        web3py=MagicMock(),
+        kline_repo=kline_repo,
+    )
+    transactions = [
+        EtherscanTransaction(timeStamp="30"),
+        EtherscanTransaction(timeStamp="150"),
+    ]
+
+    result = client.get_closed_price_series("ethusdt", transactions)
+
+    assert result == {0: "1.5", 60000: "2.5", 120000: "3.5"}
+    binance_spot_client.get_klines_by_time_range.assert_called_once_with(
+        symbol="ethusdt",
+        interval="1m",
+        startTime=60000,
+        endTime=60000,
+    )
+    inserted_klines = kline_repo.insert_klines.call_args.args[0]
+    assert [kline.open_time for kline in inserted_klines] == [60000]
+
+
+def test_get_closed_price_series_skips_binance_when_kline_store_covers_range() -> None:
+    binance_spot_client = BinanceSpotApiClient(
+        spot_client=Spot(base_url=base_url, timeout=5),
+    )
+    binance_spot_client.get_klines_by_time_range = MagicMock()
+
+    kline_repo = EthUsdtKlinesRepository(db_session=MagicMock())
+    kline_repo.read_klines_by_open_time_range = MagicMock(return_value=[
+        EthUsdtKline(open_time=0, close=Decimal("1.5")),
+    ])
+
+    client = ScrapperService(
+        binance_spot_client=binance_spot_client,
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=MagicMock(),
+        web3py=MagicMock(),
+        kline_repo=kline_repo,
+    )
+
+    result = client.get_closed_price_series("ethusdt", [EtherscanTransaction(timeStamp="30")])
+
+    assert result == {0: "1.5"}
+    binance_spot_client.get_klines_by_time_range.assert_not_called()
+
+def test_calculate_transaction_fees_in_usdt_matches_single_transaction_path() -> None:
+    client = get_client_with_fully_mocked_properties()
+    closed_price_series = {0: "2513.45000000", 60000: "0.0015", 120000: "3000"}
+    transactions = [
+        EtherscanTransaction(timeStamp=timestamp, gasUsed=gas_used, gasPrice=gas_price)
+        for (timestamp, gas_used, gas_price) in [
+            ("1", "123", "123"),
+            ("61", "21000", "1000000000"),
+            ("121", "184512", "23456000000"),
+            ("59", "0", "4567891234"),
+            ("62", "21000", "0"),
+            ("122", "30000000", "1000000000000000000000"),
+        ]
+    ]
+
+    result = client.calculate_transaction_fees_in_usdt(transactions, closed_price_series)
+
+    expected = [client.calculate_transaction_fee_in_usdt(tx, closed_price_series) for tx in transactions]
+    assert [fee.transaction_fee for fee in result] == [fee.transaction_fee for fee in expected]
+    assert all(fee.success for fee in result)
+
 def test_scrapping_job_return_true() -> None:
     ethercan_http_client = EtherscanHttpclient(
         http_client=ether_scan_client,
@@ -437,7 +588,7 @@ def test_scrapping_job_return_true() -> None:
         ]
     ])
 
-    transaction_pool_repo.insert_transaction_to_from_pool_data = MagicMock()
+    transaction_pool_repo.bulk_insert_transaction_to_from_pool_data = MagicMock(return_value=1)
 
     client = ScrapperService(
         binance_spot_client=binance_spot_client,
@@ -453,7 +604,230 @@ def test_scrapping_job_return_true() -> None:
         address="0x12345678"
     )
 
-    assert result
+    assert result.success
+    assert result.fetched_count == 1
+    assert result.inserted_count == 1
+    inserted = transaction_pool_repo.bulk_insert_transaction_to_from_pool_data.call_args[0][0]
+    assert len(list(inserted)) == 1
+
+def test_scrapping_job_resumes_after_watermark_and_advances_it() -> None:
+    etherscan_client = MagicMock()
+    etherscan_client.get_token_txs_by_start_block = MagicMock(return_value=EtherscanTxResponse(
+        status="1",
+        message="OK",
+        result=[
+            EtherscanTransaction(blockNumber="100", timeStamp="1700000000", transactionIndex="3", hash="0x3"),
+            EtherscanTransaction(blockNumber="100", timeStamp="1700000000", transactionIndex="5", hash="0x5"),
+            EtherscanTransaction(blockNumber="101", timeStamp="1700000012", transactionIndex="0", hash="0x6"),
+        ],
+    ))
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.bulk_insert_transaction_to_from_pool_data = MagicMock(
+        side_effect=lambda rows, scrape_state: len(list(rows))
+    )
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=etherscan_client,
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+    )
+    client.calculate_transaction_fees_in_usdt = MagicMock(side_effect=lambda txs: [
+        TransactionFeeCalcResult(success=True, transaction_fee="1.0") for _ in txs
+    ])
+
+    result = client.scrapping_job(address="0xpool", start_block=100, pool_id=1, last_tx_index=3)
+
+    assert result.fetched_count == 2
+    scrape_state = transaction_pool_repo.bulk_insert_transaction_to_from_pool_data.call_args.kwargs["scrape_state"]
+    assert (scrape_state.pool_id, scrape_state.last_block, scrape_state.last_tx_index) == (1, 101, 0)
+    assert scrape_state.written_by_scrapping_job
+
+
+def test_scrapping_job_from_seeded_watermark_leaves_start_block_uncovered() -> None:
+    etherscan_client = MagicMock()
+    etherscan_client.get_token_txs_by_start_block = MagicMock(return_value=EtherscanTxResponse(
+        status="1",
+        message="OK",
+        result=[
+            EtherscanTransaction(blockNumber="100", timeStamp="1700000000", transactionIndex="3", hash="0x3"),
+            EtherscanTransaction(blockNumber="100", timeStamp="1700000000", transactionIndex="5", hash="0x5"),
+        ],
+    ))
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.bulk_insert_transaction_to_from_pool_data = MagicMock(
+        side_effect=lambda rows, scrape_state: len(list(rows))
+    )
+    coverage_repo = MagicMock()
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=etherscan_client,
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+        coverage_repo=coverage_repo,
+    )
+    client.calculate_transaction_fees_in_usdt = MagicMock(side_effect=lambda txs: [
+        TransactionFeeCalcResult(success=True, transaction_fee="1.0") for _ in txs
+    ])
+
+    # Seeded from the newest transfer only, the earlier transfers of block 100 were never stored
+    client.scrapping_job(address="0xpool", start_block=100, pool_id=1, last_tx_index=3)
+
+    coverage_repo.insert_covered_block_range.assert_not_called()
+    scrape_state = transaction_pool_repo.bulk_insert_transaction_to_from_pool_data.call_args.kwargs["scrape_state"]
+    assert (scrape_state.last_block, scrape_state.last_tx_index) == (100, 5)
+    assert not scrape_state.written_by_scrapping_job
+
+    client.scrapping_job(address="0xpool", start_block=100, pool_id=1, last_tx_index=3, start_block_covered=True)
+
+    coverage_repo.insert_covered_block_range.assert_called_once_with(1, 100, 100)
+    scrape_state = transaction_pool_repo.bulk_insert_transaction_to_from_pool_data.call_args.kwargs["scrape_state"]
+    assert scrape_state.written_by_scrapping_job
+
+
+def test_scrapping_job_capped_batch_reports_more_and_lag() -> None:
+    etherscan_client = MagicMock()
+    etherscan_client.get_token_txs_by_start_block = MagicMock(return_value=EtherscanTxResponse(
+        status="1",
+        message="OK",
+        result=[
+            EtherscanTransaction(blockNumber=str(100 + index), timeStamp="1700000000", transactionIndex="0", hash=f"0x{index}")
+            for index in range(5)
+        ],
+    ))
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.bulk_insert_transaction_to_from_pool_data = MagicMock(
+        side_effect=lambda rows, scrape_state: len(list(rows))
+    )
+    web3py = MagicMock()
+    web3py.eth.block_number = 150
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=etherscan_client,
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=web3py,
+    )
+    client.calculate_transaction_fees_in_usdt = MagicMock(side_effect=lambda txs: [
+        TransactionFeeCalcResult(success=True, transaction_fee="1.0") for _ in txs
+    ])
+
+    capped = client.scrapping_job(address="0xpool", start_block=99, pool_id=1, max_count=3)
+    assert (capped.fetched_count, capped.has_more, capped.last_block, capped.lag_blocks) == (3, True, 102, 48)
+
+    drained = client.scrapping_job(address="0xpool", start_block=99, pool_id=1, max_count=10)
+    assert (drained.fetched_count, drained.has_more, drained.last_block, drained.lag_blocks) == (5, False, 104, 46)
+
+
+def test_scrapping_job_catch_up_batch_larger_than_default_page() -> None:
+    backlog = [
+        EtherscanTransaction(blockNumber=str(100 + index), timeStamp="1700000000", transactionIndex="0", hash=f"0x{index}")
+        for index in range(300)
+    ]
+    etherscan_client = MagicMock()
+    etherscan_client.get_token_txs_by_start_block = MagicMock(
+        side_effect=lambda address, start_block, offset: EtherscanTxResponse(
+            status="1",
+            message="OK",
+            result=[tx for tx in backlog if int(tx.blockNumber) >= start_block][:offset],
+        )
+    )
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.bulk_insert_transaction_to_from_pool_data = MagicMock(
+        side_effect=lambda rows, scrape_state: len(list(rows))
+    )
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=etherscan_client,
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+    )
+    client.calculate_transaction_fees_in_usdt = MagicMock(side_effect=lambda txs: [
+        TransactionFeeCalcResult(success=True, transaction_fee="1.0") for _ in txs
+    ])
+
+    # A doubled catch-up batch past the 100 rows default page fetches and inserts all of it
+    catching_up = client.scrapping_job(address="0xpool", start_block=99, pool_id=1, max_count=160)
+    assert etherscan_client.get_token_txs_by_start_block.call_args.args[2] == 160
+    assert (catching_up.fetched_count, catching_up.has_more, catching_up.last_block) == (160, True, 259)
+
+    # The offset is capped at the etherscan page size
+    drained = client.scrapping_job(address="0xpool", start_block=259, pool_id=1, max_count=5000)
+    assert etherscan_client.get_token_txs_by_start_block.call_args.args[2] == app_config.etherscan_tokentx_page_size
+    assert (drained.fetched_count, drained.has_more, drained.last_block) == (140, False, 399)
+
+
+def test_read_scrape_watermark_prefers_state_table_over_latest_transaction() -> None:
+    scrape_state_repo = MagicMock()
+    scrape_state_repo.read_pool_scrape_state = MagicMock(return_value=None)
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.get_latest_transaction_data_by_to_from_address_with_id = MagicMock(
+        return_value=get_mock_transaction_from_repo()
+    )
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+        scrape_state_repo=scrape_state_repo,
+    )
+
+    derived = client.read_scrape_watermark("0xpool", 1)
+    assert (derived.last_block, derived.last_tx_index) == (12345678, 1)
+
+    scrape_state_repo.read_pool_scrape_state = MagicMock(
+        return_value=PoolScrapeState(pool_id=1, last_block=20000000, last_tx_index=7)
+    )
+    transaction_pool_repo.get_latest_transaction_data_by_to_from_address_with_id.reset_mock()
+
+    stored = client.read_scrape_watermark("0xpool", 1)
+    assert (stored.last_block, stored.last_tx_index) == (20000000, 7)
+    transaction_pool_repo.get_latest_transaction_data_by_to_from_address_with_id.assert_not_called()
+
+
+def test_backfill_transaction_pool_bulk_inserts_one_page_at_a_time() -> None:
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.bulk_insert_transaction_to_from_pool_data = MagicMock(
+        side_effect=lambda rows, scrape_state: len(list(rows))
+    )
+    coverage_repo = MagicMock()
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+        coverage_repo=coverage_repo,
+    )
+    client.iter_token_txs_by_block_range = MagicMock(return_value=iter([
+        EtherscanTransaction(blockNumber="10", timeStamp="1700000000", hash="0x1", gasPrice="1", gasUsed="1"),
+        EtherscanTransaction(blockNumber="10", timeStamp="1700000000", hash="0x1", gasPrice="1", gasUsed="1"),
+        EtherscanTransaction(blockNumber="11", timeStamp="1700000012", hash="0x2", gasPrice="1", gasUsed="1"),
+        EtherscanTransaction(blockNumber="12", timeStamp="1700000024", hash="0x3", gasPrice="1", gasUsed="1"),
+    ]))
+    client.calculate_transaction_fees_in_usdt = MagicMock(side_effect=lambda txs: [
+        TransactionFeeCalcResult(success=True, transaction_fee="1.0") for _ in txs
+    ])
+
+    original_page_size = app_config.etherscan_tokentx_page_size
+    app_config.etherscan_tokentx_page_size = 2
+    try:
+        result = client.backfill_transaction_pool("0xpool", 1, 10, 12)
+    finally:
+        app_config.etherscan_tokentx_page_size = original_page_size
+
+    assert result == 3
+    assert transaction_pool_repo.bulk_insert_transaction_to_from_pool_data.call_count == 2
+    coverage_repo.insert_covered_block_range.assert_called_once_with(1, 10, 12)
+    # Partitions of every page are created ahead of its insert
+    assert transaction_pool_repo.create_partitions_for_time_range.call_args_list == [
+        call(1700000000, 1700000012),
+        call(1700000024, 1700000024),
+    ]
+
 
 def test_insert_new_latest_transaction_pool_return_bool() -> None:
     
@@ -588,17 +962,17 @@ def get_mock_transaction_from_repo() -> TransactionToFromPool:
             from_address="0xabcdef1234567890",
             to_address="0x1234567890abcdef",
             contract_address="0xabcdef1234567890",
-            token_value="1000",
+            token_value=1000,
             token_name="TokenName",
             token_symbol="TN",
-            token_decimal="18",
-            transaction_index="1",
-            gas_limit="21000",
-            gas_price="1000000000",
-            gas_used="21000",
-            cumulative_gas_used="21000",
-            confirmations="10",
-            transaction_fee_usdt="0.01",
+            token_decimal=18,
+            transaction_index=1,
+            gas_limit=21000,
+            gas_price=1000000000,
+            gas_used=21000,
+            cumulative_gas_used=21000,
+            confirmations=10,
+            transaction_fee_usdt=Decimal("0.01"),
             pool_id=1
         )
 
@@ -797,21 +1171,288 @@ def test_get_transaction_data_with_time_range() -> None:
     assert result[0].usdt_fee == "0.00"
 
 
+def test_get_historical_block_range_async_uses_async_etherscan_client() -> None:
+    async_etherscan_client = MagicMock()
+    async_etherscan_client.get_closest_block_number_by_start_timestamp = AsyncMock(
+        return_value=EtherscanBlockNumberResponse(status="1", message="OK", result="12345677")
+    )
+    async_etherscan_client.get_closest_block_number_by_end_timestamp = AsyncMock(
+        return_value=EtherscanBlockNumberResponse(status="1", message="OK", result="12345678")
+    )
+    etherscan_client = MagicMock()
+
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=etherscan_client,
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=MagicMock(),
+        web3py=MagicMock(),
+        async_etherscan_client=async_etherscan_client,
+    )
+
+    result = asyncio.run(client.get_historical_block_range_async(1234567890, 1234567990))
+
+    assert result == (12345677, 12345678)
+    etherscan_client.get_closest_block_number_by_start_timestamp.assert_not_called()
+
+
+def test_get_historical_block_range_resolves_blocks_on_executor() -> None:
+    etherscan_client = MagicMock()
+    etherscan_client.get_closest_block_number_by_start_timestamp = MagicMock(
+        return_value=EtherscanBlockNumberResponse(status="1", message="OK", result="12345677")
+    )
+    etherscan_client.get_closest_block_number_by_end_timestamp = MagicMock(
+        return_value=EtherscanBlockNumberResponse(status="1", message="OK", result="12345678")
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        client = ScrapperService(
+            binance_spot_client=MagicMock(),
+            etherscan_client=etherscan_client,
+            token_pair_pool_repo=MagicMock(),
+            transaction_pool_repo=MagicMock(),
+            web3py=MagicMock(),
+            executor=executor,
+        )
+
+        result = client.get_historical_block_range(1234567890, 1234567990)
+
+    assert result == (12345677, 12345678)
+    etherscan_client.get_closest_block_number_by_start_timestamp.assert_called_once_with(1234567890)
+    etherscan_client.get_closest_block_number_by_end_timestamp.assert_called_once_with(1234567990)
+
+
+def test_get_historical_block_range_only_asks_etherscan_for_unresolved_timestamps() -> None:
+    block_timestamp_index = MagicMock()
+    block_timestamp_index.get_closest_block_number = MagicMock(
+        side_effect=lambda timestamp, closest: 12345677 if closest == "after" else None
+    )
+    etherscan_client = MagicMock()
+    etherscan_client.get_closest_block_number_by_end_timestamp = MagicMock(
+        return_value=EtherscanBlockNumberResponse(status="1", message="OK", result="12345678")
+    )
+
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=etherscan_client,
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=MagicMock(),
+        web3py=MagicMock(),
+        block_timestamp_index=block_timestamp_index,
+    )
+
+    result = client.get_historical_block_range(1234567890, 1234567990)
+
+    assert result == (12345677, 12345678)
+    etherscan_client.get_closest_block_number_by_start_timestamp.assert_not_called()
+    etherscan_client.get_closest_block_number_by_end_timestamp.assert_called_once_with(1234567990)
+
+
+def get_fanout_etherscan_client(tx_count_by_block: Dict[int, int]) -> MagicMock:
+    def get_range_txs(start_block: int, end_block: int) -> list[EtherscanTransaction]:
+        return [
+            EtherscanTransaction(blockNumber=str(block_number), hash=f"0x{block_number}_{index}")
+            for block_number in sorted(tx_count_by_block)
+            if start_block <= block_number <= end_block
+            for index in range(tx_count_by_block[block_number])
+        ]
+
+    def get_token_txs(address: str, start_block: int, end_block: int, page: int, offset: int) -> EtherscanTxResponse:
+        # Later sub-ranges answer first, output must still follow block order
+        time.sleep(max(3000 - start_block, 0) / 100000)
+        txs = get_range_txs(start_block, end_block)
+        return EtherscanTxResponse(status="1", message="OK", result=txs[(page - 1) * offset:page * offset])
+
+    etherscan_client = MagicMock()
+    etherscan_client.get_token_txs_by_start_and_end_block = MagicMock(side_effect=get_token_txs)
+    etherscan_client.iter_token_txs_by_start_and_end_block = MagicMock(
+        side_effect=lambda address, start_block, end_block: iter(get_range_txs(start_block, end_block))
+    )
+    return etherscan_client
+
+
+def iter_fanout_token_txs(etherscan_client: MagicMock, start_block: int, end_block: int) -> list[EtherscanTransaction]:
+    original_page_size = app_config.etherscan_tokentx_page_size
+    app_config.etherscan_tokentx_page_size = 4
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            client = ScrapperService(
+                binance_spot_client=MagicMock(),
+                etherscan_client=etherscan_client,
+                token_pair_pool_repo=MagicMock(),
+                transaction_pool_repo=MagicMock(),
+                web3py=MagicMock(),
+                executor=executor,
+            )
+            return list(client.iter_token_txs_by_block_range("0xpool", start_block, end_block))
+    finally:
+        app_config.etherscan_tokentx_page_size = original_page_size
+
+
+def test_iter_token_txs_by_block_range_reads_sparse_range_in_one_call() -> None:
+    etherscan_client = get_fanout_etherscan_client({100: 1, 50000: 2})
+
+    result = iter_fanout_token_txs(etherscan_client, 0, 99999)
+
+    assert [tx.hash for tx in result] == ["0x100_0", "0x50000_0", "0x50000_1"]
+    assert etherscan_client.get_token_txs_by_start_and_end_block.call_count == 1
+
+
+def test_iter_token_txs_by_block_range_fans_out_dense_range_in_block_order() -> None:
+    tx_count_by_block = {block_number: 2 for block_number in range(0, 3000, 100)}
+    etherscan_client = get_fanout_etherscan_client(tx_count_by_block)
+
+    result = iter_fanout_token_txs(etherscan_client, 0, 2999)
+
+    assert [tx.hash for tx in result] == [
+        f"0x{block_number}_{index}" for block_number in sorted(tx_count_by_block) for index in range(2)
+    ]
+    # One page for the range and one per sub-range, their short rests are paged through in order
+    assert etherscan_client.get_token_txs_by_start_and_end_block.call_count == 4
+
+
+def test_iter_token_txs_by_block_range_pages_through_a_block_filling_a_page() -> None:
+    etherscan_client = get_fanout_etherscan_client({10: 6, 20: 1})
+
+    result = iter_fanout_token_txs(etherscan_client, 10, 20)
+
+    assert [tx.hash for tx in result] == [f"0x10_{index}" for index in range(6)] + ["0x20_0"]
+    assert etherscan_client.iter_token_txs_by_start_and_end_block.call_args_list[0] == call(
+        address="0xpool", start_block=10, end_block=10
+    )
+
+
+def test_split_block_range_covers_range_without_overlap() -> None:
+    client = get_client_with_fully_mocked_properties()
+
+    assert client.split_block_range(10, 34, 10) == [(10, 19), (20, 29), (30, 34)]
+    assert client.split_block_range(10, 10, 10) == [(10, 10)]
+    assert client.split_block_range(10, 34, 0) == [(10, 34)]
+
+
+def test_get_block_range_segments_splits_covered_and_remote() -> None:
+    client = get_client_with_fully_mocked_properties()
+
+    assert client.get_block_range_segments([(5, 9), (15, 30)], 1, 20) == [
+        (1, 4, False),
+        (5, 9, True),
+        (10, 14, False),
+        (15, 20, True),
+    ]
+    assert client.get_block_range_segments([], 1, 20) == [(1, 20, False)]
+    assert client.get_block_range_segments([(0, 100)], 1, 20) == [(1, 20, True)]
+
+
+def test_get_transaction_data_with_block_range_serves_covered_blocks_from_database() -> None:
+    coverage_repo = MagicMock()
+    coverage_repo.read_covered_block_ranges = MagicMock(return_value=[
+        PoolScrapeCoverage(pool_id=1, start_block=100, end_block=200),
+    ])
+    transaction_pool_repo = MagicMock()
+    stored_tx = get_mock_transaction_from_repo()
+    stored_tx.block_number = 150
+    transaction_pool_repo.read_transaction_data_by_pool_id_and_block_range = MagicMock(return_value=[stored_tx])
+
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+        coverage_repo=coverage_repo,
+    )
+    client.iter_transaction_data_by_block_range = MagicMock(side_effect=lambda address, start_block, end_block: iter([
+        EtherscanTransactionWithUsdtFee(blockNumber=str(start_block), hash=f"0x{start_block}", usdt_fee="1.00"),
+    ]))
+
+    result = client.get_transaction_data_with_block_range(
+        "0xpool", 90, 210, pool_id=1, time_range=(1700000000, 1700003600)
+    )
+
+    assert [tx.blockNumber for tx in result] == ["90", "150", "201"]
+    assert result[1].hash == stored_tx.tx_hash
+    assert result[1].from_ == stored_tx.from_address
+    transaction_pool_repo.read_transaction_data_by_pool_id_and_block_range.assert_called_once_with(
+        pool_id=1, start_block=100, end_block=200, time_range=(1700000000, 1700003600),
+        after_position=None, limit=1000,
+    )
+
+
+def test_get_transaction_data_page_with_block_range_resumes_after_position() -> None:
+    client = get_client_with_fully_mocked_properties()
+    transactions = [
+        EtherscanTransactionWithUsdtFee(blockNumber="100", transactionIndex="3", hash="0x1003", usdt_fee="1.00"),
+        EtherscanTransactionWithUsdtFee(blockNumber="100", transactionIndex="1", hash="0x1001", usdt_fee="1.00"),
+        EtherscanTransactionWithUsdtFee(blockNumber="101", transactionIndex="0", hash="0x1010", usdt_fee="1.00"),
+        EtherscanTransactionWithUsdtFee(blockNumber="102", transactionIndex="5", hash="0x1025", usdt_fee="1.00"),
+    ]
+    client.iter_transaction_data_with_block_range = MagicMock(
+        side_effect=lambda address, start_block, end_block, pool_id, time_range: iter(
+            [tx for tx in transactions if start_block <= int(tx.blockNumber) <= end_block]
+        )
+    )
+
+    (first_page, next_position) = client.get_transaction_data_page_with_block_range("0xpool", 100, 200, limit=2)
+    assert [tx.hash for tx in first_page] == ["0x1001", "0x1003"]
+    assert next_position == (100, 3)
+
+    (second_page, next_position) = client.get_transaction_data_page_with_block_range(
+        "0xpool", 100, 200, limit=2, after_position=next_position
+    )
+    assert [tx.hash for tx in second_page] == ["0x1010", "0x1025"]
+    assert next_position is None
+    # The second page starts at the block of the cursor
+    assert client.iter_transaction_data_with_block_range.call_args.args[1] == 100
+
+
+def test_scrapping_job_records_only_complete_blocks_as_covered() -> None:
+    token_txs = [
+        EtherscanTransaction(blockNumber="100", hash="0x0"),
+        EtherscanTransaction(blockNumber="101", hash="0x1"),
+        EtherscanTransaction(blockNumber="102", hash="0x2"),
+        EtherscanTransaction(blockNumber="102", hash="0x3"),
+    ]
+    client = get_client_with_fully_mocked_properties()
+
+    assert client.get_scrapped_block_range(100, token_txs, 3) == (101, 102)
+    # Capped in the middle of block 102, only block 101 is complete
+    assert client.get_scrapped_block_range(100, token_txs, 2) == (101, 101)
+    # Capped at the end of block 101
+    assert client.get_scrapped_block_range(100, token_txs, 1) == (101, 101)
+    assert client.get_scrapped_block_range(100, token_txs[:1], 0) is None
+    assert client.get_scrapped_block_range(100, [], -1) is None
+
+
+def test_scrapping_job_resumed_inside_start_block_covers_start_block() -> None:
+    token_txs = [
+        EtherscanTransaction(blockNumber="100", transactionIndex="4", hash="0x0"),
+        EtherscanTransaction(blockNumber="100", transactionIndex="5", hash="0x1"),
+        EtherscanTransaction(blockNumber="101", transactionIndex="0", hash="0x2"),
+        EtherscanTransaction(blockNumber="102", transactionIndex="0", hash="0x3"),
+    ]
+    client = get_client_with_fully_mocked_properties()
+
+    # Every transfer of block 100 up to index 4 was stored by the previous batch
+    assert client.get_scrapped_block_range(100, token_txs, 2, start_block_covered=True) == (100, 101)
+    assert client.get_scrapped_block_range(100, token_txs, 0, start_block_covered=True) is None
+    assert client.get_scrapped_block_range(100, token_txs, 1, start_block_covered=True) == (100, 100)
+    # A skipped or seeded start block (only its newest transfer stored) stays uncovered
+    assert client.get_scrapped_block_range(100, token_txs, 2) == (101, 101)
+
+
 def test_get_transaction_fee_with_tx_hash() -> None:
     transaction_pool_repo = TransactionToFromPoolRepository(
         db_session=MagicMock(),
     )
 
-    transaction_pool_repo.read_transaction_data_by_tx_hash = MagicMock(
-        return_value = [get_mock_transaction_from_repo()]
+    transaction_pool_repo.read_transaction_fee_by_tx_hash = MagicMock(
+        return_value = [("0x1234567890abcdef", Decimal("0.01"), "pool_name")]
     )
 
     token_pair_pool_repo = TokenPairPoolsRepository(
         db_session=MagicMock(),
     )
-    token_pair_pool_repo.read_token_pool_pair_data_by_id = MagicMock(
-        return_value = get_mock_token_pair_list_from_repo()
-    )
+    token_pair_pool_repo.read_token_pool_pair_data_by_id = MagicMock()
 
     client = ScrapperService(
         binance_spot_client=MagicMock(),
@@ -825,8 +1466,86 @@ def test_get_transaction_fee_with_tx_hash() -> None:
 
     assert fee == "0.01"
     assert pool_name == "pool_name"
+    # The pool name comes from the same query
+    token_pair_pool_repo.read_token_pool_pair_data_by_id.assert_not_called()
+
+
+def test_get_transaction_fees_with_tx_hashes_reads_all_hashes_in_one_query() -> None:
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.read_transaction_fee_by_tx_hash = MagicMock(return_value=[
+        ("0xb", Decimal("2.456"), "pool_b"),
+        ("0xa", None, "pool_a"),
+    ])
+
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+    )
+
+    result = client.get_transaction_fees_with_tx_hashes(["0xa", "0xb", "0xmissing", "0xa"])
+
+    assert result == [
+        ("0xa", "0.00", "pool_a"),
+        ("0xb", "2.46", "pool_b"),
+        ("0xmissing", "0.00", ""),
+        ("0xa", "0.00", "pool_a"),
+    ]
+    transaction_pool_repo.read_transaction_fee_by_tx_hash.assert_called_once_with(["0xa", "0xb", "0xmissing"])
 
 
+
+def test_get_transaction_fees_with_tx_hashes_joins_pools_of_multi_hop_transaction() -> None:
+    transaction_pool_repo = MagicMock()
+    transaction_pool_repo.read_transaction_fee_by_tx_hash = MagicMock(return_value=[
+        ("0xa", Decimal("3.141"), "usdc_weth"),
+        ("0xb", Decimal("1"), "usdc_weth"),
+        ("0xa", Decimal("3.141"), "weth_usdt"),
+    ])
+
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=transaction_pool_repo,
+        web3py=MagicMock(),
+    )
+
+    result = client.get_transaction_fees_with_tx_hashes(["0xa", "0xb"])
+
+    assert result == [
+        ("0xa", "3.14", "usdc_weth,weth_usdt"),
+        ("0xb", "1.00", "usdc_weth"),
+    ]
+
+
+def test_get_transaction_fees_with_tx_hashes_keeps_rows_of_deleted_pools() -> None:
+    db_session = MagicMock()
+    session = db_session.return_value.__enter__.return_value
+    # pool_id was set to NULL when its pool was deleted, the outer join has no pool name for it
+    session.query.return_value.outerjoin.return_value.filter.return_value.order_by.return_value.all.return_value = [
+        ("0xa", Decimal("3.141"), None),
+        ("0xb", Decimal("1"), None),
+        ("0xb", Decimal("1"), "usdc_weth"),
+    ]
+
+    client = ScrapperService(
+        binance_spot_client=MagicMock(),
+        etherscan_client=MagicMock(),
+        token_pair_pool_repo=MagicMock(),
+        transaction_pool_repo=TransactionToFromPoolRepository(db_session=db_session),
+        web3py=MagicMock(),
+    )
+
+    result = client.get_transaction_fees_with_tx_hashes(["0xa", "0xb"])
+
+    assert result == [
+        ("0xa", "3.14", ""),
+        ("0xb", "1.00", "usdc_weth"),
+    ]
+
 class TxReceiptFromWeb3Mock(BaseModel):
     logs: list[Dict]
 
@@ -0,0 +1,219 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+from app.core.scrapper_service.model import ScrappingJobResult
+from app.core.scrapping_engine.client import ScrappingEngine
+from app.storage.models import PoolScrapeState, TokenPairPool
+
+
+def get_scrapper_service(scrapped_pool_ids: list[int], pools: dict[str, int]) -> MagicMock:
+    scrapper_client = MagicMock()
+    scrapper_client.get_token_pool_pair_by_pool_name = MagicMock(side_effect=lambda pool_name: [
+        TokenPairPool(pool_id=pools[pool_name], pool_name=pool_name, contract_address=f"0x{pools[pool_name]}")
+    ] if pool_name in pools else [])
+    scrapper_client.read_scrape_watermark = MagicMock(side_effect=lambda address, pool_id: PoolScrapeState(
+        pool_id=pool_id, last_block=100, last_tx_index=0
+    ))
+
+    def scrapping_job(
+            address: str, start_block: int, pool_id: int, last_tx_index: int, max_count: int, start_block_covered: bool
+    ) -> ScrappingJobResult:
+        scrapped_pool_ids.append(pool_id)
+        return ScrappingJobResult(success=True)
+
+    scrapper_client.scrapping_job = MagicMock(side_effect=scrapping_job)
+    return scrapper_client
+
+
+def get_engine(scrapper_client: MagicMock, max_workers: int = 1) -> ScrappingEngine:
+    return ScrappingEngine(
+        service_factory=lambda: scrapper_client,
+        max_workers=max_workers,
+        interval_seconds=0,
+        batch_size=20,
+        max_batch_size=80,
+    )
+
+
+async def wait_for(condition, timeout_seconds: float = 2) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout_seconds
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.001)
+
+
+def test_single_worker_serves_pools_round_robin() -> None:
+    scrapped_pool_ids: list[int] = []
+    pools = {"pool_a": 1, "pool_b": 2, "pool_c": 3}
+    scrapper_client = get_scrapper_service(scrapped_pool_ids, pools)
+    engine = get_engine(scrapper_client)
+
+    async def run() -> None:
+        for pool_name in pools:
+            assert await engine.start_pool(pool_name)
+        await wait_for(lambda: len(scrapped_pool_ids) >= 9)
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+    assert scrapped_pool_ids[:9] == [1, 2, 3, 1, 2, 3, 1, 2, 3]
+
+
+def test_jobs_run_off_the_event_loop_thread() -> None:
+    job_threads: list[threading.Thread] = []
+    scrapper_client = get_scrapper_service([], {"pool_a": 1})
+    scrapper_client.scrapping_job.side_effect = lambda **_: job_threads.append(threading.current_thread()) or ScrappingJobResult()
+    engine = get_engine(scrapper_client, max_workers=2)
+
+    async def run() -> None:
+        await engine.start_pool("pool_a")
+        await wait_for(lambda: len(job_threads) >= 1)
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+    assert threading.main_thread() not in job_threads
+
+
+def test_start_twice_and_stop_pool() -> None:
+    scrapped_pool_ids: list[int] = []
+    scrapper_client = get_scrapper_service(scrapped_pool_ids, {"pool_a": 1})
+    engine = get_engine(scrapper_client)
+
+    async def run() -> None:
+        assert await engine.start_pool("Pool_A ")
+        assert not await engine.start_pool("pool_a")
+        await wait_for(lambda: len(scrapped_pool_ids) >= 1)
+
+        assert await engine.stop_pool("pool_a")
+        assert not engine.is_running("pool_a")
+        assert not await engine.stop_pool("pool_a")
+
+        scrapped_count = len(scrapped_pool_ids)
+        await asyncio.sleep(0.05)
+        # At most the cycle in flight when stopped completes
+        assert len(scrapped_pool_ids) <= scrapped_count + 1
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+
+def test_unknown_pool_is_dropped() -> None:
+    scrapper_client = get_scrapper_service([], {})
+    engine = get_engine(scrapper_client)
+
+    async def run() -> None:
+        await engine.start_pool("missing_pool")
+        await wait_for(lambda: not engine.is_running("missing_pool"))
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+    scrapper_client.scrapping_job.assert_not_called()
+
+
+def test_failed_cycle_is_rescheduled() -> None:
+    scrapped_pool_ids: list[int] = []
+    scrapper_client = get_scrapper_service(scrapped_pool_ids, {"pool_a": 1})
+    scrapper_client.read_scrape_watermark.side_effect = [
+        Exception("db down"),
+        PoolScrapeState(pool_id=1, last_block=100, last_tx_index=0),
+    ] + [PoolScrapeState(pool_id=1, last_block=100, last_tx_index=0)] * 10
+    engine = get_engine(scrapper_client)
+
+    async def run() -> None:
+        await engine.start_pool("pool_a")
+        await wait_for(lambda: len(scrapped_pool_ids) >= 1)
+        assert engine.is_running("pool_a")
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+
+def test_failed_cycle_of_catching_up_pool_waits_for_interval() -> None:
+    batch_sizes: list[int] = []
+    scrapper_client = get_scrapper_service([], {"pool_a": 1})
+
+    def scrapping_job(
+            address: str, start_block: int, pool_id: int, last_tx_index: int, max_count: int, start_block_covered: bool
+    ) -> ScrappingJobResult:
+        batch_sizes.append(max_count)
+        if len(batch_sizes) == 1:
+            return ScrappingJobResult(success=True, has_more=True, lag_blocks=10)
+        raise Exception("etherscan down")
+
+    scrapper_client.scrapping_job.side_effect = scrapping_job
+    engine = ScrappingEngine(
+        service_factory=lambda: scrapper_client,
+        max_workers=1,
+        interval_seconds=60,
+        batch_size=20,
+        max_batch_size=50,
+    )
+
+    async def run() -> None:
+        await engine.start_pool("pool_a")
+        await wait_for(lambda: len(batch_sizes) >= 2)
+        await asyncio.sleep(0.05)
+        assert engine.is_running("pool_a")
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+    # The failed catch-up batch is not requeued at once, the next try waits for the interval
+    assert batch_sizes == [20, 40]
+
+
+def test_catching_up_pool_grows_batch_until_caught_up() -> None:
+    batch_sizes: list[int] = []
+    scrapper_client = get_scrapper_service([], {"pool_a": 1})
+    has_more_results = [True, True, True, False, False]
+
+    def scrapping_job(
+            address: str, start_block: int, pool_id: int, last_tx_index: int, max_count: int, start_block_covered: bool
+    ) -> ScrappingJobResult:
+        batch_sizes.append(max_count)
+        has_more = has_more_results[len(batch_sizes) - 1] if len(batch_sizes) <= len(has_more_results) else False
+        return ScrappingJobResult(success=True, has_more=has_more, lag_blocks=10 if has_more else 0)
+
+    scrapper_client.scrapping_job.side_effect = scrapping_job
+    engine = ScrappingEngine(
+        service_factory=lambda: scrapper_client,
+        max_workers=1,
+        # A caught up pool waits, the catch-up batches must not
+        interval_seconds=60,
+        batch_size=20,
+        max_batch_size=50,
+    )
+
+    async def run() -> None:
+        await engine.start_pool("pool_a")
+        await wait_for(lambda: len(batch_sizes) >= 4)
+        await asyncio.sleep(0.05)
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+    assert batch_sizes == [20, 40, 50, 50]
+
+
+def test_start_block_is_covered_only_after_a_scrapping_job_watermark() -> None:
+    scrapper_client = get_scrapper_service([], {"pool_a": 1})
+    scrapper_client.read_scrape_watermark.side_effect = [
+        PoolScrapeState(pool_id=1, last_block=100, last_tx_index=0),
+        PoolScrapeState(pool_id=1, last_block=120, last_tx_index=2, written_by_scrapping_job=True),
+    ] + [PoolScrapeState(pool_id=1, last_block=120, last_tx_index=2, written_by_scrapping_job=True)] * 10
+    engine = get_engine(scrapper_client)
+
+    async def run() -> None:
+        await engine.start_pool("pool_a")
+        await wait_for(lambda: scrapper_client.scrapping_job.call_count >= 2)
+        await engine.shutdown()
+
+    asyncio.run(run())
+
+    start_block_covered = [
+        job_call.kwargs["start_block_covered"] for job_call in scrapper_client.scrapping_job.call_args_list[:2]
+    ]
+    assert start_block_covered == [False, True]
@@ -0,0 +1,219 @@
+import asyncio
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.scrapping_engine.coordinator import ScrappingTaskCoordinator
+from app.storage.models import TokenPairPool
+
+
+def get_engine() -> MagicMock:
+    running_pools: set[str] = set()
+    engine = MagicMock()
+    engine.start_pool = AsyncMock(side_effect=lambda pool_name: running_pools.add(pool_name) or True)
+    engine.stop_pool = AsyncMock(side_effect=lambda pool_name: running_pools.discard(pool_name) or True)
+    engine.is_running = MagicMock(side_effect=lambda pool_name: pool_name in running_pools)
+    return engine
+
+
+def get_coordinator(engine: MagicMock, task_repo: MagicMock) -> ScrappingTaskCoordinator:
+    return ScrappingTaskCoordinator(
+        engine=engine,
+        task_repo=task_repo,
+        owner_id="worker-1",
+        heartbeat_seconds=10,
+        lease_ttl_seconds=30,
+    )
+
+
+def get_pool(pool_id: int) -> TokenPairPool:
+    return TokenPairPool(pool_id=pool_id, pool_name=f"pool_{pool_id}", contract_address=f"0x{pool_id}")
+
+
+class InMemoryPoolScrapeTasksRepository:
+    """pool_scrape_tasks and scrape_workers of a cluster, shared by its coordinators."""
+
+    def __init__(self, pool_ids: list[int]) -> None:
+        self.owner_by_pool_id: dict[int, Optional[str]] = {pool_id: None for pool_id in pool_ids}
+        self.live_owner_ids: set[str] = set()
+
+    def renew_scrape_worker(self, owner_id: str, ttl_seconds: float) -> None:
+        self.live_owner_ids.add(owner_id)
+
+    def delete_scrape_worker(self, owner_id: str) -> None:
+        self.live_owner_ids.discard(owner_id)
+
+    def read_pool_scrape_task_load(self) -> tuple[int, int]:
+        return len(self.owner_by_pool_id), len(self.live_owner_ids)
+
+    def renew_pool_scrape_leases(self, owner_id: str, pool_ids: list[int], ttl_seconds: float) -> list[int]:
+        return [pool_id for pool_id in pool_ids if self.owner_by_pool_id[pool_id] == owner_id]
+
+    def acquire_pool_scrape_leases(self, owner_id: str, ttl_seconds: float, max_count: int) -> list[TokenPairPool]:
+        free_pool_ids = [pool_id for (pool_id, owner) in sorted(self.owner_by_pool_id.items()) if owner is None]
+        claimed_pool_ids = free_pool_ids[:max(0, max_count)]
+        for pool_id in claimed_pool_ids:
+            self.owner_by_pool_id[pool_id] = owner_id
+        return [get_pool(pool_id) for pool_id in claimed_pool_ids]
+
+    def release_pool_scrape_leases(self, owner_id: str, pool_ids: Optional[list[int]] = None) -> None:
+        for (pool_id, owner) in self.owner_by_pool_id.items():
+            if owner == owner_id and (pool_ids is None or pool_id in pool_ids):
+                self.owner_by_pool_id[pool_id] = None
+
+
+def test_heartbeat_claims_only_fair_share() -> None:
+    engine = get_engine()
+    task_repo = MagicMock()
+    # 4 active tasks, this worker and one other live: this worker takes 2
+    task_repo.read_pool_scrape_task_load = MagicMock(return_value=(4, 2))
+    task_repo.acquire_pool_scrape_leases = MagicMock(return_value=[get_pool(1), get_pool(2)])
+    coordinator = get_coordinator(engine, task_repo)
+
+    asyncio.run(coordinator.heartbeat())
+
+    task_repo.acquire_pool_scrape_leases.assert_called_once_with("worker-1", 30, 2)
+    assert coordinator.get_held_pool_ids() == [1, 2]
+    assert [call.args[0] for call in engine.start_pool.call_args_list] == ["pool_1", "pool_2"]
+
+
+def test_heartbeat_stops_pools_whose_lease_was_lost() -> None:
+    engine = get_engine()
+    task_repo = MagicMock()
+    task_repo.read_pool_scrape_task_load = MagicMock(return_value=(2, 1))
+    task_repo.acquire_pool_scrape_leases = MagicMock(side_effect=[[get_pool(1), get_pool(2)], []])
+    # Pool 2 was stopped from another worker
+    task_repo.renew_pool_scrape_leases = MagicMock(return_value=[1])
+    coordinator = get_coordinator(engine, task_repo)
+
+    async def run() -> None:
+        await coordinator.heartbeat()
+        await coordinator.heartbeat()
+
+    asyncio.run(run())
+
+    assert coordinator.get_held_pool_ids() == [1]
+    engine.stop_pool.assert_awaited_once_with("pool_2")
+
+
+def test_failed_heartbeat_stops_pools_once_lease_expired() -> None:
+    engine = get_engine()
+    task_repo = MagicMock()
+    task_repo.read_pool_scrape_task_load = MagicMock(return_value=(1, 0))
+    task_repo.acquire_pool_scrape_leases = MagicMock(return_value=[get_pool(1)])
+    coordinator = ScrappingTaskCoordinator(
+        engine=engine,
+        task_repo=task_repo,
+        owner_id="worker-1",
+        heartbeat_seconds=10,
+        lease_ttl_seconds=0,
+    )
+
+    async def run() -> None:
+        await coordinator.heartbeat()
+        task_repo.renew_pool_scrape_leases = MagicMock(side_effect=Exception("db down"))
+        await coordinator.heartbeat()
+
+    asyncio.run(run())
+
+    assert coordinator.get_held_pool_ids() == []
+    engine.stop_pool.assert_awaited_once_with("pool_1")
+
+
+def test_failed_heartbeat_stops_pools_one_heartbeat_before_lease_expiry() -> None:
+    engine = get_engine()
+    task_repo = MagicMock()
+    task_repo.read_pool_scrape_task_load = MagicMock(return_value=(1, 1))
+    task_repo.acquire_pool_scrape_leases = MagicMock(return_value=[get_pool(1)])
+    # The lease outlives one missed heartbeat but not two
+    coordinator = ScrappingTaskCoordinator(
+        engine=engine,
+        task_repo=task_repo,
+        owner_id="worker-1",
+        heartbeat_seconds=0.2,
+        lease_ttl_seconds=0.5,
+    )
+
+    async def run() -> None:
+        await coordinator.heartbeat()
+        task_repo.renew_pool_scrape_leases = MagicMock(side_effect=Exception("db down"))
+
+        await asyncio.sleep(0.2)
+        await coordinator.heartbeat()
+        assert coordinator.get_held_pool_ids() == [1]
+
+        # Lease still valid for ~0.1s, the next heartbeat would come too late
+        await asyncio.sleep(0.2)
+        await coordinator.heartbeat()
+
+    asyncio.run(run())
+
+    assert coordinator.get_held_pool_ids() == []
+    engine.stop_pool.assert_awaited_once_with("pool_1")
+
+
+def test_pool_stopped_by_engine_deactivates_its_task() -> None:
+    engine = get_engine()
+    task_repo = MagicMock()
+    task_repo.read_pool_scrape_task_load = MagicMock(return_value=(1, 0))
+    task_repo.acquire_pool_scrape_leases = MagicMock(side_effect=[[get_pool(1)], []])
+    coordinator = get_coordinator(engine, task_repo)
+
+    async def run() -> None:
+        await coordinator.heartbeat()
+        # e.g. the first transaction of the pool could not be found
+        await engine.stop_pool("pool_1")
+        await coordinator.heartbeat()
+
+    asyncio.run(run())
+
+    task_repo.deactivate_pool_scrape_task.assert_called_once_with(1)
+    assert coordinator.get_held_pool_ids() == []
+
+
+def test_request_stop_and_shutdown_release_local_pools() -> None:
+    engine = get_engine()
+    task_repo = MagicMock()
+    task_repo.read_pool_scrape_task_load = MagicMock(return_value=(2, 0))
+    task_repo.acquire_pool_scrape_leases = MagicMock(return_value=[get_pool(1), get_pool(2)])
+    task_repo.deactivate_pool_scrape_task = MagicMock(return_value=True)
+    coordinator = get_coordinator(engine, task_repo)
+
+    async def run() -> None:
+        await coordinator.heartbeat()
+        assert await coordinator.request_stop(1)
+        assert coordinator.get_held_pool_ids() == [2]
+        await coordinator.shutdown()
+
+    asyncio.run(run())
+
+    assert [call.args[0] for call in engine.stop_pool.await_args_list] == ["pool_1", "pool_2"]
+    task_repo.release_pool_scrape_leases.assert_called_once_with("worker-1")
+
+
+def test_worker_holding_every_pool_hands_excess_to_joining_worker() -> None:
+    task_repo = InMemoryPoolScrapeTasksRepository(pool_ids=[1, 2, 3, 4])
+    (first_engine, second_engine) = (get_engine(), get_engine())
+    first_coordinator = ScrappingTaskCoordinator(
+        engine=first_engine, task_repo=task_repo, owner_id="worker-1", heartbeat_seconds=10, lease_ttl_seconds=30
+    )
+    second_coordinator = ScrappingTaskCoordinator(
+        engine=second_engine, task_repo=task_repo, owner_id="worker-2", heartbeat_seconds=10, lease_ttl_seconds=30
+    )
+
+    async def run() -> None:
+        # Cold start, the first worker to heartbeat is alone and claims everything
+        await first_coordinator.heartbeat()
+        assert first_coordinator.get_held_pool_ids() == [1, 2, 3, 4]
+
+        await second_coordinator.heartbeat()
+        assert second_coordinator.get_held_pool_ids() == []
+
+        await first_coordinator.heartbeat()
+        await second_coordinator.heartbeat()
+
+    asyncio.run(run())
+
+    assert first_coordinator.get_held_pool_ids() == [1, 2]
+    assert second_coordinator.get_held_pool_ids() == [3, 4]
+    assert [call.args[0] for call in first_engine.stop_pool.await_args_list] == ["pool_3", "pool_4"]
+    assert [call.args[0] for call in second_engine.start_pool.await_args_list] == ["pool_3", "pool_4"]
@@ -0,0 +1,78 @@
+import asyncio
+import json
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from app.core.etherscan_http_client.model import EtherscanTransactionWithUsdtFee
+from app.routes.scrapper_route.handler import (
+    decode_page_cursor,
+    encode_page_cursor,
+    stream_transactions_as_json_array,
+    stream_transactions_as_ndjson,
+)
+from app.routes.scrapper_route.models import TimeRangeResponse
+from app.utils.blocking_executor.base_class import BlockingCallExecutor
+
+
+def get_transactions(count: int) -> list[EtherscanTransactionWithUsdtFee]:
+    return [
+        EtherscanTransactionWithUsdtFee(blockNumber=str(100 + index), hash=f"0x{index}", usdt_fee="1.00")
+        for index in range(count)
+    ]
+
+
+def collect(stream: AsyncIterator[str]) -> str:
+    async def run() -> str:
+        return "".join([part async for part in stream])
+
+    return asyncio.run(run())
+
+
+def test_ndjson_stream_writes_one_transaction_per_line() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=1)
+    transactions = get_transactions(250)
+
+    body = collect(stream_transactions_as_ndjson(executor, iter(transactions)))
+    executor.shutdown()
+
+    lines = body.splitlines()
+    assert len(lines) == 250
+    assert [json.loads(line) for line in lines] == [tx.model_dump() for tx in transactions]
+
+
+def test_json_array_stream_matches_json_mode_body() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=1)
+    result = TimeRangeResponse(pool_name="usdc_weth", start_time="2024-01-01 00:00:00", end_time="2024-01-02 00:00:00", success=True)
+
+    for count in (0, 1, 250):
+        transactions = get_transactions(count)
+        body = collect(stream_transactions_as_json_array(executor, result, iter(transactions)))
+
+        expected = result.model_copy(update={"transactions": transactions})
+        assert json.loads(body) == expected.model_dump()
+    executor.shutdown()
+
+
+def test_ndjson_stream_ends_with_error_line_on_failure() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=1)
+
+    def failing_transactions() -> Iterator[EtherscanTransactionWithUsdtFee]:
+        yield from get_transactions(1)
+        raise Exception("etherscan down")
+
+    body = collect(stream_transactions_as_ndjson(executor, failing_transactions()))
+    executor.shutdown()
+
+    last_line = json.loads(body.splitlines()[-1])
+    assert last_line["success"] is False
+    assert "etherscan down" in last_line["message"]
+
+
+def test_page_cursor_round_trips_chain_position() -> None:
+    cursor = encode_page_cursor((19000000, 42))
+
+    assert "=" not in cursor
+    assert decode_page_cursor(cursor) == (19000000, 42)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_page_cursor("not-a-cursor")
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils.blocking_executor.base_class import BlockingCallExecutor
+
+
+def test_blocking_call_runs_off_the_event_loop() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=2)
+
+    async def run() -> tuple[str, float]:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.create_task(tick())
+        thread_name = await executor.run(lambda: time.sleep(0.05) or threading.current_thread().name)
+        ticker.cancel()
+        return thread_name, ticks
+
+    (thread_name, ticks) = asyncio.run(run())
+    executor.shutdown()
+
+    assert thread_name.startswith("test")
+    # The event loop kept serving other coroutines during the blocking call
+    assert ticks >= 3
+
+
+def test_queued_calls_report_queue_depth_and_wait_time() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=1)
+    release = threading.Event()
+
+    async def run() -> None:
+        calls = [asyncio.ensure_future(executor.run(release.wait, 1)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        stats = executor.get_stats()
+        assert (stats.active_count, stats.queue_depth) == (1, 2)
+
+        release.set()
+        await asyncio.gather(*calls)
+
+    asyncio.run(run())
+    stats = executor.get_stats()
+    executor.shutdown()
+
+    assert (stats.max_workers, stats.queue_depth, stats.active_count, stats.completed_count) == (1, 0, 0, 3)
+    assert stats.max_wait_seconds >= 0.04
+    assert stats.p99_wait_seconds == stats.max_wait_seconds
+
+
+def test_exceptions_reach_the_caller_and_are_counted() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=1)
+
+    def fail(message: str) -> None:
+        raise ValueError(message)
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(executor.run(fail, "boom"))
+
+    stats = executor.get_stats()
+    executor.shutdown()
+    assert (stats.completed_count, stats.failed_count) == (1, 1)
+
+
+def test_calls_cancelled_before_starting_leave_the_queue() -> None:
+    executor = BlockingCallExecutor(name="test", max_workers=1)
+    release = threading.Event()
+
+    async def run() -> None:
+        running_call = asyncio.ensure_future(executor.run(release.wait, 1))
+        queued_calls = [asyncio.ensure_future(executor.run(time.sleep, 0)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert executor.get_stats().queue_depth == 2
+
+        # e.g. the client disconnected while the call waited for a thread
+        queued_calls[0].cancel()
+        await asyncio.gather(queued_calls[0], return_exceptions=True)
+        assert executor.get_stats().queue_depth == 1
+
+        executor.shutdown()
+        release.set()
+        await asyncio.gather(running_call, queued_calls[1], return_exceptions=True)
+
+    asyncio.run(run())
+
+    stats = executor.get_stats()
+    assert (stats.queue_depth, stats.active_count, stats.completed_count) == (0, 0, 1)
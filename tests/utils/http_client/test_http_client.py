@@ -0,0 +1,67 @@
+import json
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.utils.http_client.base_class import HttpClient
+
+
+class KeepAliveJsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"status": "1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+@pytest.fixture
+def local_server_url() -> Generator[str, None, None]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveJsonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_client_reuses_keep_alive_connection_across_sessions(local_server_url: str) -> None:
+    client = HttpClient(name="test", base_url=local_server_url)
+
+    for _ in range(5):
+        with client.get_session() as session:
+            assert client.get(session, endpoint="/api") == {"status": "1"}
+
+    stats = client.get_connection_stats()
+    assert stats.requests_sent == 5
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 4
+    client.close()
+
+
+def test_http_client_gives_each_thread_its_own_session(local_server_url: str) -> None:
+    client = HttpClient(name="test", base_url=local_server_url)
+    sessions = []
+
+    def collect_session() -> None:
+        with client.get_session() as session:
+            sessions.append(session)
+            client.get(session, endpoint="/api")
+
+    threads = [threading.Thread(target=collect_session) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 3
+    assert client.get_connection_stats().requests_sent == 3
+    client.close()
@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+from app.utils.rate_limiter.base_class import TokenBucketRateLimiter
+
+
+def test_token_bucket_rate_limiter_allows_burst_then_smooths_to_rate() -> None:
+    rate_limiter = TokenBucketRateLimiter(name="test", rate_per_second=50, burst=2)
+
+    started_at = time.monotonic()
+    waits = [rate_limiter.acquire() for _ in range(4)]
+    elapsed = time.monotonic() - started_at
+
+    assert waits[0] == 0
+    assert waits[1] == 0
+    assert waits[2] > 0
+    # two tokens beyond the burst at 50 calls/sec need at least ~40ms in total
+    assert elapsed >= 0.03
+
+    stats = rate_limiter.get_stats()
+    assert stats.acquired_count == 4
+    assert stats.waited_count == 2
+    assert stats.max_wait_seconds > 0
+
+
+def test_token_bucket_rate_limiter_async_acquire_waits() -> None:
+    rate_limiter = TokenBucketRateLimiter(name="test", rate_per_second=50, burst=1)
+
+    async def acquire_concurrently() -> list[float]:
+        return await asyncio.gather(*[rate_limiter.acquire_async() for _ in range(3)])
+
+    waits = asyncio.run(acquire_concurrently())
+
+    assert sorted(waits)[0] == 0
+    assert sorted(waits)[-1] > sorted(waits)[1] > 0
+
+
+def test_token_bucket_rate_limiter_disabled_when_rate_is_zero() -> None:
+    rate_limiter = TokenBucketRateLimiter(name="test", rate_per_second=0, burst=1)
+
+    assert all(rate_limiter.acquire() == 0 for _ in range(10))